@@ -0,0 +1,30 @@
+import os
+from functools import lru_cache
+
+from src.parrot.server import TaskerServer
+
+from examples.api_agent.route_runner import RouteRunner, load_api_config
+
+
+@lru_cache(maxsize=None)
+def api_config():
+    # one memory-mapped spec per process, shared by every pooled agent
+    return load_api_config(os.environ.get("API_AGENT", "scale"))
+
+
+def build_route_runner() -> RouteRunner:
+    config = api_config()
+    agent = RouteRunner()
+    agent.setup_api_agent(
+        openapi=config["openapi"],
+        env_vars=config["env_vars"],
+        headers=config["headers"],
+    )
+    return agent
+
+
+# USAGE: python -m examples.api_agent.agent_server
+# curl -N localhost:8000/run -d '{"query": "create two customers"}'
+if __name__ == "__main__":
+    api_config()
+    TaskerServer(build_route_runner, method="stream", pool_size=4).run()
@@ -1,18 +1,23 @@
-import json
 import os
 from pprint import pprint
-from typing import Dict, Any
+from typing import Dict, Any, Mapping
 
 from dotenv import load_dotenv
 from src.parrot import tasker
 from src.parrot import ToolRunner
 
-from examples.api_agent.utils.state_utils import (
-    extract_resources,
-    organize_resources,
-    build_dependency_tree,
-    organize_routes,
+from examples.api_agent.utils import (
+    dependency_graph,
+    route_search,
+    spec_index,
+    state_utils,
 )
+from examples.api_agent.utils.api_client import ApiClient
+from examples.api_agent.utils.ref_resolver import RefResolver
+from examples.api_agent.utils.route_search import RouteSearch
+from examples.api_agent.utils.spec_index import SpecIndex
+from examples.api_agent.utils.spec_store import SpecStore
+from examples.api_agent.tools.get_more_results import get_more_results
 from examples.api_agent.tools.get_resources import get_resources
 from examples.api_agent.tools.get_dependencies_for_resource import (
     get_dependencies_for_resource,
@@ -20,38 +25,78 @@ from examples.api_agent.tools.get_dependencies_for_resource import (
 from examples.api_agent.tools.get_route_definition import get_route_definition
 from examples.api_agent.tools.get_routes_for_resource import get_routes_for_resource
 from examples.api_agent.tools.run_api_call import run_api_call
+from examples.api_agent.tools.run_api_calls import run_api_calls
+from examples.api_agent.tools.search_routes import search_routes
 
 
-@tasker
+@tasker(memory=True)
 class RouteRunner:
-
     @tasker.setup
     def setup_api_agent(
-        self, openapi: Dict[str, Any], env_vars: Dict[str, str], headers: Dict[str, str]
+        self,
+        openapi: Mapping[str, Any],
+        env_vars: Dict[str, str],
+        headers: Dict[str, str],
     ):
-        resources = extract_resources(openapi)
-        edges = organize_resources(openapi, resources)
-        graph = build_dependency_tree(edges)
-        route_list = organize_routes(openapi, resources)
-        base_url = openapi["servers"][0]["url"]
-        auth_pattern = openapi["components"]["securitySchemes"]
+        analysis = self.analyze_spec(openapi)
 
+        # credentials stay out of the on-disk setup cache
         init = dict(
             openapi=openapi,
-            resources=resources,
-            edges=edges,
-            graph=graph,
-            route_list=route_list,
-            base_url=base_url,
-            auth_pattern=auth_pattern,
+            **analysis,
+            ref_resolver=RefResolver(openapi),
+            api_client=ApiClient(analysis["base_url"], headers),
             env_vars=env_vars,
             headers=headers,
         )
 
         return init
 
-    @tasker.run
-    def run(self, query):
+    @tasker.setup(
+        cache=True,
+        cache_depends=[state_utils, spec_index, dependency_graph, route_search],
+    )
+    def analyze_spec(self, openapi: Mapping[str, Any]):
+        index = SpecIndex.build(openapi)
+        base_url = openapi["servers"][0]["url"]
+        auth_pattern = dict(openapi["components"]["securitySchemes"])
+
+        return dict(
+            spec_index=index,
+            **index.state(),
+            route_search=RouteSearch.build(openapi),
+            base_url=base_url,
+            auth_pattern=auth_pattern,
+        )
+
+    @tasker.setup
+    def reload_spec(self, openapi: Mapping[str, Any]):
+        """
+        Swap in a new version of the spec, re-indexing only what changed.
+        Requests already running keep the snapshot they started with.
+        """
+        state = self._state.get()
+        index = state["spec_index"].reload(openapi)
+        base_url = openapi["servers"][0]["url"]
+
+        api_client = state["api_client"]
+        if base_url != state["base_url"]:
+            api_client = ApiClient(base_url, state["headers"])
+
+        return dict(
+            openapi=openapi,
+            spec_index=index,
+            **index.state(),
+            route_search=(
+                RouteSearch.build(openapi) if index.dirty else state["route_search"]
+            ),
+            ref_resolver=state["ref_resolver"].reload(openapi, index.dirty),
+            api_client=api_client,
+            base_url=base_url,
+            auth_pattern=dict(openapi["components"]["securitySchemes"]),
+        )
+
+    def stream(self, query):
         prompt_template = """You are an agent to help users interact with an API. This may include tasks like creating resources or executing workflows for a REST API. A user will provide you with some information on what they would like to run and you will be provided with content about the API. Your job is to plan a path of execution for the query and then execute on it. I recommend you check dependencies for resources before creating them as you will often need to create dependent resources first. Remember to check optional fields, since many dependencies may not always be needed.
 
         Here is the user query: 
@@ -64,50 +109,63 @@ class RouteRunner:
 
         tools = [
             get_dependencies_for_resource,
+            get_more_results,
             get_resources,
             get_route_definition,
             get_routes_for_resource,
             run_api_call,
+            run_api_calls,
+            search_routes,
         ]
 
-        tr = ToolRunner("gpt-4o", self._state.get()).run(tools=tools, user_prompt=plan_prompt, stream=True)
+        # turns and tool calls are recorded in the instance's MemoryStore
+        return ToolRunner("gpt-4o", self._state.get(), memory=self.memory).run(
+            tools=tools, user_prompt=plan_prompt, stream=True
+        )
 
-        for item in tr:
+    @tasker.run
+    def run(self, query):
+        for item in self.stream(query):
             pprint(item)
 
         return "Done"
 
 
-# USAGE TESTING
-load_dotenv()
-
-apis = {
-    "scale": {
-        "filepath": "openapi/sgp-09-21-24.json",
-        "query": "create an evaluation dataset about europe. account_id is 6630377a5a7b09c735cfeebb. you dont need to create dependencies. add 10 test cases to it about france's economy",
-        "headers": {"x-api-key": os.environ["SGP_API_KEY"]},
-        "env_vars": {}
-    },
-    "stripe": {
-        "filepath": "openapi/stripe-08-10-24.json",
-        "query": "create two customers and charge them 5 dollars each",
-        "headers": {"x-api-key": os.environ["SGP_API_KEY"]},
-        "env_vars": {}
+def load_api_config(selected_api: str) -> Dict[str, Any]:
+    load_dotenv()
+
+    apis = {
+        "scale": {
+            "filepath": "openapi/sgp-09-21-24.json",
+            "query": "create an evaluation dataset about europe. account_id is 6630377a5a7b09c735cfeebb. you dont need to create dependencies. add 10 test cases to it about france's economy",
+            "headers": {"x-api-key": os.environ["SGP_API_KEY"]},
+            "env_vars": {},
+        },
+        "stripe": {
+            "filepath": "openapi/stripe-08-10-24.json",
+            "query": "create two customers and charge them 5 dollars each",
+            "headers": {"x-api-key": os.environ["SGP_API_KEY"]},
+            "env_vars": {},
+        },
     }
-}
 
-selected_api = "scale"
-api_config = apis[selected_api]
+    api_config = apis[selected_api]
+
+    # indexed and memory-mapped, operations are decoded as they are used
+    api_config["openapi"] = SpecStore.open(api_config["filepath"])
 
-# load setup
-with open(api_config["filepath"], "r") as file:
-    openapi = json.load(file)
+    return api_config
 
-headers = api_config["headers"]
-query = api_config["query"]
-env_vars = api_config["env_vars"]
 
-# build agent
-agent = RouteRunner()
-setup = agent.setup_api_agent(openapi=openapi, env_vars=env_vars, headers=headers)
-result = agent.run(query)
+# USAGE TESTING
+if __name__ == "__main__":
+    api_config = load_api_config("scale")
+
+    # build agent
+    agent = RouteRunner()
+    setup = agent.setup_api_agent(
+        openapi=api_config["openapi"],
+        env_vars=api_config["env_vars"],
+        headers=api_config["headers"],
+    )
+    result = agent.run(api_config["query"])
@@ -0,0 +1,11 @@
+from src.parrot import tool
+
+
+@tool
+def get_more_results(handle: str, offset: int, state: dict):
+    """
+    Returns the next page of a large API response, using the handle and offset
+    from the continuation of a previous result.
+    """
+    results = state["api_client"].results
+    return results.page(results.get(handle), offset=offset, handle=handle)
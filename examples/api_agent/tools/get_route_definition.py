@@ -3,8 +3,6 @@ from src.parrot import tool
 
 @tool
 def get_route_definition(route: str, method: str, state: dict):
-    """Returns openapi spec for route, method"""
+    """Returns openapi spec for route, method with schema references expanded"""
 
-    openapi = state["openapi"]
-    target = openapi["paths"][route][method.lower()]
-    return target
+    return state["ref_resolver"].render_operation(route, method)
@@ -1,5 +1,4 @@
 from typing import Literal, Optional, Union
-import httpx
 from src.parrot import tool
 from pydantic import BaseModel, Field
 
@@ -10,43 +9,24 @@ class APICallRunnerInputs(BaseModel):
         description="HTTP method for request"
     )
     payload: Optional[Union[dict, list]] = Field(default=None, description="Payload for request")
+    select: Optional[str] = Field(
+        default=None,
+        description="Only return these fields of the response, e.g. 'data[*].{id,name}'",
+    )
 
 
 @tool
-def run_api_call(runner_input: APICallRunnerInputs, state: dict):
+async def run_api_call(runner_input: APICallRunnerInputs, state: dict):
     """
     Returns a list of the resources from the REST API.
 
     You may assume the headers and base url will be injected automatically.
+    Large responses are paged; pass the returned continuation to get_more_results.
     """
 
-    base_url = state["base_url"]
-    headers = state["headers"]
-
-    url = f"{base_url.rstrip('/')}/{runner_input.path.lstrip('/')}"
-
-    try:
-        with httpx.Client() as client:
-            response = client.request(
-                method=runner_input.method,
-                url=url,
-                headers=headers,
-                json=runner_input.payload,
-            )
-
-        response.raise_for_status()
-
-        return {
-            "status_code": response.status_code,
-            "data": response.json(),
-            # "headers": dict(response.headers)
-        }
-
-    except httpx.HTTPStatusError as e:
-        return {
-            "error": str(e),
-            "status_code": e.response.status_code,
-            "data": e.response.text,
-        }
-    except httpx.RequestError as e:
-        return {"error": str(e), "status_code": None, "data": None}
+    return await state["api_client"].request(
+        method=runner_input.method,
+        path=runner_input.path,
+        payload=runner_input.payload,
+        select=runner_input.select,
+    )
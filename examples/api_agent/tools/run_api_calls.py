@@ -0,0 +1,21 @@
+from typing import List
+
+from src.parrot import tool
+
+from examples.api_agent.tools.run_api_call import APICallRunnerInputs
+
+
+@tool
+async def run_api_calls(calls: List[APICallRunnerInputs], state: dict):
+    """
+    Runs several independent API calls concurrently and returns their results in
+    the same order. Each call is an object with "path", "method", an optional
+    "payload" and an optional "select" expression that keeps only some fields of
+    the response. Use this instead of repeated run_api_call turns when creating
+    or fetching many resources that do not depend on each other. A failed call
+    returns an entry with an "error" and does not affect the others.
+
+    You may assume the headers and base url will be injected automatically.
+    """
+
+    return await state["api_client"].request_many([call.model_dump() for call in calls])
@@ -0,0 +1,11 @@
+from src.parrot import tool
+
+
+@tool
+def search_routes(query: str, state: dict, k: int = 5):
+    """
+    Searches every route of the API and returns the k operations that best match
+    a plain-language description of what you want to do, e.g. "create a customer
+    payment method". Use this first to find the right endpoint.
+    """
+    return state["route_search"].render(query, k)
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import weakref
+from typing import Any, Dict, List, Optional, Union
+
+import httpx
+
+from examples.api_agent.utils.response_budget import ResultPages, project
+
+try:
+    import h2
+except ImportError:  # HTTP/2 needs httpx[http2]
+    h2 = None
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_CONCURRENCY = 5
+DEFAULT_MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
+
+class ApiClient:
+    """
+    Keep-alive HTTP client for the API under test, shared by every call the agent
+    makes. Connections are pooled per event loop (async tools may run on the
+    background loop or on the caller's), so repeated calls skip the TCP and TLS
+    handshake. HTTP/2 is used when requested and h2 is installed.
+
+    Response bodies are read as a stream and abandoned past `max_response_bytes`.
+    Parsed results can be narrowed with a selector and are paged through
+    `results` so a large response costs one budgeted page of context.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        http2: bool = False,
+        timeout: float = 30.0,
+        max_response_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+        results: Optional[ResultPages] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.max_connections = max_connections
+        self.concurrency = concurrency
+        self.http2 = http2 and h2 is not None
+        self.timeout = timeout
+        self.max_response_bytes = max_response_bytes
+        self.results = results or ResultPages()
+        self._clients = weakref.WeakKeyDictionary()
+
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                headers=self.headers,
+                http2=self.http2,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Union[dict, list]] = None,
+        select: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        try:
+            async with self.client().stream(
+                method=method, url=self.url(path), json=payload
+            ) as response:
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) > self.max_response_bytes:
+                        return {
+                            "error": f"Response is larger than {self.max_response_bytes} "
+                            "bytes, request fewer items (filters or pagination)",
+                            "status_code": response.status_code,
+                            "data": None,
+                        }
+            response.raise_for_status()
+
+        except httpx.HTTPStatusError as e:
+            return {
+                "error": str(e),
+                "status_code": e.response.status_code,
+                **self.results.page(body.decode(errors="replace")),
+            }
+        except httpx.RequestError as e:
+            return {"error": str(e), "status_code": None, "data": None}
+
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            data = body.decode(errors="replace")
+
+        if select:
+            try:
+                data = project(data, select)
+            except (ValueError, IndexError) as e:
+                return {"error": str(e), "status_code": response.status_code}
+
+        return {"status_code": response.status_code, **self.results.page(data)}
+
+    async def request_many(
+        self, calls: List[Dict[str, Any]], concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run calls concurrently, at most `concurrency` at a time, returning their
+        results in the order given. A call that fails returns an error entry
+        instead of failing the batch.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def limited(call: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.request(**call)
+                except Exception as e:
+                    return {"error": str(e), "status_code": None, "data": None}
+
+        return await asyncio.gather(*(limited(call) for call in calls))
+
+    async def aclose(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
@@ -0,0 +1,158 @@
+import copy
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from networkx import DiGraph
+
+Edge = Tuple[str, str]
+
+
+def _ordered(nodes: Iterable[str]) -> Tuple[str, ...]:
+    # a fixed order, so an updated graph renders like one built from scratch
+    return tuple(sorted(nodes, key=str))
+
+
+class DependencyGraph:
+    """
+    Resource dependency graph prepared for repeated subtree queries. Adjacency
+    is frozen into tuples once; each root's tree is computed with an iterative
+    DFS the first time it is asked for and the rendered text is cached, so
+    repeated queries are a dict lookup and deep graphs cannot hit the recursion
+    limit.
+    """
+
+    def __init__(self, graph: DiGraph):
+        self.successors: Dict[str, Tuple[str, ...]] = {
+            n: _ordered(graph.successors(n)) for n in graph.nodes()
+        }
+        self.predecessors: Dict[str, Tuple[str, ...]] = {
+            n: _ordered(graph.predecessors(n)) for n in graph.nodes()
+        }
+        self._rendered: Dict[str, str] = {}
+        # nodes each rendered tree was built from
+        self._reach: Dict[str, FrozenSet[str]] = {}
+
+    def update(
+        self, removed: Iterable[Edge], added: Iterable[Edge]
+    ) -> "DependencyGraph":
+        """
+        Copy of the graph with edges removed and added. Adjacency of untouched
+        nodes is shared, and only rendered trees that reach a changed edge are
+        dropped.
+        """
+        successors: Dict[str, Set[str]] = {}
+        predecessors: Dict[str, Set[str]] = {}
+
+        def adjacency(u: str, v: str) -> Tuple[Set[str], Set[str]]:
+            if u not in successors:
+                successors[u] = set(self.successors.get(u, ()))
+            if v not in predecessors:
+                predecessors[v] = set(self.predecessors.get(v, ()))
+            return successors[u], predecessors[v]
+
+        for u, v in removed:
+            succ, pred = adjacency(u, v)
+            succ.discard(v)
+            pred.discard(u)
+        for u, v in added:
+            succ, pred = adjacency(u, v)
+            succ.add(v)
+            pred.add(u)
+
+        updated = copy.copy(self)
+        updated.successors = dict(self.successors)
+        updated.predecessors = dict(self.predecessors)
+        touched = successors.keys() | predecessors.keys()
+        for node in touched:
+            succ = _ordered(successors.get(node, self.successors.get(node, ())))
+            pred = _ordered(predecessors.get(node, self.predecessors.get(node, ())))
+            if succ or pred:
+                updated.successors[node] = succ
+                updated.predecessors[node] = pred
+            else:
+                updated.successors.pop(node, None)
+                updated.predecessors.pop(node, None)
+
+        updated._reach = {
+            root: reach
+            for root, reach in self._reach.items()
+            if reach.isdisjoint(touched)
+        }
+        updated._rendered = {
+            root: text
+            for root, text in self._rendered.items()
+            if root in updated._reach
+        }
+        return updated
+
+    def reachable(self, root: str) -> Tuple[List[str], bool]:
+        """
+        Nodes reachable from root in DFS reverse postorder (a topological order
+        when there is no cycle), and whether a cycle was found.
+        """
+        finished = set()
+        on_path = {root}
+        order = []
+        has_cycle = False
+        stack = [(root, iter(self.successors[root]))]
+
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if child in on_path:
+                    has_cycle = True
+                elif child not in finished:
+                    on_path.add(child)
+                    stack.append((child, iter(self.successors[child])))
+                    break
+            else:
+                stack.pop()
+                on_path.discard(node)
+                finished.add(node)
+                order.append(node)
+
+        order.reverse()
+        return order, has_cycle
+
+    def subtree(self, root: str) -> Tuple[Dict[str, List[str]], bool]:
+        """
+        Spanning tree of the root's dependencies: each node hangs under its first
+        predecessor that precedes it in topological order.
+        """
+        order, has_cycle = self.reachable(root)
+        children: Dict[str, List[str]] = {node: [] for node in order}
+        placed = set()
+        for node in order:
+            parent = next((p for p in self.predecessors[node] if p in placed), None)
+            if parent is not None:
+                children[parent].append(node)
+            placed.add(node)
+        return children, has_cycle
+
+    def render(self, root: str) -> str:
+        if root not in self.successors:
+            return f"Node '{root}' not found in the graph."
+
+        if root not in self._rendered:
+            children, has_cycle = self.subtree(root)
+            lines = [f"Tree rooted at {root}:"]
+            if has_cycle:
+                lines.append("Warning: Cycle detected in the graph")
+
+            stack = [(root, "", "")]
+            while stack:
+                node, prefix, indent = stack.pop()
+                lines.append(f"{prefix}{str(node).lstrip('/')}")
+                kids = children[node]
+                for i in range(len(kids) - 1, -1, -1):
+                    last = i == len(kids) - 1
+                    stack.append(
+                        (
+                            kids[i],
+                            indent + ("└── " if last else "├── "),
+                            indent + ("    " if last else "│   "),
+                        )
+                    )
+
+            self._rendered[root] = "\n".join(lines) + "\n"
+            self._reach[root] = frozenset(children)
+        return self._rendered[root]
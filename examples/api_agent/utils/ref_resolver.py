@@ -0,0 +1,121 @@
+import json
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from examples.api_agent.utils.spec_index import fingerprint
+
+DEFAULT_REF_DEPTH = 2
+# keys that cost tokens without telling the model how to call the route
+NOISE_KEYS = frozenset({"examples", "externalDocs", "xml"})
+
+
+class RefResolver:
+    """
+    Expands local $refs in an OpenAPI spec on demand, up to `max_depth` nested
+    references; deeper ones are left as {"$ref": ...}. Resolved component
+    fragments and rendered operations are memoized, so repeated lookups share
+    work across tool calls.
+    """
+
+    def __init__(self, openapi: Dict[str, Any], max_depth: int = DEFAULT_REF_DEPTH):
+        self.openapi = openapi
+        self.max_depth = max_depth
+        self._fragments: Dict[Tuple[str, int], Any] = {}
+        self._operations: Dict[Tuple[str, str], str] = {}
+        self._component_hashes: Optional[Dict[str, str]] = None
+
+    def component_hashes(self) -> Dict[str, str]:
+        """
+        Content hash of each kind of component (schemas, parameters, ...).
+        Computed once per resolver, and without decoding for a SpecStore.
+        """
+        if self._component_hashes is None:
+            components = self.openapi.get("components", {})
+            self._component_hashes = {
+                kind: fingerprint(entries) for kind, entries in components.items()
+            }
+        return self._component_hashes
+
+    def reload(
+        self, openapi: Dict[str, Any], changed_paths: Iterable[str] = ()
+    ) -> "RefResolver":
+        """
+        Resolver for a new version of the spec. When components are unchanged it
+        keeps their memoized fragments and the rendered operations of unchanged
+        paths.
+        """
+        resolver = RefResolver(openapi, self.max_depth)
+        if openapi.get("components") is self.openapi.get("components"):
+            resolver._component_hashes = self._component_hashes
+        if resolver.component_hashes() != self.component_hashes():
+            # rendered operations embed component fragments, start over
+            return resolver
+
+        changed_paths = set(changed_paths)
+        resolver._fragments = {
+            key: fragment
+            for key, fragment in self._fragments.items()
+            if key[0].startswith("#/components/")
+        }
+        resolver._operations = {
+            key: text
+            for key, text in self._operations.items()
+            if key[0] not in changed_paths
+        }
+        return resolver
+
+    def lookup(self, ref: str) -> Any:
+        if not ref.startswith("#/"):
+            raise KeyError(f"Only local references are supported: {ref}")
+
+        node = self.openapi
+        for part in ref[2:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            node = node[int(part)] if isinstance(node, list) else node[part]
+        return node
+
+    def resolve(self, node: Any, depth: int, names: bool = False) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and not names:
+                target = self.resolve_ref(ref, depth)
+                # OpenAPI 3.1 allows keys such as description next to a $ref
+                siblings = self.resolve(
+                    {k: v for k, v in node.items() if k != "$ref"}, depth
+                )
+                if siblings and isinstance(target, dict):
+                    return {**target, **siblings}
+                return target
+            # keys of a properties map are field names, never noise
+            return {
+                k: self.resolve(v, depth, names=not names and k == "properties")
+                for k, v in node.items()
+                if names or (k not in NOISE_KEYS and not k.startswith("x-"))
+            }
+        if isinstance(node, list):
+            return [self.resolve(v, depth) for v in node]
+        return node
+
+    def resolve_ref(self, ref: str, depth: int) -> Any:
+        if depth <= 0 or not ref.startswith("#/"):
+            return {"$ref": ref}
+
+        key = (ref, depth)
+        if key not in self._fragments:
+            try:
+                target = self.lookup(ref)
+            except (KeyError, IndexError, ValueError, TypeError):
+                return {"$ref": ref}
+            # self-referencing schemas terminate once depth runs out
+            self._fragments[key] = self.resolve(target, depth - 1)
+        return self._fragments[key]
+
+    def render_operation(self, route: str, method: str) -> str:
+        """
+        Compact JSON for one operation with its references expanded.
+        """
+        key = (route, method.lower())
+        if key not in self._operations:
+            operation = self.openapi["paths"][route][key[1]]
+            resolved = self.resolve(operation, self.max_depth)
+            self._operations[key] = json.dumps(resolved, separators=(",", ":"))
+        return self._operations[key]
@@ -0,0 +1,170 @@
+import itertools
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.parrot.tool_result import ResultSerializer, serialize_result
+
+DEFAULT_MAX_ITEMS = 20
+DEFAULT_MAX_CHARS = 4_000
+DEFAULT_KEEP_RESULTS = 32
+
+_SEGMENT = re.compile(r"\{[^}]*\}|\[[^\]]*\]|[^.\[{]+")
+
+
+def parse_selector(selector: str) -> List[str]:
+    selector = selector.strip()
+    if selector.startswith("$"):
+        selector = selector[1:]
+
+    segments, pos = [], 0
+    while pos < len(selector):
+        if selector[pos] == "." and (segments or pos == 0):
+            pos += 1
+        match = _SEGMENT.match(selector, pos)
+        if match is None:
+            raise ValueError(f"Invalid selector: {selector}")
+        segments.append(match.group())
+        pos = match.end()
+    return segments
+
+
+def project(value: Any, selector: str) -> Any:
+    """
+    Select fields from a JSON value with a small jq/JSONPath-like syntax:
+        data[*].id              the id of every item in data
+        items[0].owner.email    one nested field
+        data[:5].{id,name}      id and name of the first five items
+    Missing keys select None.
+    """
+    return _project(value, parse_selector(selector))
+
+
+def _project(value: Any, segments: List[str]) -> Any:
+    if not segments or value is None:
+        return value
+
+    segment, rest = segments[0], segments[1:]
+    if segment.startswith("{"):
+        fields = [f.strip() for f in segment[1:-1].split(",") if f.strip()]
+        if rest:
+            raise ValueError("A {field,...} selection must come last")
+        return {f: _project(value, parse_selector(f)) for f in fields}
+
+    if segment.startswith("["):
+        inner = segment[1:-1].strip()
+        if not isinstance(value, list):
+            return None
+        if inner in ("*", ""):
+            return [_project(v, rest) for v in value]
+        if ":" in inner:
+            start, _, stop = inner.partition(":")
+            window = value[int(start) if start else None : int(stop) if stop else None]
+            return [_project(v, rest) for v in window]
+        index = int(inner)
+        return (
+            _project(value[index], rest) if -len(value) <= index < len(value) else None
+        )
+
+    if isinstance(value, dict):
+        return _project(value.get(segment.strip()), rest)
+    if isinstance(value, list):
+        # field access on a list maps over its items
+        return [_project(v, segments) for v in value]
+    return None
+
+
+def _largest_list(data: Any) -> Tuple[Optional[str], Optional[list]]:
+    """
+    The list a response pages over: the response itself or its longest list field.
+    """
+    if isinstance(data, list):
+        return None, data
+    if isinstance(data, dict):
+        lists = [(k, v) for k, v in data.items() if isinstance(v, list)]
+        if lists:
+            return max(lists, key=lambda kv: len(kv[1]))
+    return None, None
+
+
+class ResultPages:
+    """
+    Keeps recent API responses so the model can be shown a budgeted page and ask
+    for the rest with a continuation handle instead of receiving everything.
+    Sizes are measured with `serializer`, which should be the one the tool
+    runner uses, so the character budget matches what reaches the context.
+    """
+
+    def __init__(
+        self,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        max_chars: int = DEFAULT_MAX_CHARS,
+        keep: int = DEFAULT_KEEP_RESULTS,
+        serializer: ResultSerializer = serialize_result,
+    ):
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self.keep = keep
+        self.serializer = serializer
+        self._results: "OrderedDict[str, Any]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, handle: str) -> Any:
+        with self._lock:
+            if handle not in self._results:
+                raise KeyError(f"Unknown or expired result handle '{handle}'")
+            self._results.move_to_end(handle)
+            return self._results[handle]
+
+    def _store(self, data: Any) -> str:
+        with self._lock:
+            handle = f"r{next(self._ids)}"
+            self._results[handle] = data
+            while len(self._results) > self.keep:
+                self._results.popitem(last=False)
+            return handle
+
+    def page(
+        self, data: Any, offset: int = 0, handle: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Fit data into the item and character budget. Returns the data unchanged
+        when it fits, otherwise a page of it with a continuation handle.
+        """
+        if offset == 0 and len(self.serializer(data)) <= self.max_chars:
+            return {"data": data}
+
+        key, items = _largest_list(data)
+        if items is None:
+            return self._clip(data)
+
+        count = min(self.max_items, max(len(items) - offset, 0))
+        while True:
+            window = items[offset : offset + count]
+            shown = window if key is None else {**data, key: window}
+            if count <= 1 or len(self.serializer(shown)) <= self.max_chars:
+                break
+            count //= 2
+
+        page = (
+            {"data": shown}
+            if len(self.serializer(shown)) <= self.max_chars
+            else self._clip(shown)
+        )
+        if offset + count < len(items):
+            handle = handle or self._store(data)
+            page["truncated"] = (
+                f"showing items {offset}-{offset + count - 1} of {len(items)}"
+            )
+            page["continuation"] = {"handle": handle, "offset": offset + count}
+        return page
+
+    def _clip(self, data: Any) -> Dict[str, Any]:
+        text = self.serializer(data)
+        return {
+            "data": text[: self.max_chars],
+            "truncated": f"showing {self.max_chars} of {len(text)} characters, "
+            "use a select expression to narrow the response",
+        }
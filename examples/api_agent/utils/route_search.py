@@ -0,0 +1,115 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Tuple
+
+from examples.api_agent.utils.state_utils import extract_param_names, standardize
+
+HTTP_METHODS = frozenset({"get", "post", "put", "patch", "delete", "head", "options"})
+STOP_WORDS = frozenset(
+    {"a", "an", "and", "the", "of", "to", "for", "in", "on", "by", "with", "is",
+     "it", "be", "or", "this", "that", "from", "as", "at", "all", "my", "me", "i"}
+)  # fmt: skip
+DEFAULT_K = 5
+
+_CAMEL = re.compile(r"([a-z0-9])([A-Z])")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    text = _CAMEL.sub(r"\1 \2", text).lower()
+    return [
+        standardize(word)
+        for word in _WORD.findall(text)
+        if word not in STOP_WORDS and not word.isdigit()
+    ]
+
+
+class RouteSearch:
+    """
+    In-memory BM25 index over the operations of a spec. Each operation is a
+    document made of its path, operation id, summary, description, tags and
+    parameter names. Term weights are computed when the index is built, so a
+    query only sums precomputed weights over the postings of its terms.
+    """
+
+    def __init__(
+        self,
+        docs: List[Tuple[str, str, str, List[str]]],
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        # (method, path, summary) per document
+        self.docs = [(method, path, summary) for method, path, summary, _ in docs]
+
+        lengths = [len(terms) for *_, terms in docs]
+        avg_length = (sum(lengths) / len(lengths) if lengths else 0.0) or 1.0
+        frequencies: Dict[str, List[Tuple[int, int]]] = {}
+        for doc_id, (*_, terms) in enumerate(docs):
+            for term, tf in Counter(terms).items():
+                frequencies.setdefault(term, []).append((doc_id, tf))
+
+        n = len(docs)
+        self.postings: Dict[str, Tuple[Tuple[int, ...], Tuple[float, ...]]] = {}
+        for term, postings in frequencies.items():
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            weights = tuple(
+                idf
+                * tf
+                * (k1 + 1)
+                / (tf + k1 * (1 - b + b * lengths[doc_id] / avg_length))
+                for doc_id, tf in postings
+            )
+            self.postings[term] = (tuple(d for d, _ in postings), weights)
+
+    @classmethod
+    def build(cls, openapi: Mapping[str, Any]) -> "RouteSearch":
+        docs = []
+        for path, methods in openapi["paths"].items():
+            path_terms = tokenize(path.replace("{", " ").replace("}", " "))
+            for method, op in methods.items():
+                if method not in HTTP_METHODS or not isinstance(op, dict):
+                    continue
+                summary = op.get("summary") or op.get("description") or ""
+                text = " ".join(
+                    [
+                        op.get("operationId", ""),
+                        op.get("summary", ""),
+                        op.get("description", ""),
+                        *op.get("tags", ()),
+                        *extract_param_names(op),
+                    ]
+                )
+                terms = path_terms * 2 + tokenize(text)  # paths count double
+                docs.append((method, path, summary, terms))
+        return cls(docs)
+
+    def search(self, query: str, k: int = DEFAULT_K) -> List[Tuple[int, float]]:
+        """
+        Top k (doc id, score) pairs for the query, earlier operations first on ties.
+        """
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            for doc_id, weight in zip(*postings):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+    def render(self, query: str, k: int = DEFAULT_K) -> str:
+        results = self.search(query, k)
+        if not results:
+            return f"No routes match '{query}'."
+
+        lines = []
+        for doc_id, _ in results:
+            method, path, summary = self.docs[doc_id]
+            summary = " ".join(summary.split())
+            if len(summary) > 120:
+                summary = summary[:117] + "..."
+            lines.append(
+                f"[{method.upper()}] {path}" + (f" - {summary}" if summary else "")
+            )
+        return "\n".join(lines)
@@ -0,0 +1,367 @@
+import copy
+import hashlib
+import json
+import textwrap
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from networkx import DiGraph
+
+from examples.api_agent.utils.dependency_graph import DependencyGraph
+from examples.api_agent.utils.state_utils import (
+    RESOURCE_BLACKLIST,
+    extract_param_names,
+    find_resource,
+    standardize,
+    standardize_vocabulary,
+)
+
+_BLACKLIST = frozenset(RESOURCE_BLACKLIST)
+
+
+class PathRecord:
+    """
+    Everything the agent state needs from one entry of openapi["paths"].
+    """
+
+    __slots__ = (
+        "path",
+        "fingerprint",
+        "segments",
+        "resource",
+        "post_params",
+        "descriptions",
+        "_text",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        methods: Mapping[str, Any],
+        vocabulary: Optional[Mapping[str, str]] = None,
+    ):
+        # vocabulary maps raw names to standardized ones for a whole spec
+        name = standardize if vocabulary is None else _lookup(vocabulary)
+        self.path = path
+        self.fingerprint = fingerprint(methods)
+        self.segments = [name(seg) for seg in path.split("/") if seg]
+
+        # candidate resource named by this path, if it can be fetched or created
+        self.resource: Optional[str] = None
+        if {"get", "post"} & methods.keys():
+            resource = find_resource(path)
+            if resource and resource not in _BLACKLIST:
+                self.resource = resource
+
+        self.post_params: Optional[List[str]] = None
+        if "post" in methods:
+            post = methods["post"]
+            params = []
+            if "requestBody" in post:
+                params.extend(extract_param_names(post["requestBody"]))
+            if "parameters" in post:
+                params.extend(extract_param_names(post["parameters"]))
+            if not params:
+                params = extract_param_names(post)
+            self.post_params = sorted({name(p) for p in params})
+
+        self.descriptions = {
+            m: details.get("description", "No description available")
+            for m, details in methods.items()
+            if isinstance(details, dict)
+        }
+        self._text: Optional[str] = None
+
+    @property
+    def names(self) -> Set[str]:
+        # every standardized name whose resource status affects this path
+        return {*self.segments, *(self.post_params or ())}
+
+    def resource_stack(self, resources: Set[str]) -> List[str]:
+        return [seg for seg in self.segments if seg in resources]
+
+    def edges(self, resources: Set[str]) -> List[Tuple[str, str]]:
+        """
+        Dependency edges contributed by this path: nested resources depend on
+        the first resource in the path, which depends on resources named in
+        its POST parameters.
+        """
+        if self.post_params is None:
+            return []
+
+        resource_stack = self.resource_stack(resources)
+        if not resource_stack:
+            return []
+
+        parent = resource_stack[0]
+        edges = [(r, parent) for r in resource_stack[1:]]
+        edges.extend((parent, p) for p in self.post_params if p in resources)
+        return [(e1, e2) for e1, e2 in edges if e1 and e2 and e1 != e2]
+
+    def route(self, resources: Set[str]) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "methods": {
+                m: {"description": description}
+                for m, description in self.descriptions.items()
+            },
+            "resources": self.resource_stack(resources),
+        }
+
+    def render(self) -> str:
+        if self._text is None:
+            self._text = format_route(self.path, self.descriptions)
+        return self._text
+
+
+def _lookup(vocabulary: Mapping[str, str]) -> Callable[[str], str]:
+    def name(raw: str) -> str:
+        standardized = vocabulary.get(raw)
+        return standardize(raw) if standardized is None else standardized
+
+    return name
+
+
+def fingerprint(value: Any) -> str:
+    """
+    Content hash of part of a spec, used to tell what changed on reload. Values
+    that hash themselves (such as SpecStore sections) are not decoded.
+    """
+    if hasattr(value, "content_hash"):
+        return value.content_hash()
+    blob = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), default=_fingerprint_default
+    )
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+def _fingerprint_default(value: Any) -> Any:
+    if hasattr(value, "content_hash"):
+        return value.content_hash()
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Cannot fingerprint {type(value).__name__}")
+
+
+def format_route(path: str, descriptions: Dict[str, str]) -> str:
+    method_str = " ".join(f"[{m.upper()}]" for m in descriptions)
+    lines = [f"{method_str} {path}"]
+
+    for method, description in descriptions.items():
+        lines.append(f"    {method}:")
+        lines.append(
+            textwrap.fill(
+                description,
+                width=80,
+                initial_indent="    ",
+                subsequent_indent="    ",
+            )
+        )
+
+    return "\n".join(lines)
+
+
+class SpecIndex:
+    """
+    Indexes an OpenAPI spec in a single traversal of its paths. Each path is split
+    and standardized once; resources, dependency edges, the graph and the route
+    list are then derived from the per-path records with set lookups, so the cost
+    is linear in the size of the spec.
+
+    An index is never modified after it is built. `reload` returns a new index
+    that reuses everything the spec change did not touch.
+    """
+
+    def __init__(
+        self,
+        records: Dict[str, PathRecord],
+        previous: Optional["SpecIndex"] = None,
+        dirty: Iterable[str] = (),
+    ):
+        self.records = records
+        # paths whose record differs from the previous index
+        self.dirty = frozenset(records if previous is None else dirty)
+
+        if previous is None:
+            self.resource_counts = Counter(
+                r.resource for r in records.values() if r.resource is not None
+            )
+            self.resources: Set[str] = set(self.resource_counts)
+            affected = set(records)
+            self.path_edges = {}
+            removed_paths: Set[str] = set()
+        else:
+            dirty = set(dirty)
+            self.resource_counts = previous.resource_counts.copy()
+            for path in dirty:
+                for index, sign in ((previous, -1), (self, 1)):
+                    record = index.records.get(path)
+                    if record is not None and record.resource is not None:
+                        self.resource_counts[record.resource] += sign
+            self.resource_counts = +self.resource_counts  # drop zero counts
+            self.resources = set(self.resource_counts)
+
+            # a resource appearing or disappearing changes every path naming it
+            changed = self.resources ^ previous.resources
+            affected = {path for path in dirty if path in records}
+            if changed:
+                affected.update(
+                    path
+                    for path, record in records.items()
+                    if not changed.isdisjoint(record.names)
+                )
+            self.path_edges = {
+                path: edges
+                for path, edges in previous.path_edges.items()
+                if path in records
+            }
+            removed_paths = dirty - records.keys()
+
+        self._update_edges(affected, removed_paths, previous)
+        self._index_routes(affected, previous)
+
+    @classmethod
+    def build(cls, openapi: Mapping[str, Any]) -> "SpecIndex":
+        vocabulary = standardize_vocabulary(openapi)
+        return cls(
+            {
+                path: PathRecord(path, methods, vocabulary)
+                for path, methods in openapi["paths"].items()
+            }
+        )
+
+    def reload(self, openapi: Mapping[str, Any]) -> "SpecIndex":
+        """
+        Index a new version of the spec. Unchanged paths keep their records, and
+        edges, routes and rendered text are recomputed only for paths that
+        changed or name a resource that was added or removed.
+        """
+        records = {}
+        for path, methods in openapi["paths"].items():
+            record = self.records.get(path)
+            if record is None or record.fingerprint != fingerprint(methods):
+                record = PathRecord(path, methods)
+            records[path] = record
+
+        dirty = {
+            path
+            for path in self.records.keys() | records.keys()
+            if self.records.get(path) is not records.get(path)
+        }
+        if not dirty:
+            # same contents, but nothing is dirty relative to this index
+            unchanged = copy.copy(self)
+            unchanged.dirty = frozenset()
+            return unchanged
+        return SpecIndex(records, previous=self, dirty=dirty)
+
+    def _update_edges(
+        self,
+        affected: Set[str],
+        removed_paths: Set[str],
+        previous: Optional["SpecIndex"],
+    ):
+        for path in affected:
+            self.path_edges[path] = self.records[path].edges(self.resources)
+
+        if previous is None:
+            self.edges = [
+                edge for path in self.records for edge in self.path_edges[path]
+            ]
+            self.edge_counts = Counter(self.edges)
+            self.graph: DiGraph = DiGraph()
+            self.graph.add_edges_from(self.edge_counts)
+            self.dependencies = DependencyGraph(self.graph)
+            return
+
+        changed = [
+            path
+            for path in affected
+            if self.path_edges[path] != previous.path_edges.get(path)
+        ]
+        changed.extend(removed_paths)
+        if not changed:
+            self.edges = previous.edges
+            self.edge_counts = previous.edge_counts
+            self.graph = previous.graph
+            self.dependencies = previous.dependencies
+            return
+
+        self.edges = [edge for path in self.records for edge in self.path_edges[path]]
+        counts = previous.edge_counts.copy()
+        old_edges = set()
+        new_edges = set()
+        for path in changed:
+            old_edges.update(previous.path_edges.get(path, ()))
+            new_edges.update(self.path_edges.get(path, ()))
+            counts.subtract(previous.path_edges.get(path, ()))
+            counts.update(self.path_edges.get(path, ()))
+        self.edge_counts = +counts  # drop zero counts
+
+        removed = [edge for edge in old_edges if edge not in self.edge_counts]
+        added = [edge for edge in new_edges if edge not in previous.edge_counts]
+        if not removed and not added:
+            self.graph = previous.graph
+            self.dependencies = previous.dependencies
+            return
+
+        # the previous index keeps its graph, requests running on it still read it
+        self.graph = previous.graph.copy()
+        self.graph.remove_edges_from(removed)
+        self.graph.add_edges_from(added)
+        self.graph.remove_nodes_from(
+            {node for edge in removed for node in edge if not self.graph.degree(node)}
+        )
+        self.dependencies = previous.dependencies.update(removed, added)
+
+    def _index_routes(self, affected: Set[str], previous: Optional["SpecIndex"]):
+        previous_routes = {} if previous is None else previous.routes_by_path
+        self.routes_by_path = {
+            path: (
+                record.route(self.resources)
+                if path in affected or path not in previous_routes
+                else previous_routes[path]
+            )
+            for path, record in self.records.items()
+        }
+        self.route_list = list(self.routes_by_path.values())
+
+        # inverted index, each route rendered once and shared by its resources
+        self.routes_by_resource: Dict[str, List[Dict[str, Any]]] = {}
+        for route in self.route_list:
+            for resource in dict.fromkeys(route["resources"]):
+                self.routes_by_resource.setdefault(resource, []).append(route)
+
+        # only resources whose routes changed need their text joined again
+        stale = set(self.routes_by_resource)
+        if previous is not None:
+            stale = {
+                resource
+                for resource, routes in self.routes_by_resource.items()
+                if len(routes) != len(previous.routes_by_resource.get(resource, ()))
+                or any(
+                    a is not b
+                    for a, b in zip(routes, previous.routes_by_resource[resource])
+                )
+            }
+        self.route_text = {
+            resource: (
+                "\n\n".join(
+                    self.records[route["path"]].render() for route in routes
+                ).strip()
+                if resource in stale
+                else previous.route_text[resource]
+            )
+            for resource, routes in self.routes_by_resource.items()
+        }
+
+    def routes_for(self, resource: str) -> str:
+        return self.route_text.get(resource, "")
+
+    def state(self) -> Dict[str, Any]:
+        return dict(
+            resources=self.resources,
+            edges=self.edges,
+            graph=self.graph,
+            route_list=self.route_list,
+        )
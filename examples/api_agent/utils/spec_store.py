@@ -0,0 +1,198 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Union
+
+MAGIC = b"PSPEC002"
+_HEADER = struct.Struct("<8sQ")  # magic, index length
+# sections split into separately decodable fragments, one level below the key
+INDEXED_SECTIONS = ("paths", "components")
+FRAGMENT_CACHE_SIZE = 1024
+
+
+def convert_spec(src_path: str, dst_path: str) -> str:
+    """
+    Convert an OpenAPI JSON file into an indexed spec file: a JSON index of
+    byte offsets and content digests followed by one compact JSON fragment per
+    path item entry (operation, path parameters, ...) and per component.
+    """
+    with open(src_path, "rb") as file:
+        raw = file.read()
+    openapi = json.loads(raw)
+
+    data = bytearray()
+
+    def add(value: Any):
+        blob = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+        offset = len(data)
+        data.extend(blob)
+        return [offset, len(blob), _digest(blob)]
+
+    index = {"sha256": hashlib.sha256(raw).hexdigest(), "meta": {}, "sections": {}}
+    for key, value in openapi.items():
+        if key in INDEXED_SECTIONS and isinstance(value, dict):
+            index["sections"][key] = {
+                name: (
+                    {k: add(v) for k, v in item.items()}
+                    if isinstance(item, dict)
+                    else add(item)
+                )
+                for name, item in value.items()
+            }
+        else:
+            index["meta"][key] = value
+
+    index_blob = json.dumps(index, separators=(",", ":")).encode()
+    directory = os.path.dirname(os.path.abspath(dst_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, len(index_blob)))
+            file.write(index_blob)
+            file.write(data)
+        os.replace(tmp_path, dst_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return dst_path
+
+
+def _digest(blob: bytes) -> str:
+    return hashlib.blake2b(blob, digest_size=10).hexdigest()
+
+
+class _Section(Mapping):
+    """
+    Read-only view over part of the index. Entries are decoded from the store
+    when accessed.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "SpecStore", index: Dict[str, Any]):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self._index[key]
+        if isinstance(entry, dict):
+            return _Section(self._store, entry)
+        offset, length, _ = entry
+        return self._store.fragment(offset, length)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def content_hash(self) -> str:
+        # from the fragment digests in the index, nothing is decoded
+        return self._store.section_hash(self._index)
+
+
+def _copy_json(value: Any) -> Any:
+    # decoded JSON only holds dicts, lists and immutable scalars, so this is a
+    # deep copy without the bookkeeping of copy.deepcopy
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
+def _digests(entry: Any) -> Any:
+    if isinstance(entry, dict):
+        return {key: _digests(value) for key, value in entry.items()}
+    return entry[2]
+
+
+class SpecStore(Mapping):
+    """
+    Read-only OpenAPI spec backed by a memory-mapped indexed spec file. Behaves
+    like the parsed spec dict, but only the index is parsed up front. Operations
+    and components are decoded on access (recently used ones are kept and handed
+    out as copies), and processes mapping the same file share its pages through
+    the OS page cache.
+    """
+
+    def __init__(self, path: str, cache_size: int = FRAGMENT_CACHE_SIZE):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_len = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an indexed spec file")
+        self._data_start = _HEADER.size + index_len
+        self._index = json.loads(self._map[_HEADER.size : self._data_start])
+        self._fragment = lru_cache(maxsize=cache_size)(self._decode)
+        self._section_hashes: Dict[int, str] = {}
+
+    @classmethod
+    def open(cls, spec_path: str, store_path: str = None) -> "SpecStore":
+        """
+        Open the indexed form of a JSON spec, converting it first if the indexed
+        file is missing or older than the spec.
+        """
+        store_path = store_path or os.path.splitext(spec_path)[0] + ".pspec"
+        if not os.path.exists(store_path) or os.path.getmtime(
+            store_path
+        ) < os.path.getmtime(spec_path):
+            convert_spec(spec_path, store_path)
+        try:
+            return cls(store_path)
+        except ValueError:
+            # written by an older version of the format
+            convert_spec(spec_path, store_path)
+            return cls(store_path)
+
+    def fragment(self, offset: int, length: int) -> Any:
+        """
+        Decoded fragment. The cached value is shared, so callers get a copy they
+        are free to change.
+        """
+        return _copy_json(self._fragment(offset, length))
+
+    def _decode(self, offset: int, length: int) -> Any:
+        start = self._data_start + offset
+        return json.loads(self._map[start : start + length])
+
+    def content_hash(self) -> str:
+        # lets the setup cache key on the spec without decoding it
+        return self._index["sha256"]
+
+    def section_hash(self, index: Dict[str, Any]) -> str:
+        """
+        Content hash of part of the index, independent of where its fragments
+        are stored. Memoized, since index entries never change.
+        """
+        key = id(index)
+        if key not in self._section_hashes:
+            self._section_hashes[key] = _digest(
+                json.dumps(_digests(index), sort_keys=True).encode()
+            )
+        return self._section_hashes[key]
+
+    def __getitem__(self, key: str) -> Union[Any, _Section]:
+        if key in self._index["sections"]:
+            return _Section(self, self._index["sections"][key])
+        return _copy_json(self._index["meta"][key])
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._index["meta"]
+        yield from self._index["sections"]
+
+    def __len__(self) -> int:
+        return len(self._index["meta"]) + len(self._index["sections"])
+
+    def __getstate__(self):
+        return {"path": self.path, "cache_size": self._fragment.cache_info().maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["cache_size"])
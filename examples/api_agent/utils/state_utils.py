@@ -1,4 +1,5 @@
-from typing import Dict, Any, List, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping
 import re
 
 import networkx as nx
@@ -23,47 +24,65 @@ RESOURCE_BLACKLIST = [
 ]
 
 
-def extract_resources(openapi: Dict[str, Any]) -> List[str]:
-    resources: List[str] = []
+# ignored words for singularization
+INVARIANT_WORDS = frozenset({"synthesis", "analysis", "basis", "thesis", "process"})
+STANDARDIZE_CACHE_SIZE = 1 << 16
+
+_NON_ALNUM = re.compile(r"[^a-z0-9-]")
+_ID_SUFFIX = re.compile(r"-ids?$")
+_engine = None
 
-    for path, methods in openapi["paths"].items():
-        if not set(methods.keys()) & {"get", "post"}:
-            continue
 
-        resource = find_resource(path)
-        if not resource or resource in RESOURCE_BLACKLIST:
-            continue
+def _inflect_engine() -> engine:
+    # building an inflect engine is expensive, share one per process
+    global _engine
+    if _engine is None:
+        _engine = engine()
+    return _engine
 
-        resources.append(resource)
 
-    return resources
+@lru_cache(maxsize=STANDARDIZE_CACHE_SIZE)
+def _singular(part: str) -> str:
+    if not part or part in INVARIANT_WORDS:
+        return part
+    return _inflect_engine().singular_noun(text=part) or part
 
 
+@lru_cache(maxsize=STANDARDIZE_CACHE_SIZE)
 def standardize(name: str) -> str:
     if not name:
         return name
 
-    # ignored words for singularization
-    invariant_words = {"synthesis", "analysis", "basis", "thesis", "process"}
-
     # Convert to lowercase, kebab case
-    name = name.lower().replace("_", "-")
-    name = name.lower().replace(" ", "-")
-    name = re.sub(r"[^a-z0-9-]", "", name)
-    parts = name.split("-")
+    name = name.lower().replace("_", "-").replace(" ", "-")
+    name = _NON_ALNUM.sub("", name)
 
     # singularize
-    p = engine()
-    parts = [
-        part if part in invariant_words else (p.singular_noun(text=part) or part)
-        for part in parts
-    ]
-
-    standardized_name = "-".join(parts)
-    standardized_name = re.sub(r"-ids?$", "", standardized_name)  # strip id
+    standardized_name = "-".join(_singular(part) for part in name.split("-"))
+    standardized_name = _ID_SUFFIX.sub("", standardized_name)  # strip id
     return standardized_name
 
 
+def standardize_many(names: Iterable[str]) -> Dict[str, str]:
+    """
+    Standardize a batch of names, normalizing each distinct name once.
+    """
+    return {name: standardize(name) for name in set(names)}
+
+
+def standardize_vocabulary(openapi: Mapping[str, Any]) -> Dict[str, str]:
+    """
+    Normalize every path segment and request parameter name in the spec in one
+    pass, returning a lookup table from raw to standardized name.
+    """
+    names = set()
+    for path, methods in openapi["paths"].items():
+        names.update(seg for seg in path.split("/") if seg)
+        if "post" in methods:
+            names.update(extract_param_names(methods["post"]))
+    return standardize_many(names)
+
+
 def find_resource(path: str) -> str:
     elements = path.split("/")
     for element in reversed(elements):
@@ -72,62 +91,22 @@ def find_resource(path: str) -> str:
     return ""
 
 
-def organize_resources(openapi: Dict[str, Any], resources: List[str]):
-    edges = []  # list(parent, child)
-
-    def extract_param_names(obj) -> List[str]:
-        param_names = []
-
-        def recursive_extract(current_obj):
-            if isinstance(current_obj, dict):
-                if "properties" in current_obj:
-                    param_names.extend(current_obj["properties"].keys())
-                else:
-                    for value in current_obj.values():
-                        recursive_extract(value)
-            elif isinstance(current_obj, list):
-                for item in current_obj:
-                    recursive_extract(item)
-
-        recursive_extract(obj)
-        return list(set(param_names))
-
-    for path, methods in openapi["paths"].items():
-        if "post" not in methods.keys():
-            continue
-
-        # edges from path structure
-        path_segments = [standardize(seg) for seg in path.split("/") if seg]
-        resource_stack = [seg for seg in path_segments if seg in resources]
-
-        if not resource_stack:
-            continue
-
-        parent = resource_stack[0]
-        if len(resource_stack) > 1:
-            for r in resource_stack[1:]:
-                edges.append((r, parent))
-
-        # edges from request shape
-        def filter_strings(main_list, filter_list):
-            return [string for string in filter_list if string in main_list]
+def extract_param_names(obj) -> List[str]:
+    param_names = []
 
-        params = []
-        if "requestBody" in methods["post"]:
-            params.extend(extract_param_names(methods["post"]["requestBody"]))
-        if "parameters" in methods["post"]:
-            params.extend(extract_param_names(methods["post"]["parameters"]))
-        if not params:
-            params = extract_param_names(methods["post"])
+    def recursive_extract(current_obj):
+        if isinstance(current_obj, dict):
+            if "properties" in current_obj:
+                param_names.extend(current_obj["properties"].keys())
+            else:
+                for value in current_obj.values():
+                    recursive_extract(value)
+        elif isinstance(current_obj, list):
+            for item in current_obj:
+                recursive_extract(item)
 
-        params = [standardize(p) for p in params]
-        for r in filter_strings(params, resources):
-            edges.append((parent, r))
-
-    def clean_edges(inp_e: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
-        return [(e1, e2) for e1, e2 in inp_e if e1 and e2 and e1 != e2]
-
-    return clean_edges(edges)
+    recursive_extract(obj)
+    return list(set(param_names))
 
 
 def build_dependency_tree(edges: []) -> DiGraph:
@@ -135,22 +114,3 @@ def build_dependency_tree(edges: []) -> DiGraph:
     graph.add_edges_from(edges)
 
     return graph
-
-
-def organize_routes(openapi, resources):
-    route_list = []
-    for path, methods in openapi["paths"].items():
-        defn = {"path": path, "methods": {}, "resources": []}
-
-        for m, details in methods.items():
-            defn["methods"][m] = {
-                "description": details.get("description", "No description available")
-            }
-
-        path_segments = [standardize(seg) for seg in path.split("/") if seg]
-        resource_stack = [seg for seg in path_segments if seg in resources]
-        defn["resources"] = resource_stack
-
-        route_list.append(defn)
-
-    return route_list
@@ -0,0 +1,117 @@
+from typing import Iterable, Iterator, List
+
+import litellm
+
+DEFAULT_BLOCK_SIZE = 1 << 16  # characters read per block
+DEFAULT_CHUNK_TOKENS = 1_000
+DEFAULT_OVERLAP_TOKENS = 100
+# longest run of text without whitespace held back before cutting it anyway
+MAX_CARRY = 1 << 18
+# a UTF-8 character spans at most 4 bytes, so at most 4 tokens
+MAX_CHAR_TOKENS = 4
+REPLACEMENT = "\ufffd"
+
+
+def read_blocks(filepath: str, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Read a text file in fixed-size blocks, so memory use does not depend on the
+    size of the file.
+    """
+    with open(filepath, "r", encoding="utf-8", errors="replace") as file:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+class TokenChunker:
+    """
+    Splits streamed text into chunks of `chunk_tokens` tokens (as counted by the
+    model's tokenizer), each overlapping the previous one by `overlap` tokens.
+    Blocks are only cut at whitespace, so words are never split across blocks
+    before tokenizing, and chunks are only cut at token boundaries that fall
+    between characters, so a multi-byte character is never split across chunks.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+        overlap: int = DEFAULT_OVERLAP_TOKENS,
+    ):
+        if not 0 <= overlap < chunk_tokens:
+            raise ValueError("overlap must be smaller than chunk_tokens")
+        self.model = model
+        self.chunk_tokens = chunk_tokens
+        self.overlap = overlap
+
+    def encode(self, text: str) -> List[int]:
+        tokens = litellm.encode(model=self.model, text=text)
+        return list(getattr(tokens, "ids", tokens))  # huggingface tokenizers
+
+    def decode(self, tokens: List[int]) -> str:
+        return litellm.decode(model=self.model, tokens=tokens)
+
+    def chunks(self, blocks: Iterable[str]) -> Iterator[str]:
+        buffer: List[int] = []
+        fresh = 0  # tokens at the end of the buffer not yet emitted in any chunk
+        carry = ""
+
+        for block in blocks:
+            text = carry + block
+            cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t")) + 1
+            if not cut and len(text) < MAX_CARRY:
+                carry = text  # no whitespace yet, wait for more
+                continue
+            cut = cut or len(text)
+            text, carry = text[:cut], text[cut:]
+
+            tokens = self.encode(text)
+            buffer.extend(tokens)
+            fresh += len(tokens)
+            fresh = yield from self._drain(buffer, fresh, final=False)
+
+        if carry:
+            tokens = self.encode(carry)
+            buffer.extend(tokens)
+            fresh += len(tokens)
+        yield from self._drain(buffer, fresh, final=True)
+
+    def _drain(self, buffer: List[int], fresh: int, final: bool):
+        """
+        Emit every full chunk in the buffer (and the remainder when final), then
+        drop the emitted tokens except the overlap. Returns the new fresh count.
+        """
+        start = 0
+        while len(buffer) - start >= self.chunk_tokens + (1 if final else 0):
+            end = self._boundary(buffer, start + self.chunk_tokens, start)
+            yield self.decode(buffer[start:end])
+            overlap_start = self._boundary(buffer, end - self.overlap, start)
+            start = overlap_start if overlap_start > start else end
+            fresh = len(buffer) - end
+        if final and fresh:
+            yield self.decode(buffer[start:])
+        del buffer[:start]
+        return fresh
+
+    def _boundary(self, buffer: List[int], index: int, after: int) -> int:
+        """
+        The closest token boundary at or before `index` (and past `after`) that
+        does not fall inside a character. Tokens starting mid-character decode to
+        a leading replacement character.
+        """
+        for cut in range(index, max(index - MAX_CHAR_TOKENS, after), -1):
+            if cut >= len(buffer):
+                return cut
+            if not self.decode(buffer[cut : cut + MAX_CHAR_TOKENS]).startswith(
+                REPLACEMENT
+            ):
+                return cut
+        # text that really contains U+FFFD
+        return index
+
+    def chunk_file(
+        self, filepath: str, block_size: int = DEFAULT_BLOCK_SIZE
+    ) -> Iterator[str]:
+        return self.chunks(read_blocks(filepath, block_size))
@@ -1,45 +1,203 @@
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
 from src.parrot import tasker
 
+from examples.doc_keeper.chunking import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_CHUNK_TOKENS,
+    DEFAULT_OVERLAP_TOKENS,
+    TokenChunker,
+)
+from examples.doc_keeper.summarizer import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_FAN_IN,
+    Summarizer,
+)
+from examples.doc_keeper.summary_tree import ChunkStore, SummaryTree
+
+DEFAULT_MODEL = "gpt-4o-mini"
+_DONE = object()
+
 
 @tasker
 class DocKeeper:
     """
-    Orchestrating tasker
+    Orchestrating tasker. Streams a document from disk through a token-aware
+    chunker into a map-reduce summarizer, reporting progress as chunks finish.
     """
 
     @tasker.setup
-    def setup(self, config):
-        # parse file to string
-        # chunk file
+    def setup(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        model = config.get("model", DEFAULT_MODEL)
+
+        return dict(
+            chunker=TokenChunker(
+                model,
+                chunk_tokens=config.get("chunk_tokens", DEFAULT_CHUNK_TOKENS),
+                overlap=config.get("overlap", DEFAULT_OVERLAP_TOKENS),
+            ),
+            summarizer=Summarizer(
+                model,
+                max_concurrency=config.get("max_concurrency", DEFAULT_CONCURRENCY),
+                fan_in=config.get("fan_in", DEFAULT_FAN_IN),
+            ),
+            block_size=config.get("block_size", DEFAULT_BLOCK_SIZE),
+        )
+
+    async def astream(
+        self, filepath: str, thread: Optional[List[Dict[str, Any]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Summarize a file, yielding progress events and then the summary. When a
+        message thread is given the summary is appended to it.
+        """
+        state = self._state.get()
+        chunks = state["chunker"].chunk_file(filepath, state["block_size"])
 
-        pass
+        events: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(
+            state["summarizer"].summarize(chunks, on_event=events.put_nowait)
+        )
+        task.add_done_callback(lambda _: events.put_nowait(_DONE))
+
+        try:
+            while (event := await events.get()) is not _DONE:
+                yield event
+            summary = task.result()
+        finally:
+            task.cancel()
+
+        if thread is not None:
+            thread.append({"role": "assistant", "content": summary})
+        yield {"type": "summary", "content": summary}
 
     @tasker.run
-    def run(self, filepath, thread):
-        # parse file to string
-        # chunk file
-        # summarize doc
+    def run(
+        self, filepath: str, thread: Optional[List[Dict[str, Any]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        events: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        running: Dict[str, Any] = {}
+
+        async def pump():
+            running["loop"] = asyncio.get_running_loop()
+            running["task"] = asyncio.current_task()
+            try:
+                if stop.is_set():
+                    return
+                async for event in self.astream(filepath, thread):
+                    events.put(event)
+            except asyncio.CancelledError:
+                pass
+            except BaseException as e:
+                events.put(e)
+            finally:
+                events.put(_DONE)
+
+        producer = threading.Thread(target=asyncio.run, args=(pump(),), daemon=True)
+        producer.start()
+        try:
+            while (event := events.get()) is not _DONE:
+                if isinstance(event, BaseException):
+                    raise event
+                yield event
+        finally:
+            # the consumer may stop early; cancel the summary instead of
+            # letting it run to completion in the background
+            stop.set()
+            if "task" in running:
+                try:
+                    running["loop"].call_soon_threadsafe(running["task"].cancel)
+                except RuntimeError:
+                    pass  # loop already closed
+            producer.join()
 
-        pass
+
+EDIT_PROMPT = """Apply the instruction to the text below. Respond with only the rewritten text.
+
+Instruction:
+{instruction}
+
+Text:
+{text}"""
 
 
 @tasker
 class DocEditor:
     """
-    Document editor
+    Document editor. Applies instructions to single chunks and keeps a summary of
+    the whole document current by re-summarizing only the edited chunk and its
+    ancestors in a Merkle summary tree.
     """
 
     @tasker.setup
-    def setup(self, config):
-        # parse file to string
-        # chunk file
+    def setup(self, config: Dict[str, Any]):
+        model = config.get("model", DEFAULT_MODEL)
+        summarizer = Summarizer(
+            model,
+            max_concurrency=config.get("max_concurrency", DEFAULT_CONCURRENCY),
+            fan_in=config.get("fan_in", DEFAULT_FAN_IN),
+        )
+        # chunks partition the document, so edits can be written back in place
+        chunker = TokenChunker(
+            model,
+            chunk_tokens=config.get("chunk_tokens", DEFAULT_CHUNK_TOKENS),
+            overlap=0,
+        )
+        store = ChunkStore()
+        tree = SummaryTree(store, summarizer)
 
-        pass
+        leaves = tuple(
+            store.put(text)
+            for text in chunker.chunk_file(
+                config["filepath"], config.get("block_size", DEFAULT_BLOCK_SIZE)
+            )
+        )
+        summary, _ = asyncio.run(tree.summarize(leaves))
 
-    @tasker.run
-    def run(self, chunk, instruction):
-        # parse file to string
-        # chunk file
-        # summarize doc
+        return dict(
+            summarizer=summarizer,
+            store=store,
+            tree=tree,
+            leaves=leaves,
+            summary=summary,
+        )
+
+    def document(self) -> str:
+        state = self._state.get()
+        return "".join(state["store"].text(key) for key in state["leaves"])
 
-        pass
+    async def arun(self, chunk: int, instruction: str) -> Dict[str, Any]:
+        """
+        Rewrite one chunk according to the instruction and return it with the
+        updated document summary. Edits should be applied one at a time.
+        """
+        state = self._state.get()
+        store, summarizer, tree = state["store"], state["summarizer"], state["tree"]
+        leaves = list(state["leaves"])
+
+        text = await summarizer.complete(
+            EDIT_PROMPT.format(instruction=instruction, text=store.text(leaves[chunk]))
+        )
+        leaves[chunk] = store.put(text)
+        summary, calls = await tree.summarize(leaves)
+        tree.prune(leaves)
+
+        self._state.update({"leaves": tuple(leaves), "summary": summary})
+        return {
+            "chunk": chunk,
+            "text": text,
+            "summary": summary,
+            "model_calls": calls + 1,
+        }
+
+    @tasker.run
+    def run(self, chunk: int, instruction: str) -> Dict[str, Any]:
+        """
+        Blocking version of `arun`, for callers without an event loop.
+        """
+        return asyncio.run(self.arun(chunk, instruction))
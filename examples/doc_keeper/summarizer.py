@@ -0,0 +1,124 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.parrot import ModelRunner
+
+CHUNK_PROMPT = """Summarize the following part of a longer document. Keep names, numbers, definitions and decisions; drop repetition.
+
+{text}"""
+
+COMBINE_PROMPT = """The following are summaries of consecutive parts of one document, in order. Combine them into a single summary of the whole, keeping the most important names, numbers, definitions and decisions.
+
+{summaries}"""
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_FAN_IN = 8
+
+
+class Summarizer:
+    """
+    Map-reduce summarizer. Chunks are summarized concurrently (at most
+    `max_concurrency` model calls at once) and summaries are folded into a tree
+    `fan_in` at a time as they arrive, so only the chunks in flight and one
+    partial group per tree level are held in memory.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        fan_in: int = DEFAULT_FAN_IN,
+        **inference_kwargs,
+    ):
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        self.model_runner = ModelRunner()
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.fan_in = fan_in
+        self.inference_kwargs = inference_kwargs
+
+    async def complete(self, prompt: str) -> str:
+        response = await self.model_runner.ainference(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            **self.inference_kwargs,
+        )
+        return response.choices[-1].message.content or ""
+
+    async def summarize_chunk(self, text: str) -> str:
+        return await self.complete(CHUNK_PROMPT.format(text=text))
+
+    async def combine(self, summaries: List[str]) -> str:
+        if len(summaries) == 1:
+            return summaries[0]
+        joined = "\n\n".join(f"[{i + 1}] {s}" for i, s in enumerate(summaries))
+        return await self.complete(COMBINE_PROMPT.format(summaries=joined))
+
+    async def summarize(
+        self,
+        chunks: Iterable[str],
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> str:
+        """
+        Summarize a stream of chunks. `on_event` is called with a progress event
+        as each chunk summary finishes.
+        """
+        emit = on_event or (lambda event: None)
+        limit = asyncio.Semaphore(self.max_concurrency)
+        levels: List[List[str]] = []
+
+        async def map_chunk(index: int, text: str) -> str:
+            async with limit:
+                summary = await self.summarize_chunk(text)
+            emit({"type": "chunk", "index": index, "summary": summary})
+            return summary
+
+        async def push(level: int, summary: str):
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(summary)
+            if len(levels[level]) == self.fan_in:
+                group, levels[level] = levels[level], []
+                async with limit:
+                    combined = await self.combine(group)
+                emit({"type": "combine", "level": level + 1})
+                await push(level + 1, combined)
+
+        # chunk summaries are folded in document order; the window bounds how
+        # many chunk texts are held while earlier ones are still running
+        window = deque()
+        # chunks may be read and tokenized lazily, so pull them in a worker
+        # thread rather than blocking the event loop
+        chunk_iter = iter(chunks)
+        index = 0
+        try:
+            while (text := await asyncio.to_thread(next, chunk_iter, None)) is not None:
+                window.append(asyncio.create_task(map_chunk(index, text)))
+                index += 1
+                if len(window) >= 2 * self.max_concurrency:
+                    await push(0, await window.popleft())
+            while window:
+                await push(0, await window.popleft())
+        finally:
+            for task in window:
+                task.cancel()
+
+        # fold what is left, earliest text (highest level) first
+        remaining = [s for level in reversed(levels) for s in level]
+        if not remaining:
+            return ""
+        while len(remaining) > 1:
+            groups = [
+                remaining[i : i + self.fan_in]
+                for i in range(0, len(remaining), self.fan_in)
+            ]
+            remaining = await asyncio.gather(
+                *(self._limited_combine(limit, group) for group in groups)
+            )
+        return remaining[0]
+
+    async def _limited_combine(self, limit: asyncio.Semaphore, group: List[str]) -> str:
+        async with limit:
+            return await self.combine(group)
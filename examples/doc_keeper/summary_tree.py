@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+from typing import Dict, List, Sequence, Set, Tuple
+
+from examples.doc_keeper.summarizer import Summarizer
+
+
+def leaf_hash(text: str) -> str:
+    return hashlib.sha256(b"leaf:" + text.encode()).hexdigest()
+
+
+def node_hash(children: Sequence[str]) -> str:
+    return hashlib.sha256(("node:" + ",".join(children)).encode()).hexdigest()
+
+
+class ChunkStore:
+    """
+    Content-addressed chunk texts and the summaries of tree nodes, both keyed by
+    hash. Identical chunks are stored and summarized once.
+    """
+
+    def __init__(self):
+        self.texts: Dict[str, str] = {}
+        self.summaries: Dict[str, str] = {}
+
+    def put(self, text: str) -> str:
+        key = leaf_hash(text)
+        self.texts.setdefault(key, text)
+        return key
+
+    def text(self, key: str) -> str:
+        return self.texts[key]
+
+    def retain(self, keys: Set[str]) -> None:
+        """
+        Evict every chunk text and summary whose key is not in keys.
+        """
+        for entries in (self.texts, self.summaries):
+            for key in [key for key in entries if key not in keys]:
+                del entries[key]
+
+
+class SummaryTree:
+    """
+    Merkle-style summary tree over a sequence of chunk hashes. Every internal
+    node groups `fan_in` consecutive children and is keyed by the hash of their
+    keys, so replacing a chunk changes only the keys on its path to the root.
+    Summaries are cached by key, so re-summarizing after an edit costs one chunk
+    summary plus one combine per level.
+    """
+
+    def __init__(self, store: ChunkStore, summarizer: Summarizer):
+        self.store = store
+        self.summarizer = summarizer
+
+    def levels(self, leaves: Sequence[str]) -> List[List[str]]:
+        fan_in = self.summarizer.fan_in
+        levels = [list(leaves)]
+        while len(levels[-1]) > 1:
+            below = levels[-1]
+            levels.append(
+                [node_hash(below[i : i + fan_in]) for i in range(0, len(below), fan_in)]
+            )
+        return levels
+
+    def prune(self, leaves: Sequence[str]) -> None:
+        """
+        Drop chunks and summaries that are no longer part of the tree over these
+        leaves, so the store does not grow with every edit.
+        """
+        self.store.retain({key for level in self.levels(leaves) for key in level})
+
+    async def summarize(self, leaves: Sequence[str]) -> Tuple[str, int]:
+        """
+        Summary of the document made of these chunks, and the number of model
+        calls it took.
+        """
+        if not leaves:
+            return "", 0
+
+        fan_in = self.summarizer.fan_in
+        summaries = self.store.summaries
+        limit = asyncio.Semaphore(self.summarizer.max_concurrency)
+        calls = 0
+
+        async def compute(depth: int, index: int, key: str, below: List[str]):
+            nonlocal calls
+            if depth == 0:
+                async with limit:
+                    summaries[key] = await self.summarizer.summarize_chunk(
+                        self.store.text(key)
+                    )
+                calls += 1
+                return
+
+            children = [
+                summaries[c] for c in below[index * fan_in : (index + 1) * fan_in]
+            ]
+            if len(children) > 1:
+                async with limit:
+                    summaries[key] = await self.summarizer.combine(children)
+                calls += 1
+            else:
+                summaries[key] = children[0]
+
+        levels = self.levels(leaves)
+        for depth, level in enumerate(levels):
+            below = levels[depth - 1] if depth else []
+            missing = {}
+            for index, key in enumerate(level):
+                if key not in summaries:
+                    missing.setdefault(key, index)
+            await asyncio.gather(
+                *(compute(depth, index, key, below) for key, index in missing.items())
+            )
+
+        return summaries[levels[-1][0]], calls
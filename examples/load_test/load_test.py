@@ -0,0 +1,222 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.parrot import ToolRunner, tasker
+from src.parrot.model_gateway.model_gateway import LiteLLMGateway
+
+from examples.load_test.stand_in import (
+    Latency,
+    ScriptedGateway,
+    StandInModelRunner,
+    make_stub_tool,
+)
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+MODES = ("threads", "async")
+
+
+@tasker
+class LoadAgent:
+    """
+    Agent with a stand-in model and stub tools, so a session exercises only the
+    framework: tasker state, the tool loop, argument validation and the context.
+    """
+
+    @tasker.setup
+    def setup(self, config: Dict[str, Any]):
+        tools = [
+            make_stub_tool(
+                f"tool_{i}",
+                cpu_ms=config.get("tool_cpu_ms", 0.0),
+                io_ms=config.get("tool_io_ms", 0.0),
+                output_chars=config.get("output_chars", 200),
+                is_async=config.get("async_tools", False),
+            )
+            for i in range(config.get("tools", 3))
+        ]
+        return dict(
+            tools=tools,
+            script=config.get("script", [2, 1]),
+            latency=config.get("latency", Latency()),
+        )
+
+    def runner(self, seed: int) -> ToolRunner:
+        state = self._state.get()
+        gateway = ScriptedGateway(
+            state["script"],
+            [t.__name__ for t in state["tools"]],
+            state["latency"],
+            seed=seed,
+        )
+        runner = ToolRunner("stand-in", state)
+        runner.model_runner = StandInModelRunner(gateway)
+        return runner
+
+    @tasker.run
+    def run(self, seed: int = 0) -> List[float]:
+        """
+        Run one session and return the latency of each of its turns.
+        """
+        runner = self.runner(seed)
+        runner.run(tools=self._state.get()["tools"], user_prompt="go")
+        return runner.model_runner.turn_latencies(time.perf_counter())
+
+    async def arun(self, seed: int = 0) -> List[float]:
+        runner = self.runner(seed)
+        await runner.arun(tools=self._state.get()["tools"], user_prompt="go")
+        return runner.model_runner.turn_latencies(time.perf_counter())
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+    """
+    if not values:
+        return 0.0
+    return values[max(math.ceil(q / 100 * len(values)) - 1, 0)]
+
+
+def rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * (resource.getpagesize() if resource else 4096) / 2**20
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def run_threads(agent: LoadAgent, sessions: int, concurrency: int) -> List[Any]:
+    with ThreadPoolExecutor(concurrency) as pool:
+        futures = [pool.submit(agent.run, seed) for seed in range(sessions)]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+async def run_async(agent: LoadAgent, sessions: int, concurrency: int) -> List[Any]:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def session(seed: int):
+        async with limit:
+            return await agent.arun(seed)
+
+    return await asyncio.gather(
+        *(session(seed) for seed in range(sessions)), return_exceptions=True
+    )
+
+
+def run_load(
+    agent: LoadAgent, sessions: int, concurrency: int, mode: str = "threads"
+) -> Dict[str, Any]:
+    """
+    Run `sessions` sessions, at most `concurrency` at a time, and report
+    throughput, turn latency percentiles, CPU and memory.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+    LiteLLMGateway.backend()  # keep the one-off import out of the measurement
+
+    cpu = time.process_time()
+    started = time.perf_counter()
+    if mode == "threads":
+        results = run_threads(agent, sessions, concurrency)
+    else:
+        results = asyncio.run(run_async(agent, sessions, concurrency))
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    turns = sorted(t for r in results if not isinstance(r, BaseException) for t in r)
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "errors": len(errors),
+        "first_error": repr(errors[0]) if errors else None,
+        "wall_s": wall,
+        "sessions_per_s": (sessions - len(errors)) / wall,
+        "turns_per_s": len(turns) / wall,
+        "turn_p50_ms": percentile(turns, 50) * 1000,
+        "turn_p95_ms": percentile(turns, 95) * 1000,
+        "turn_p99_ms": percentile(turns, 99) * 1000,
+        "cpu_s": cpu,
+        "cpu_util": cpu / wall,
+        "rss_mb": rss_mb(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = []
+    for key, value in report.items():
+        if isinstance(value, float):
+            value = f"{value:.3f}"
+        lines.append(f"{key:>16}  {value}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Simulate concurrent agent sessions against a stand-in model"
+    )
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--mode", choices=MODES, default="threads")
+    parser.add_argument(
+        "--script",
+        default="2,1",
+        help="tool calls requested in each turn before the final answer",
+    )
+    parser.add_argument(
+        "--latency",
+        default="lognormal:0.2:0.5",
+        help="model latency in seconds, e.g. fixed:0.1 or lognormal:0.2:0.5",
+    )
+    parser.add_argument("--tools", type=int, default=3)
+    parser.add_argument("--tool-cpu-ms", type=float, default=0.5)
+    parser.add_argument("--tool-io-ms", type=float, default=10.0)
+    parser.add_argument("--output-chars", type=int, default=200)
+    parser.add_argument("--async-tools", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    agent = LoadAgent()
+    agent.setup(
+        {
+            "script": [int(n) for n in args.script.split(",") if n],
+            "latency": Latency.parse(args.latency),
+            "tools": args.tools,
+            "tool_cpu_ms": args.tool_cpu_ms,
+            "tool_io_ms": args.tool_io_ms,
+            "output_chars": args.output_chars,
+            "async_tools": args.async_tools,
+        }
+    )
+    report = run_load(agent, args.sessions, args.concurrency, args.mode)
+    print(json.dumps(report) if args.json else format_report(report))
+
+
+# USAGE: python -m examples.load_test.load_test --sessions 500 --concurrency 50
+# compare execution modes with --mode threads|async and --async-tools
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import asyncio
+import random
+import time
+from typing import List, Optional, Sequence
+
+from src.parrot import ModelRunner, tool
+from src.parrot.model_gateway.model_gateway import AbstractModelGateway, LiteLLMGateway
+from src.parrot.types.model_inference_params import ModelInferenceParams
+
+DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+class Latency:
+    """
+    Model latency distribution, in seconds.
+
+        fixed:MEAN              always MEAN
+        uniform:MEAN:SPREAD     MEAN +/- SPREAD
+        exponential:MEAN        memoryless, with mean MEAN
+        lognormal:MEDIAN:SIGMA  long-tailed, like real completions
+    """
+
+    def __init__(self, distribution: str = "fixed", mean: float = 0.0, shape=0.0):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.mean = mean
+        self.shape = shape
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        distribution, *args = spec.split(":")
+        return cls(distribution, *(float(arg) for arg in args))
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            return max(rng.uniform(self.mean - self.shape, self.mean + self.shape), 0)
+        if self.distribution == "exponential":
+            return rng.expovariate(1 / self.mean) if self.mean else 0.0
+        if self.distribution == "lognormal":
+            return rng.lognormvariate(0, self.shape) * self.mean
+        return self.mean
+
+    def __repr__(self):
+        return f"Latency({self.distribution!r}, {self.mean}, {self.shape})"
+
+
+class ScriptedGateway(AbstractModelGateway):
+    """
+    Local stand-in for a model. After a sampled delay it answers turn `i` with
+    `script[i]` tool calls (spread round robin over `tool_names`), and once the
+    script is exhausted with a final message.
+    """
+
+    def __init__(
+        self,
+        script: Sequence[int],
+        tool_names: Sequence[str],
+        latency: Latency,
+        seed: Optional[int] = None,
+    ):
+        self.script = list(script)
+        self.tool_names = list(tool_names)
+        self.latency = latency
+        self.rng = random.Random(seed)
+
+    def respond(self, params: ModelInferenceParams):
+        turn = sum(1 for m in params.messages if m.get("role") == "assistant")
+        if turn < len(self.script):
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": f"call_{turn}_{i}",
+                        "type": "function",
+                        "function": {
+                            "name": self.tool_names[i % len(self.tool_names)],
+                            "arguments": f'{{"n": {i}}}',
+                        },
+                    }
+                    for i in range(self.script[turn])
+                ],
+            }
+        else:
+            message = {"role": "assistant", "content": "done"}
+
+        return LiteLLMGateway.backend().ModelResponse(
+            choices=[{"message": message}],
+            usage={"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        )
+
+    def inference(self, params: ModelInferenceParams):
+        time.sleep(self.latency.sample(self.rng))
+        return self.respond(params)
+
+    async def ainference(self, params: ModelInferenceParams):
+        await asyncio.sleep(self.latency.sample(self.rng))
+        return self.respond(params)
+
+
+class StandInModelRunner(ModelRunner):
+    """
+    ModelRunner that sends every request to one gateway and records when each
+    turn started, so turn latency covers the model call and the tool calls.
+    """
+
+    def __init__(self, gateway: AbstractModelGateway):
+        self.gateway = gateway
+        self.turn_starts: List[float] = []
+
+    def _prepare(self, *args, **kwargs):
+        self.turn_starts.append(time.perf_counter())
+        params, _ = super()._prepare(*args, **kwargs)
+        return params, self.gateway
+
+    def turn_latencies(self, finished: float) -> List[float]:
+        ends = self.turn_starts[1:] + [finished]
+        return [end - start for start, end in zip(self.turn_starts, ends)]
+
+
+def spin(seconds: float) -> None:
+    # busy work holding the GIL, like parsing or formatting a large result
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def make_stub_tool(
+    name: str,
+    cpu_ms: float = 0.0,
+    io_ms: float = 0.0,
+    output_chars: int = 200,
+    is_async: bool = False,
+):
+    """
+    Tool that burns `cpu_ms` of CPU, waits `io_ms` and returns `output_chars`
+    characters.
+    """
+    payload = "x" * output_chars
+
+    if is_async:
+
+        async def stub(n: int, state: dict):
+            spin(cpu_ms / 1000)
+            await asyncio.sleep(io_ms / 1000)
+            return payload
+    else:
+
+        def stub(n: int, state: dict):
+            spin(cpu_ms / 1000)
+            time.sleep(io_ms / 1000)
+            return payload
+
+    stub.__name__ = stub.__qualname__ = name
+    stub.__doc__ = f"Stub tool costing {cpu_ms}ms CPU and {io_ms}ms IO"
+    return tool(stub)
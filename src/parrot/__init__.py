@@ -1,6 +1,46 @@
+import importlib
+from typing import TYPE_CHECKING
+
 from src.parrot.tool_decorator import tool
 from src.parrot.tasker_decorator import tasker
-from src.parrot.tool_runner import ToolRunner
-from src.parrot.model_runner import ModelRunner
 
-__all__ = ["tool", "tasker", "ToolRunner", "ModelRunner"]
+if TYPE_CHECKING:
+    from src.parrot.tool_runner import ToolRunner
+    from src.parrot.model_runner import ModelRunner
+    from src.parrot.tool_manifest import save_tool_manifest, load_tool_manifest
+    from src.parrot.planner import Planner
+    from src.parrot.workflow import Workflow
+
+# loaded on first access, so defining tools and taskers does not import the
+# model backend (litellm, httpx)
+_LAZY = {
+    "ToolRunner": "tool_runner",
+    "ModelRunner": "model_runner",
+    "save_tool_manifest": "tool_manifest",
+    "load_tool_manifest": "tool_manifest",
+    "Planner": "planner",
+    "Workflow": "workflow",
+}
+
+__all__ = [
+    "tool",
+    "tasker",
+    "ToolRunner",
+    "ModelRunner",
+    "save_tool_manifest",
+    "load_tool_manifest",
+    "Planner",
+    "Workflow",
+]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_LAZY[name]}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
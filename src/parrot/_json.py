@@ -0,0 +1,61 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON with orjson when it is installed, falling back to the stdlib.
+    Both raise a ValueError subclass on malformed input.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize to compact JSON, falling back to str() for unknown types.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str).decode()
+        except TypeError:
+            # orjson rejects non-str dict keys and integers wider than 64 bits
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def dumps_canonical(obj: Any) -> bytes:
+    """
+    Serialize with sorted keys for hashing. Unknown types go through `default`;
+    raises TypeError for objects with no content-based form.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, default=_canonical_default, option=orjson.OPT_SORT_KEYS
+            )
+        except TypeError:
+            pass
+    return json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), default=_canonical_default
+    ).encode()
+
+
+def _canonical_default(obj: Any) -> Any:
+    # objects that know their own content hash avoid being serialized in full
+    if hasattr(obj, "content_hash"):
+        return obj.content_hash()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    # a repr would usually embed the object's address, which is not content
+    raise TypeError(
+        f"Cannot hash a {type(obj).__name__}; give it a content_hash() method"
+    )
@@ -1,4 +1,7 @@
-from typing import List, Callable, Dict, Union
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, List, Callable, Dict, Optional, Union
 
 
 def validate_tools(tools: List[Callable]) -> Dict[str, Union[bool, List[str]]]:
@@ -27,3 +30,60 @@ def validate_tools(tools: List[Callable]) -> Dict[str, Union[bool, List[str]]]:
     invalid_tools = [tool.__name__ for tool in tools if not is_valid_tool(tool)]
 
     return {"valid": len(invalid_tools) == 0, "invalid_tools": invalid_tools}
+
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return a process-wide event loop running in a daemon thread. Synchronous
+    callers use it to run coroutine tools, so loop-bound resources such as
+    pooled async HTTP clients stay valid across runs.
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="parrot-event-loop", daemon=True
+            )
+            thread.start()
+            _background_loop = loop
+    return _background_loop
+
+
+def submit_coroutine(coro: Coroutine) -> concurrent.futures.Future:
+    """
+    Schedule a coroutine on the background event loop.
+
+    Args:
+        coro: Coroutine to schedule.
+
+    Returns:
+        A future that resolves to the coroutine's result.
+    """
+    loop = get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("Cannot block on the background loop from within it")
+
+    return asyncio.run_coroutine_threadsafe(coro, loop)
+
+
+def run_coroutine_sync(coro: Coroutine) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Args:
+        coro: Coroutine to run on the background event loop.
+
+    Returns:
+        The coroutine's result.
+    """
+    return submit_coroutine(coro).result()
@@ -0,0 +1,216 @@
+import mmap
+import os
+import struct
+import time
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+# role, tool, timestamp, latency, tokens, payload_ref
+_RECORD = struct.Struct("<HHddqq")
+_NO_TOOL = 0
+
+
+class MemoryRecord(NamedTuple):
+    index: int
+    role: str
+    tool: Optional[str]
+    timestamp: float
+    latency: float
+    tokens: int
+    payload_ref: int
+
+
+class MemoryStore:
+    """
+    Columnar history store for taskers. Each field is an array-backed column, so
+    appends are amortized O(1) and scans compare raw values without building a
+    row object per entry. Roles and tool names are stored as small integer codes.
+
+    With `spill_path` set, rows beyond `max_rows_in_memory` are flushed to a file
+    of fixed-width records that is memory-mapped for scans, keeping RAM bounded.
+    Payloads are not stored; `payload_ref` points at wherever the caller keeps
+    them (for example an index into the conversation context).
+    """
+
+    def __init__(
+        self, spill_path: Optional[str] = None, max_rows_in_memory: int = 100_000
+    ):
+        self.spill_path = spill_path
+        self.max_rows_in_memory = max_rows_in_memory
+
+        self._codes: Dict[Optional[str], int] = {None: _NO_TOOL}
+        self._names: List[Optional[str]] = [None]
+
+        self._role = array("H")
+        self._tool = array("H")
+        self._timestamp = array("d")
+        self._latency = array("d")
+        self._tokens = array("q")
+        self._payload_ref = array("q")
+
+        self._spilled = 0
+        self._spill_file = None
+        self._spill_map: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._role)
+
+    def _code(self, name: Optional[str]) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self._names)
+            self._codes[name] = code
+            self._names.append(name)
+        return code
+
+    def append(
+        self,
+        role: str,
+        tool: Optional[str] = None,
+        latency: float = 0.0,
+        tokens: int = 0,
+        payload_ref: int = -1,
+        timestamp: Optional[float] = None,
+    ) -> int:
+        """
+        Append one history entry.
+
+        :return: Index of the new entry
+        """
+        self._role.append(self._code(role))
+        self._tool.append(self._code(tool))
+        self._timestamp.append(time.time() if timestamp is None else timestamp)
+        self._latency.append(latency)
+        self._tokens.append(tokens)
+        self._payload_ref.append(payload_ref)
+
+        if self.spill_path and len(self._role) >= self.max_rows_in_memory:
+            self.spill()
+
+        return len(self) - 1
+
+    def spill(self) -> None:
+        """
+        Flush in-memory rows to the spill file.
+        """
+        if not self.spill_path or not self._role:
+            return
+
+        opened = None
+        if self._spill_file is None:
+            mode = "r+b" if self._spilled else "w+b"
+            # stays open for later spills until close()
+            opened = self._spill_file = open(self.spill_path, mode)  # noqa: SIM115
+
+        start = None
+        try:
+            start = self._spill_file.seek(0, os.SEEK_END)
+            self._spill_file.write(
+                b"".join(
+                    _RECORD.pack(*row)
+                    for row in zip(
+                        self._role,
+                        self._tool,
+                        self._timestamp,
+                        self._latency,
+                        self._tokens,
+                        self._payload_ref,
+                    )
+                )
+            )
+            self._spill_file.flush()
+            # the previous map is left to the garbage collector since a running
+            # scan may still hold a buffer on it
+            spill_map = mmap.mmap(self._spill_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            # the rows stay in memory, so drop any partial copy of them on disk
+            if start is not None:
+                self._spill_file.truncate(start)
+            if opened is not None:
+                opened.close()
+                self._spill_file = None
+            raise
+
+        self._spill_map = spill_map
+        self._spilled += len(self._role)
+        for column in self._columns():
+            del column[:]
+
+    def _columns(self):
+        return (
+            self._role,
+            self._tool,
+            self._timestamp,
+            self._latency,
+            self._tokens,
+            self._payload_ref,
+        )
+
+    def _record(self, index: int, row) -> MemoryRecord:
+        role, tool, timestamp, latency, tokens, payload_ref = row
+        return MemoryRecord(
+            index,
+            self._names[role],
+            self._names[tool],
+            timestamp,
+            latency,
+            tokens,
+            payload_ref,
+        )
+
+    def __getitem__(self, index: int) -> MemoryRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("memory index out of range")
+
+        if index < self._spilled:
+            row = _RECORD.unpack_from(self._spill_map, index * _RECORD.size)
+        else:
+            i = index - self._spilled
+            row = tuple(column[i] for column in self._columns())
+        return self._record(index, row)
+
+    def _rows(self) -> Iterator:
+        if self._spill_map is not None:
+            yield from _RECORD.iter_unpack(self._spill_map)
+        yield from zip(*self._columns())
+
+    def scan(
+        self,
+        role: Optional[str] = None,
+        tool: Optional[str] = None,
+        since: Optional[float] = None,
+        min_latency: Optional[float] = None,
+    ) -> Iterator[MemoryRecord]:
+        """
+        Iterate over entries matching all given filters, oldest first.
+        """
+        role_code = self._codes.get(role, -1) if role is not None else None
+        tool_code = self._codes.get(tool, -1) if tool is not None else None
+        if role_code == -1 or tool_code == -1:
+            return
+
+        for index, row in enumerate(self._rows()):
+            if role_code is not None and row[0] != role_code:
+                continue
+            if tool_code is not None and row[1] != tool_code:
+                continue
+            if since is not None and row[2] < since:
+                continue
+            if min_latency is not None and row[3] < min_latency:
+                continue
+            yield self._record(index, row)
+
+    def total_tokens(self, role: Optional[str] = None) -> int:
+        if role is None:
+            return sum(row[4] for row in self._rows())
+        return sum(record.tokens for record in self.scan(role=role))
+
+    def close(self) -> None:
+        if self._spill_map is not None:
+            self._spill_map.close()
+            self._spill_map = None
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
@@ -0,0 +1,96 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from . import _json
+
+
+def to_message_dict(message: Any) -> Dict[str, Any]:
+    """
+    Plain dict for a chat message. Model objects (such as a response message) are
+    dumped once, so nested tool calls are not re-converted on every request.
+    """
+    if hasattr(message, "model_dump"):
+        dumped = message.model_dump(exclude_none=True)
+        dumped.setdefault("content", None)
+        return dumped
+    return message
+
+
+class MessageLog(list):
+    """
+    Append-only conversation context. Each message is stored as a plain dict and
+    serialized once, when it is appended, so a request body is assembled by joining
+    cached JSON fragments instead of re-encoding the whole history every turn.
+
+    Messages must not be changed in place once appended. List operations other
+    than append and extend drop the cached fragments; they are rebuilt on the
+    next call to `json`.
+    """
+
+    def __init__(self, messages: Iterable[Any] = ()):
+        super().__init__()
+        self._fragments: Optional[List[str]] = []
+        self._json: Optional[str] = None
+        self.extend(messages)
+
+    def append(self, message: Any) -> None:
+        message = to_message_dict(message)
+        super().append(message)
+        if self._fragments is not None:
+            self._fragments.append(_json.dumps(message))
+        self._json = None
+
+    def extend(self, messages: Iterable[Any]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def __iadd__(self, messages: Iterable[Any]) -> "MessageLog":
+        self.extend(messages)
+        return self
+
+    def json(self) -> str:
+        """
+        The messages as a JSON array.
+        """
+        if self._json is None:
+            if self._fragments is None:
+                self._fragments = [_json.dumps(message) for message in self]
+            self._json = "[" + ",".join(self._fragments) + "]"
+        return self._json
+
+    def __reduce_ex__(self, protocol):
+        return MessageLog, (list(self),)
+
+
+def _invalidating(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._fragments = None
+        self._json = None
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__imul__",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(MessageLog, _name, _invalidating(_name))
+
+
+def messages_json(messages: List[Any]) -> str:
+    """
+    JSON array of messages, reusing the cached fragments of a MessageLog.
+    """
+    if isinstance(messages, MessageLog):
+        return messages.json()
+    return _json.dumps([to_message_dict(message) for message in messages])
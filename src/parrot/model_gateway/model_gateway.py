@@ -1,27 +1,128 @@
+import asyncio
+import importlib
 import os
+import weakref
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Union
-
-import litellm
-from litellm import CustomStreamWrapper
-from litellm.types.utils import ModelResponse
+from typing import TYPE_CHECKING, Any, Optional, Dict, Union
 
+from .. import _json
+from ..message_log import messages_json
 from ..types.model_inference_params import ModelInferenceParams
 
+if TYPE_CHECKING:
+    from litellm import CustomStreamWrapper
+    from litellm.types.utils import ModelResponse
+
 
 class AbstractModelGateway(ABC):
     @abstractmethod
     def inference(
         self, params: ModelInferenceParams
-    ) -> Union[ModelResponse, CustomStreamWrapper]:
+    ) -> Union["ModelResponse", "CustomStreamWrapper"]:
         pass
 
+    async def ainference(
+        self, params: ModelInferenceParams
+    ) -> Union["ModelResponse", "CustomStreamWrapper"]:
+        # gateways without a native async client fall back to a worker thread
+        return await asyncio.to_thread(self.inference, params)
+
 
 class LiteLLMGateway(AbstractModelGateway):
+    @staticmethod
+    def backend():
+        # importing litellm takes seconds, so wait for the first inference
+        return importlib.import_module("litellm")
+
     def inference(
         self, params: ModelInferenceParams
-    ) -> Union[ModelResponse, CustomStreamWrapper]:
-        return litellm.completion(**params.model_dump())
+    ) -> Union["ModelResponse", "CustomStreamWrapper"]:
+        # the message list is passed through as is rather than copied every turn
+        return self.backend().completion(
+            **params.model_dump(exclude={"messages"}), messages=params.messages
+        )
+
+    async def ainference(
+        self, params: ModelInferenceParams
+    ) -> Union["ModelResponse", "CustomStreamWrapper"]:
+        return await self.backend().acompletion(
+            **params.model_dump(exclude={"messages"}), messages=params.messages
+        )
+
+
+class OpenAIGateway(AbstractModelGateway):
+    """
+    Posts chat completions straight to an OpenAI-compatible endpoint. The request
+    body reuses the cached message fragments of a MessageLog, so each turn only
+    encodes the parameters and the messages appended since the last one.
+    Streaming is not supported.
+    """
+
+    DEFAULT_BASE_URL = "https://api.openai.com/v1"
+    DEFAULT_TIMEOUT = 600.0
+    # parameters that configure the connection rather than the request
+    CLIENT_FIELDS = {
+        "messages",
+        "timeout",
+        "base_url",
+        "api_version",
+        "api_key",
+        "model_list",
+        "deployment_id",
+        "extra_headers",
+    }
+
+    _client = None
+    # async clients are bound to the event loop they were created on
+    _async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def request_body(cls, params: ModelInferenceParams) -> bytes:
+        fields = _json.dumps(
+            params.model_dump(exclude=cls.CLIENT_FIELDS, exclude_none=True)
+        )
+        messages = messages_json(params.messages)
+        return f'{fields[:-1]},"messages":{messages}}}'.encode()
+
+    def _request(self, params: ModelInferenceParams) -> Dict[str, Any]:
+        if params.stream:
+            raise ValueError("OpenAIGateway does not support streaming")
+
+        base_url = (
+            params.base_url
+            or os.environ.get("OPENAI_BASE_URL")
+            or self.DEFAULT_BASE_URL
+        )
+        api_key = params.api_key or os.environ.get("OPENAI_API_KEY", "")
+        return dict(
+            url=base_url.rstrip("/") + "/chat/completions",
+            content=self.request_body(params),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key}",
+                **(params.extra_headers or {}),
+            },
+            timeout=float(params.timeout or self.DEFAULT_TIMEOUT),
+        )
+
+    @staticmethod
+    def _response(response) -> "ModelResponse":
+        response.raise_for_status()
+        return LiteLLMGateway.backend().ModelResponse(**response.json())
+
+    def inference(self, params: ModelInferenceParams) -> "ModelResponse":
+        cls = type(self)
+        if cls._client is None:
+            cls._client = importlib.import_module("httpx").Client()
+        return self._response(cls._client.post(**self._request(params)))
+
+    async def ainference(self, params: ModelInferenceParams) -> "ModelResponse":
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = importlib.import_module("httpx").AsyncClient()
+            self._async_clients[loop] = client
+        return self._response(await client.post(**self._request(params)))
 
 
 class ModelGatewayFactory:
@@ -35,5 +136,7 @@ class ModelGatewayFactory:
 
         if provider == "litellm":
             return LiteLLMGateway()
+        elif provider == "openai":
+            return OpenAIGateway()
         else:
             raise ValueError(f"Unsupported provider: {provider}")
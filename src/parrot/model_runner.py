@@ -1,19 +1,31 @@
-from typing import List, Optional, Union, Type, Literal, Dict, overload
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Optional,
+    Union,
+    Type,
+    Literal,
+    Dict,
+    Tuple,
+    overload,
+)
 
-import httpx
-from litellm import CustomStreamWrapper
-from litellm.types.utils import ModelResponse
 from pydantic import BaseModel, Field
 
-from .model_gateway.model_gateway import ModelGatewayFactory
+from .model_gateway.model_gateway import AbstractModelGateway, ModelGatewayFactory
 from .types.model_inference_params import ModelInferenceParams
 
+if TYPE_CHECKING:
+    import httpx
+    from litellm import CustomStreamWrapper
+    from litellm.types.utils import ModelResponse
+
 
 class ModelRunner:
     @overload
     def inference(
         self, params: ModelInferenceParams
-    ) -> Union[ModelResponse, CustomStreamWrapper]: ...
+    ) -> Union["ModelResponse", "CustomStreamWrapper"]: ...
 
     @overload
     def inference(
@@ -21,7 +33,7 @@ class ModelRunner:
         model: str,
         # Optional OpenAI params: see https://platform.openai.com/docs/api-reference/chat/create
         messages: List = [],
-        timeout: Optional[Union[float, str, httpx.Timeout]] = None,
+        timeout: Optional[Union[float, str, "httpx.Timeout"]] = None,
         temperature: Optional[float] = None,
         top_p: Optional[float] = None,
         n: Optional[int] = None,
@@ -50,11 +62,28 @@ class ModelRunner:
         api_key: Optional[str] = None,
         model_list: Optional[list] = None,  # pass in a list of api_base,keys, etc.
         # parrot specific
-        provider: Literal["litellm"] = "litellm",  # model gateway demux
+        provider: Literal["litellm", "openai"] = "litellm",  # model gateway demux
         env_vars: Optional[Dict[str, str]] = None,  # added
-    ) -> Union[ModelResponse, CustomStreamWrapper]: ...
+    ) -> Union["ModelResponse", "CustomStreamWrapper"]: ...
+
+    def inference(
+        self, *args, **kwargs
+    ) -> Union["ModelResponse", "CustomStreamWrapper"]:
+        input_params, gateway = self._prepare(*args, **kwargs)
+        return gateway.inference(input_params)
+
+    async def ainference(
+        self, *args, **kwargs
+    ) -> Union["ModelResponse", "CustomStreamWrapper"]:
+        """
+        Async variant of inference, accepting the same arguments.
+        """
+        input_params, gateway = self._prepare(*args, **kwargs)
+        return await gateway.ainference(input_params)
 
-    def inference(self, *args, **kwargs) -> Union[ModelResponse, CustomStreamWrapper]:
+    def _prepare(
+        self, *args, **kwargs
+    ) -> Tuple[ModelInferenceParams, AbstractModelGateway]:
         if len(args) == 1 and isinstance(args[0], ModelInferenceParams):
             input_params = args[0]
             provider = kwargs.get("provider", "litellm")
@@ -94,4 +123,4 @@ class ModelRunner:
             env_vars = kwargs.get("env_vars")
 
         gateway = ModelGatewayFactory.create_gateway(provider, env_vars=env_vars)
-        return gateway.inference(input_params)
+        return input_params, gateway
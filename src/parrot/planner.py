@@ -0,0 +1,108 @@
+import json
+from typing import Callable, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from .model_runner import ModelRunner
+from .tool_arguments import parse_tool_arguments
+from .types.plan import Plan, StepResult
+
+PLAN_PROMPT = """You are planning how to complete a task with the tools below. Break the task into steps. Each step calls exactly one tool (or sub-tasker) with JSON arguments. Steps that do not depend on each other will run in parallel, so only list a dependency when a step needs another step's output. To pass a previous step's output as an argument value, use the string "$steps.<step id>".
+
+Respond with a JSON object of the form:
+{{"steps": [{{"id": "s1", "tool": "<tool name>", "arguments": {{}}, "depends_on": [], "description": "<why>"}}]}}
+
+Tools:
+{tools}
+
+Task:
+{query}
+"""
+
+REPLAN_PROMPT = """Step "{step_id}" of the plan below failed with: {error}
+
+Plan:
+{plan}
+
+Completed steps and their outputs:
+{completed}
+
+Return replacement steps for the failed step and every step that depended on it, using the same JSON format as the plan. Do not repeat completed steps; you may depend on them by id.
+
+Tools:
+{tools}
+
+Task:
+{query}
+"""
+
+
+class Planner:
+    """
+    Uses a model to turn a query into a Plan of tool calls, and to re-plan the
+    failed part of a plan.
+    """
+
+    def __init__(self, model: str, **inference_kwargs):
+        self.model_runner = ModelRunner()
+        self.model = model
+        self.inference_kwargs = inference_kwargs
+
+    def plan(
+        self,
+        query: str,
+        tools: List[Callable],
+        taskers: Optional[Dict[str, Callable]] = None,
+    ) -> Plan:
+        prompt = PLAN_PROMPT.format(tools=describe_tools(tools, taskers), query=query)
+        return self._complete(prompt)
+
+    def replan(
+        self,
+        query: Optional[str],
+        tools: List[Callable],
+        plan: Plan,
+        failed: StepResult,
+        completed: Dict[str, StepResult],
+        taskers: Optional[Dict[str, Callable]] = None,
+    ) -> Plan:
+        prompt = REPLAN_PROMPT.format(
+            step_id=failed.step_id,
+            error=failed.error,
+            plan=plan.model_dump_json(),
+            completed=json.dumps(
+                {
+                    sid: str(result.output)
+                    for sid, result in completed.items()
+                    if result.status == "succeeded"
+                }
+            ),
+            tools=describe_tools(tools, taskers),
+            query=query or "",
+        )
+        return self._complete(prompt)
+
+    def _complete(self, prompt: str) -> Plan:
+        response = self.model_runner.inference(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            response_format={"type": "json_object"},
+            **self.inference_kwargs,
+        )
+        content = response.choices[-1].message.content
+        if not content or not content.strip():
+            raise ValueError("Model returned an empty plan")
+        try:
+            return Plan.model_validate(parse_tool_arguments(content))
+        except (ValueError, ValidationError) as e:
+            raise ValueError(f"Model returned an invalid plan: {e}") from None
+
+
+def describe_tools(
+    tools: List[Callable], taskers: Optional[Dict[str, Callable]] = None
+) -> str:
+    lines = [json.dumps(tool.tool_schema["function"]) for tool in tools]
+    for name, runner in (taskers or {}).items():
+        description = (runner.__doc__ or "").strip() or f"Runs the {name} tasker"
+        lines.append(json.dumps({"name": name, "description": description}))
+    return "\n".join(lines)
@@ -0,0 +1,271 @@
+import argparse
+import asyncio
+import importlib
+import inspect
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from . import _json
+
+_DONE = object()
+DEFAULT_MAX_BODY_BYTES = 1 << 20
+
+
+class RequestTooLarge(ValueError):
+    """
+    Raised when a request declares a body larger than the server accepts.
+    """
+
+
+def to_event(item: Any) -> Any:
+    """
+    Convert a streamed item (text, tool call, tool response) to a JSON-ready value.
+    """
+    if isinstance(item, str):
+        return {"type": "message", "content": item}
+    if hasattr(item, "model_dump"):
+        return {"type": "tool_call", **item.model_dump()}
+    return item
+
+
+class TaskerServer:
+    """
+    Long-running asyncio HTTP/JSON server for a tasker class. Instances are built
+    and set up ahead of time by `factory` and kept in a pool; each request borrows
+    one, calls `method` with the JSON body as keyword arguments and streams the
+    result back as newline-delimited JSON. Requests beyond `max_pending` (running
+    plus waiting for an instance) are rejected with 503, and bodies larger than
+    `max_body_bytes` with 413.
+
+    Endpoints:
+        POST /run     run the tasker method
+        GET  /health  pool status
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        method: str = "run",
+        pool_size: int = 4,
+        max_pending: int = 16,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    ):
+        self.factory = factory
+        self.method = method
+        self.pool_size = pool_size
+        self.max_pending = max_pending
+        self.max_body_bytes = max_body_bytes
+        self.host = host
+        self.port = port
+
+        self.pool: Optional[asyncio.Queue] = None
+        self.pending = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> asyncio.AbstractServer:
+        self.pool = asyncio.Queue()
+        instances = await asyncio.gather(
+            *(asyncio.to_thread(self.factory) for _ in range(self.pool_size))
+        )
+        for instance in instances:
+            self.pool.put_nowait(instance)
+
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self) -> None:
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def run(self) -> None:
+        asyncio.run(self.serve_forever())
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            method, path, body = await read_request(reader, self.max_body_bytes)
+            if method == "GET" and path == "/health":
+                await self.respond(writer, HTTPStatus.OK, self.health())
+            elif method == "POST" and path == "/run":
+                await self.handle_run(writer, body)
+            else:
+                await self.respond(
+                    writer, HTTPStatus.NOT_FOUND, {"error": f"{method} {path}"}
+                )
+        except RequestTooLarge as e:
+            await self.respond(
+                writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": str(e)}
+            )
+        except (ValueError, TypeError, asyncio.IncompleteReadError) as e:
+            await self.respond(writer, HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def health(self) -> Dict[str, int]:
+        return {
+            "pool_size": self.pool_size,
+            "available": self.pool.qsize(),
+            "pending": self.pending,
+        }
+
+    async def handle_run(self, writer: asyncio.StreamWriter, body: bytes) -> None:
+        kwargs = _json.loads(body) if body else {}
+        if not isinstance(kwargs, dict):
+            raise TypeError("Request body must be a JSON object")
+
+        if self.pending >= self.max_pending:
+            await self.respond(
+                writer,
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "Server is saturated, retry later"},
+                headers={"Retry-After": "1"},
+            )
+            return
+
+        self.pending += 1
+        try:
+            instance = await self.pool.get()
+            try:
+                await self.stream(writer, getattr(instance, self.method), kwargs)
+            finally:
+                self.pool.put_nowait(instance)
+        finally:
+            self.pending -= 1
+
+    async def stream(
+        self, writer: asyncio.StreamWriter, target: Callable, kwargs: Dict[str, Any]
+    ) -> None:
+        write_head(writer, HTTPStatus.OK, {"Transfer-Encoding": "chunked"})
+        try:
+            result = await asyncio.to_thread(target, **kwargs)
+            if inspect.isasyncgen(result):
+                async for item in result:
+                    await write_chunk(writer, to_event(item))
+            elif inspect.isgenerator(result):
+                while True:
+                    item = await asyncio.to_thread(next, result, _DONE)
+                    if item is _DONE:
+                        break
+                    await write_chunk(writer, to_event(item))
+            else:
+                if inspect.isawaitable(result):
+                    result = await result
+                await write_chunk(writer, {"type": "result", "content": result})
+        except ConnectionError:
+            raise
+        except Exception as e:
+            await write_chunk(writer, {"type": "error", "error": str(e)})
+
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: Any,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        body = _json.dumps(payload).encode()
+        write_head(
+            writer,
+            status,
+            {
+                "Content-Length": str(len(body)),
+                **(headers or {}),
+            },
+        )
+        writer.write(body)
+        await writer.drain()
+
+
+async def read_request(
+    reader: asyncio.StreamReader, max_body_bytes: int = DEFAULT_MAX_BODY_BYTES
+) -> Tuple[str, str, bytes]:
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    if not request_line:
+        raise ValueError("Empty request")
+    method, path, _ = request_line.split(" ", 2)
+
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    if length > max_body_bytes:
+        # rejected before the body is read, so it never sits in memory
+        raise RequestTooLarge(f"Request body exceeds {max_body_bytes} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path.split("?", 1)[0], body
+
+
+def write_head(
+    writer: asyncio.StreamWriter, status: HTTPStatus, headers: Dict[str, str]
+) -> None:
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    headers = {
+        "Content-Type": "application/x-ndjson",
+        "Connection": "close",
+        **headers,
+    }
+    lines.extend(f"{k}: {v}" for k, v in headers.items())
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+
+async def write_chunk(writer: asyncio.StreamWriter, event: Any) -> None:
+    data = (_json.dumps(event) + "\n").encode()
+    writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+    # waits while the client is slow, so a stalled reader pauses its tasker
+    await writer.drain()
+
+
+def load_factory(target: str) -> Callable[[], Any]:
+    module_name, _, attr = target.partition(":")
+    if not attr:
+        raise ValueError("Factory must be given as 'package.module:factory'")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a tasker over HTTP")
+    parser.add_argument(
+        "factory", help="'package.module:factory' returning a set up tasker"
+    )
+    parser.add_argument("--method", default="run")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=16)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-body-bytes", type=int, default=DEFAULT_MAX_BODY_BYTES)
+    args = parser.parse_args(argv)
+
+    TaskerServer(
+        load_factory(args.factory),
+        method=args.method,
+        pool_size=args.pool_size,
+        max_pending=args.max_pending,
+        host=args.host,
+        port=args.port,
+        max_body_bytes=args.max_body_bytes,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
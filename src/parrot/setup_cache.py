@@ -0,0 +1,140 @@
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import time
+import warnings
+from importlib import metadata
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from . import _json
+
+CACHE_FORMAT = 1
+# entries beyond these limits are evicted, least recently used first
+DEFAULT_MAX_BYTES = 1 << 30
+DEFAULT_MAX_AGE = 30 * 24 * 3600  # seconds
+
+
+def default_cache_dir() -> str:
+    return os.environ.get("PARROT_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "parrot", "setup"
+    )
+
+
+def _package_version() -> str:
+    try:
+        return metadata.version("parrot_arch")
+    except metadata.PackageNotFoundError:
+        return "0"
+
+
+def _source(obj: Any) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return repr(obj)
+
+
+class SetupCache:
+    """
+    On-disk cache of @tasker.setup results keyed by a content hash of the setup
+    arguments and of the code that produced them. Entries are pickled, so the
+    cache directory must only be writable by trusted users.
+
+    After each store, entries unused for `max_age` seconds are removed, then the
+    least recently used ones until the directory holds at most `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        method: Callable,
+        cache_dir: Optional[str] = None,
+        version: Optional[str] = None,
+        depends: Optional[Iterable[Any]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        self.method = method
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.signature = inspect.signature(method)
+
+        code = hashlib.sha256()
+        code.update(f"{CACHE_FORMAT}:{_package_version()}:{version}".encode())
+        code.update(f"{method.__module__}:{method.__qualname__}".encode())
+        for obj in [method, *(depends or [])]:
+            code.update(_source(obj).encode())
+        self.code_hash = code.hexdigest()
+
+    def key(self, instance, *args, **kwargs) -> Optional[str]:
+        """
+        Cache key for a call, or None when an argument has no content-based form
+        (no content_hash, model_dump or JSON representation) and the call should
+        not be cached.
+        """
+        bound = self.signature.bind(instance, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(list(bound.arguments.items())[1:])  # drop self
+
+        try:
+            encoded = _json.dumps_canonical(arguments)
+        except TypeError as e:
+            warnings.warn(f"Not caching {self.method.__qualname__}: {e}", stacklevel=3)
+            return None
+
+        digest = hashlib.sha256(self.code_hash.encode())
+        digest.update(encoded)
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{self.method.__name__}-{key}.pkl")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self.path(key)
+        try:
+            with open(path, "rb") as file:
+                state = pickle.load(file)
+            os.utime(path)  # recently used, kept longest by prune
+            return state
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # unreadable or written by incompatible code, rebuild it
+            return None
+
+    def store(self, key: str, state: Dict[str, Any]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.prune()
+
+    def prune(self) -> None:
+        now = time.time()
+        entries = []
+        with os.scandir(self.cache_dir) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".pkl"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort(reverse=True)  # most recently used first
+        total = 0
+        for mtime, size, path in entries:
+            total += size
+            if now - mtime > self.max_age or total > self.max_bytes:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass  # removed by another process
@@ -1,16 +1,22 @@
-import contextvars
 from functools import wraps
-from typing import Any, Dict, Callable
+from typing import Any, Dict, Iterable, Optional
+
+from .memory_store import MemoryStore
+from .setup_cache import SetupCache
+from .tasker_state import ContextSlot, PerInstance, TaskerState
 
 StateType = Dict[str, Any]
 
 
-class Tasker:
-    def __init__(self):
-        self._context = contextvars.ContextVar("_context", default=[])
-        self._history = contextvars.ContextVar("_history", default=[])
-        self._state = contextvars.ContextVar("_state", default={})
+def _context_var(name: str) -> PerInstance:
+    # immutable default so contexts never share a mutable list
+    return PerInstance(
+        name,
+        lambda instance: ContextSlot(f"{type(instance).__name__}.{name}", default=()),
+    )
 
+
+class Tasker:
     def __call__(self, cls=None, **kwargs):
         if cls is not None and isinstance(cls, type):
             # Decorator used without arguments
@@ -25,29 +31,72 @@ class Tasker:
             return wrapper
 
     def _init_tasker_class(self, cls, **kwargs):
-        cls._context = self._context
-        cls._history = self._history
-        cls._state = self._state
+        # each instance gets its own state, history and context
+        cls._context = _context_var("_context")
+        cls._history = _context_var("_history")
+        cls._state = PerInstance("_state", lambda instance: TaskerState())
 
-        memory = kwargs.get('memory', False)  # Default to False if not provided
+        memory = kwargs.get("memory", False)  # Default to False if not provided
         if memory:
-            cls.memory = pd.DataFrame()  # Initialize with an empty DataFrame
+            # True for defaults, or a dict of MemoryStore options
+            options = memory if isinstance(memory, dict) else {}
+            cls.memory = PerInstance("memory", lambda instance: MemoryStore(**options))
         else:
             cls.memory = None  # Set to None if memory is False
 
-    def setup(self, method):
+    def setup(
+        self,
+        method=None,
+        *,
+        cache: bool = False,
+        cache_dir: Optional[str] = None,
+        cache_version: Optional[str] = None,
+        cache_depends: Optional[Iterable[Any]] = None,
+    ):
+        """
+        Mark a method as tasker setup; the returned dict is merged into the state.
+
+        With cache=True the returned state is persisted and reloaded on later
+        starts. The cache key covers the setup arguments, the method source, any
+        modules or objects in cache_depends, and cache_version. Calls with an
+        argument that has no content-based form run uncached, with a warning.
+        """
+        if method is None:
+            # Decorator used with arguments
+            return lambda method: self.setup(
+                method,
+                cache=cache,
+                cache_dir=cache_dir,
+                cache_version=cache_version,
+                cache_depends=cache_depends,
+            )
+
+        setup_cache = (
+            SetupCache(method, cache_dir, cache_version, cache_depends)
+            if cache
+            else None
+        )
+
         @wraps(method)
         def wrapper(self, *args, **kwargs):
-            if not hasattr(self, "_state"):
+            if not isinstance(getattr(self, "_state", None), TaskerState):
                 raise TypeError(
                     "@tasker.setup can only be used in a @tasker decorated class"
                 )
 
-            current_state = self._state.get()
-            new_state = method(self, *args, **kwargs)
+            key = (
+                None if setup_cache is None else setup_cache.key(self, *args, **kwargs)
+            )
+            if key is None:
+                new_state = method(self, *args, **kwargs)
+            else:
+                new_state = setup_cache.load(key)
+                if new_state is None:
+                    new_state = method(self, *args, **kwargs)
+                    setup_cache.store(key, new_state)
 
-            current_state.update(new_state)
-            self._state.set(current_state)
+            if new_state:
+                self._state.update(new_state)
 
             return new_state
 
@@ -56,8 +105,8 @@ class Tasker:
     def run(self, method):
         @wraps(method)
         def wrapper(self, *args, **kwargs):
-            if not hasattr(self, '_state'):
-                self._state = {}
+            if not hasattr(self, "_state"):
+                self._state = TaskerState()
             return method(self, *args, **kwargs)
 
         return wrapper
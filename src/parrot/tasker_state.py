@@ -0,0 +1,119 @@
+import contextvars
+import threading
+import weakref
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, MutableMapping, Optional, Tuple
+
+# ContextVars are never garbage collected, so every ContextSlot shares this one
+_slot_values: contextvars.ContextVar[Optional[Mapping["ContextSlot", Any]]] = (
+    contextvars.ContextVar("parrot_context_slots", default=None)
+)
+_MISSING = object()
+
+
+class TaskerState:
+    """
+    Per-instance tasker state held as an immutable snapshot. Writers build a new
+    snapshot and swap it in, so readers never lock or copy and a snapshot taken
+    by a running request never changes underneath it.
+    """
+
+    def __init__(self, initial: Optional[Mapping[str, Any]] = None):
+        self._snapshot = MappingProxyType(dict(initial or {}))
+        self._write_lock = threading.Lock()
+
+    def get(self) -> Mapping[str, Any]:
+        return self._snapshot
+
+    def set(self, state: Mapping[str, Any]) -> Mapping[str, Any]:
+        snapshot = MappingProxyType(dict(state))
+        with self._write_lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def update(self, changes: Mapping[str, Any]) -> Mapping[str, Any]:
+        """
+        Copy-on-write update. Only the top-level mapping is copied; values are
+        shared between snapshots and must be treated as read-only.
+        """
+        with self._write_lock:
+            self._snapshot = MappingProxyType({**self._snapshot, **changes})
+            return self._snapshot
+
+    def __repr__(self):
+        return f"TaskerState({dict(self._snapshot)!r})"
+
+
+def tool_state(state: Mapping[str, Any]) -> MutableMapping[str, Any]:
+    """
+    State handed to the tools of one run. A read-only tasker snapshot is copied
+    at the top level, so tools can write keys without changing the snapshot
+    that other requests see; a plain dict is used as is.
+    """
+    return state if isinstance(state, MutableMapping) else dict(state)
+
+
+class ContextSlot:
+    """
+    Per-instance value that follows the current context, with the get, set and
+    reset methods of a ContextVar. Values of all slots live in one module-level
+    ContextVar, keyed weakly by slot, so they go away with their instance.
+    """
+
+    def __init__(self, name: str, default: Any = ()):
+        self.name = name
+        self.default = default
+
+    def get(self, default: Any = _MISSING) -> Any:
+        values = _slot_values.get()
+        value = _MISSING if values is None else values.get(self, _MISSING)
+        if value is not _MISSING:
+            return value
+        return self.default if default is _MISSING else default
+
+    def set(self, value: Any) -> Tuple["ContextSlot", Any]:
+        values = _slot_values.get()
+        previous = _MISSING if values is None else values.get(self, _MISSING)
+        self._assign(value)
+        return self, previous
+
+    def reset(self, token: Tuple["ContextSlot", Any]) -> None:
+        slot, previous = token
+        if slot is not self:
+            raise ValueError("Token was created by a different ContextSlot")
+        self._assign(previous)
+
+    def _assign(self, value: Any) -> None:
+        # contexts share the mapping, so it is replaced rather than changed
+        values: Dict[ContextSlot, Any] = weakref.WeakKeyDictionary(
+            _slot_values.get() or {}
+        )
+        if value is _MISSING:
+            values.pop(self, None)
+        else:
+            values[self] = value
+        _slot_values.set(values)
+
+    def __repr__(self):
+        return f"ContextSlot({self.name!r})"
+
+
+class PerInstance:
+    """
+    Non-data descriptor that lazily creates one value per instance. After the
+    first access the value lives in the instance __dict__, so lookups are plain
+    attribute reads.
+    """
+
+    def __init__(self, name: str, factory: Callable[[Any], Any]):
+        self.name = name
+        self.factory = factory
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__.get(self.name)
+        if value is None:
+            # setdefault keeps the first value if two threads race here
+            value = instance.__dict__.setdefault(self.name, self.factory(instance))
+        return value
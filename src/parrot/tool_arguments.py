@@ -0,0 +1,213 @@
+import inspect
+import re
+from typing import Any, Callable, Dict
+
+from pydantic import BaseModel, ConfigDict, ValidationError, create_model
+
+from . import _json
+
+_FENCE_PATTERN = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+class ToolArgumentsError(ValueError):
+    """
+    Raised when tool call arguments cannot be parsed or validated.
+    """
+
+
+def find_value_in_nested_dict(d: Dict[str, Any], key: str) -> Any:
+    """
+    Recursively search for a key in a nested dictionary structure.
+
+    :param d: The dictionary to search
+    :param key: The key to find
+    :return: The value if found, None otherwise
+    """
+    if key in d:
+        return d[key]
+    for v in d.values():
+        if isinstance(v, dict):
+            result = find_value_in_nested_dict(v, key)
+            if result is not None:
+                return result
+    return None
+
+
+def repair_json(raw: str) -> str:
+    """
+    Fix common mistakes models make when emitting JSON arguments: code fences,
+    single-quoted strings, Python literals, trailing commas and unclosed brackets.
+
+    :param raw: Raw argument string from the model
+    :return: Repaired JSON string
+    """
+    text = _FENCE_PATTERN.sub("", raw.strip())
+    if not text:
+        return "{}"
+
+    out = []
+    closers = []
+    quote = None
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            if ch == "\\" and i + 1 < len(text):
+                # \' is not a JSON escape, the quote needs none in a JSON string
+                out.append("'" if text[i + 1] == "'" else text[i : i + 2])
+                i += 2
+                continue
+            if ch == quote:
+                out.append('"')
+                quote = None
+            elif ch == '"':
+                out.append('\\"')  # double quote inside a single-quoted string
+            else:
+                out.append(ch)
+        elif ch in "\"'":
+            out.append('"')
+            quote = ch
+        elif ch in "{[":
+            closers.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch in "}]":
+            while out and out[-1].strip() in ("", ","):
+                if out[-1].strip() == ",":
+                    out.pop()
+                    break
+                out.pop()
+            if closers:
+                closers.pop()
+            out.append(ch)
+        elif ch.isalpha():
+            j = i
+            while j < len(text) and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            out.append(_LITERALS.get(word, word))
+            i = j
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    if quote:
+        out.append('"')
+    while out and out[-1].strip() == ",":
+        out.pop()
+    out.extend(reversed(closers))
+    return "".join(out)
+
+
+def parse_tool_arguments(raw: Any) -> Dict[str, Any]:
+    """
+    Parse tool call arguments, repairing malformed JSON when needed.
+
+    :param raw: Argument string (or already decoded dict) from the model
+    :return: Argument dictionary
+    """
+    if isinstance(raw, dict):
+        return raw
+    if raw is None:
+        return {}
+
+    try:
+        parsed = _json.loads(raw)
+    except ValueError:
+        try:
+            parsed = _json.loads(repair_json(raw))
+        except ValueError as e:
+            raise ToolArgumentsError(f"Arguments are not valid JSON: {e}") from None
+
+    if parsed is None:
+        return {}
+    if not isinstance(parsed, dict):
+        raise ToolArgumentsError(
+            f"Arguments must be a JSON object, got {type(parsed).__name__}"
+        )
+    return parsed
+
+
+def format_validation_error(error: ValidationError) -> str:
+    messages = []
+    for err in error.errors(include_url=False):
+        loc = ".".join(str(part) for part in err["loc"]) or "arguments"
+        messages.append(f"{loc}: {err['msg']}")
+    return "; ".join(messages)
+
+
+class ArgumentValidator:
+    """
+    Validator compiled once from a tool signature. Validates model-provided
+    arguments in a single pass and returns keyword arguments for the tool.
+    """
+
+    def __init__(self, func: Callable):
+        sig = inspect.signature(func)
+        fields = {}
+        for name, param in sig.parameters.items():
+            if name == "state" or name.startswith("_"):
+                continue
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                continue
+
+            annotation = Any if param.annotation is param.empty else param.annotation
+            default = ... if param.default is param.empty else param.default
+            fields[name] = (annotation, default)
+
+        self.fields = fields
+        self.model = create_model(
+            f"{func.__name__}_arguments",
+            __config__=ConfigDict(arbitrary_types_allowed=True, extra="forbid"),
+            **fields,
+        )
+
+        # single pydantic model tools expose the model fields as their schema
+        self.root_model = None
+        if len(fields) == 1:
+            name, (annotation, _) = next(iter(fields.items()))
+            if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+                self.root_model = name
+
+    def validate(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate decoded arguments, searching nested dictionaries for parameters
+        the model wrapped in an extra object.
+
+        :param arguments: Decoded argument dictionary
+        :return: Keyword arguments for the tool
+        """
+        if self.root_model and self.root_model not in arguments:
+            arguments = {self.root_model: arguments}
+
+        gathered = {}
+        for name in self.fields:
+            value = find_value_in_nested_dict(arguments, name)
+            if value is not None:
+                gathered[name] = value
+
+        try:
+            validated = self.model.model_validate(gathered)
+        except ValidationError as e:
+            raise ToolArgumentsError(format_validation_error(e)) from None
+
+        return {name: getattr(validated, name) for name in self.fields}
+
+    def validate_json(self, raw: Any) -> Dict[str, Any]:
+        """
+        Parse and validate raw arguments from a tool call. Well formed arguments
+        are validated straight from the JSON string; anything else goes through
+        repair and nested lookup.
+
+        :param raw: Argument string from the model
+        :return: Keyword arguments for the tool
+        """
+        if isinstance(raw, (str, bytes)) and not self.root_model:
+            try:
+                validated = self.model.model_validate_json(raw)
+                return {name: getattr(validated, name) for name in self.fields}
+            except ValidationError:
+                pass
+
+        return self.validate(parse_tool_arguments(raw))
@@ -1,7 +1,26 @@
+import hashlib
 import inspect
-from functools import wraps
-from typing import get_origin, get_args, Type, Dict, Any
-from pydantic import BaseModel
+import sys
+from functools import cached_property, update_wrapper
+from types import MethodType
+from typing import TYPE_CHECKING, get_origin, get_args, Type, Dict, Any, Optional
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from .tool_arguments import ArgumentValidator
+    from .tool_result import ResultSerializer
+
+
+def is_pydantic_model(annotation) -> bool:
+    # a BaseModel subclass means pydantic is already imported, so plain tools
+    # never pay for importing it
+    pydantic = sys.modules.get("pydantic")
+    return (
+        pydantic is not None
+        and isinstance(annotation, type)
+        and issubclass(annotation, pydantic.BaseModel)
+    )
 
 
 def get_type_name(annotation):
@@ -19,13 +38,13 @@ def get_type_name(annotation):
         return "array"
     if get_origin(annotation) is dict:
         return "object"
-    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+    if is_pydantic_model(annotation):
         return "object"
     return "object"  # Default to object for complex types
 
 
-def get_pydantic_schema(model: Type[BaseModel]):
-    schema = model.schema()
+def get_pydantic_schema(model: Type["BaseModel"]):
+    schema = model.model_json_schema()
     return {
         "type": "object",
         "properties": schema.get("properties", {}),
@@ -33,11 +52,7 @@ def get_pydantic_schema(model: Type[BaseModel]):
     }
 
 
-def tool(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
-
+def build_tool_schema(func) -> Dict[str, Any]:
     sig = inspect.signature(func)
     params = sig.parameters
 
@@ -50,13 +65,10 @@ def tool(func):
     # Check if there's only one parameter and it's a Pydantic model
     if len(params) == 1:
         param_name, param = next(iter(params.items()))
-        if isinstance(param.annotation, type) and issubclass(
-            param.annotation, BaseModel
-        ):
+        if is_pydantic_model(param.annotation):
             model_schema = get_pydantic_schema(param.annotation)
             tool_spec["parameters"] = model_schema
-            wrapper.tool_schema = {"type": "function", "function": tool_spec}
-            return wrapper
+            return {"type": "function", "function": tool_spec}
 
     for name, param in params.items():
         if name.startswith("_") or name == "state":  # Skip these parameters
@@ -66,16 +78,18 @@ def tool(func):
         description = f"Parameter: {name}"
 
         if param_type == "array":
-            item_type = get_type_name(get_args(param.annotation)[0])
+            item = get_args(param.annotation)[0]
             param_spec = {
                 "type": "array",
-                "items": {"type": item_type},
+                "items": (
+                    get_pydantic_schema(item)
+                    if is_pydantic_model(item)
+                    else {"type": get_type_name(item)}
+                ),
                 "description": description,
             }
         elif param_type == "object":
-            if isinstance(param.annotation, type) and issubclass(
-                param.annotation, BaseModel
-            ):
+            if is_pydantic_model(param.annotation):
                 param_spec = get_pydantic_schema(param.annotation)
                 param_spec["description"] = description
             else:
@@ -88,5 +102,105 @@ def tool(func):
         if param.default == inspect.Parameter.empty:
             tool_spec["parameters"]["required"].append(name)
 
-    wrapper.tool_schema = {"type": "function", "function": tool_spec}
-    return wrapper
+    return {"type": "function", "function": tool_spec}
+
+
+def _annotation_classes(annotation, seen: set):
+    # classes an annotation refers to, including List[Model] / Optional[Model]
+    # arguments and the field types of nested pydantic models
+    for arg in get_args(annotation):
+        yield from _annotation_classes(arg, seen)
+    if not isinstance(annotation, type) or annotation in seen:
+        return
+    seen.add(annotation)
+    yield annotation
+    if is_pydantic_model(annotation):
+        for field in annotation.model_fields.values():
+            yield from _annotation_classes(field.annotation, seen)
+
+
+def get_source_hash(func) -> str:
+    """
+    Hash what a tool schema is built from: the bytecode, docstring and signature
+    of the tool, and the fields of every model its annotations reach. This is
+    much cheaper than reading the source, so checking a manifest stays faster
+    than building the schemas.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{func.__module__}:{func.__qualname__}".encode())
+    digest.update((func.__doc__ or "").encode())
+    code = getattr(func, "__code__", None)
+    if code is not None:
+        digest.update(code.co_code)
+
+    seen = set()
+    for param in inspect.signature(func).parameters.values():
+        has_default = param.default is not inspect.Parameter.empty
+        digest.update(f"{param.name}:{param.kind}:{has_default}".encode())
+        digest.update(repr(param.annotation).encode())
+        for cls in _annotation_classes(param.annotation, seen):
+            digest.update(f"{cls.__module__}:{cls.__qualname__}".encode())
+            if is_pydantic_model(cls):
+                digest.update((cls.__doc__ or "").encode())
+                for name, field in cls.model_fields.items():
+                    digest.update(f"{name}:{field!r}".encode())
+
+    return digest.hexdigest()
+
+
+class Tool:
+    """
+    Callable returned by @tool. The schema is built on first access and memoized.
+    Coroutine tools stay awaitable: calling them returns the coroutine. Generator
+    and async generator tools return their iterator of partial results.
+    `serializer`, when given, replaces the runner's result serializer for this tool.
+    """
+
+    def __init__(self, func, serializer: Optional["ResultSerializer"] = None):
+        update_wrapper(self, func)
+        self.func = func
+        self.serializer = serializer
+        self.is_async = inspect.iscoroutinefunction(func)
+        self.is_generator = inspect.isgeneratorfunction(
+            func
+        ) or inspect.isasyncgenfunction(func)
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+    def __repr__(self):
+        return f"<tool {self.__name__}>"
+
+    @property
+    def manifest_key(self) -> str:
+        return f"{self.func.__module__}:{self.func.__qualname__}"
+
+    @cached_property
+    def tool_schema(self) -> Dict[str, Any]:
+        return build_tool_schema(self.func)
+
+    @cached_property
+    def source_hash(self) -> str:
+        return get_source_hash(self.func)
+
+    @cached_property
+    def argument_validator(self) -> "ArgumentValidator":
+        from .tool_arguments import ArgumentValidator
+
+        return ArgumentValidator(self.func)
+
+    @property
+    def schema_loaded(self) -> bool:
+        return "tool_schema" in self.__dict__
+
+
+def tool(func=None, *, serializer: Optional["ResultSerializer"] = None):
+    if func is None:
+        # Decorator used with arguments
+        return lambda func: Tool(func, serializer=serializer)
+    return Tool(func, serializer=serializer)
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+from typing import List, Dict, Any
+
+from .tool_decorator import Tool
+
+MANIFEST_VERSION = 1
+
+
+def build_tool_manifest(tools: List[Tool]) -> Dict[str, Any]:
+    """
+    Build a serializable manifest of tool schemas keyed by tool import path.
+
+    :param tools: Tools decorated with @tool
+    :return: Manifest dictionary
+    """
+    return {
+        "version": MANIFEST_VERSION,
+        "tools": {
+            t.manifest_key: {"hash": t.source_hash, "schema": t.tool_schema}
+            for t in tools
+        },
+    }
+
+
+def save_tool_manifest(tools: List[Tool], path: str) -> None:
+    """
+    Write precompiled tool schemas to disk.
+
+    :param tools: Tools decorated with @tool
+    :param path: Destination file
+    """
+    manifest = build_tool_manifest(tools)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    # write to a temp file first so concurrent readers never see a partial manifest
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(manifest, file, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_tool_manifest(tools: List[Tool], path: str) -> List[str]:
+    """
+    Load precompiled schemas from disk into the given tools. Entries whose source
+    hash no longer matches the tool are ignored and rebuilt lazily on first use.
+
+    :param tools: Tools decorated with @tool
+    :param path: Manifest file written by save_tool_manifest
+    :return: Names of tools that were loaded from the manifest
+    """
+    try:
+        with open(path, "r") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return []
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return []
+
+    entries = manifest.get("tools", {})
+    loaded = []
+    for t in tools:
+        entry = entries.get(t.manifest_key)
+        if entry is None or entry.get("hash") != t.source_hash:
+            continue
+
+        t.__dict__["tool_schema"] = entry["schema"]
+        loaded.append(t.__name__)
+
+    return loaded
@@ -0,0 +1,138 @@
+import asyncio
+import inspect
+import time
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Union
+
+from ._utils import run_coroutine_sync
+
+_DONE = object()
+
+
+async def _anext(chunks: AsyncIterator) -> Any:
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return _DONE
+
+
+def _next(chunks: Iterator) -> Any:
+    return next(chunks, _DONE)
+
+
+class ToolOutputStream:
+    """
+    Partial results of a generator tool. Chunks are forwarded to stream consumers
+    as they are produced, while at most `max_chars` of them are folded into the
+    model context.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        chunks: Union[Iterator, AsyncIterator],
+        max_chars: Optional[int] = None,
+        serializer: Callable[[Any], str] = str,
+    ):
+        self.name = name
+        self.chunks = chunks
+        self.max_chars = max_chars
+        self.serializer = serializer
+
+        self._parts: List[str] = []
+        self._size = 0
+        self._truncated = 0
+        self._error: Optional[str] = None
+        self._done = False
+        self.elapsed = 0.0
+
+    def __iter__(self) -> Iterator[str]:
+        if self._done:
+            return
+        try:
+            while True:
+                started = time.perf_counter()
+                if inspect.isasyncgen(self.chunks):
+                    chunk = run_coroutine_sync(_anext(self.chunks))
+                else:
+                    chunk = _next(self.chunks)
+                self.elapsed += time.perf_counter() - started
+                if chunk is _DONE:
+                    break
+                yield self._fold(chunk)
+        except Exception as e:
+            self._error = (
+                f"Unexpected error occurred while executing '{self.name}': {str(e)}"
+            )
+        finally:
+            self._done = True
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        if self._done:
+            return
+        try:
+            while True:
+                started = time.perf_counter()
+                if inspect.isasyncgen(self.chunks):
+                    chunk = await _anext(self.chunks)
+                else:
+                    chunk = await asyncio.to_thread(_next, self.chunks)
+                self.elapsed += time.perf_counter() - started
+                if chunk is _DONE:
+                    break
+                yield self._fold(chunk)
+        except Exception as e:
+            self._error = (
+                f"Unexpected error occurred while executing '{self.name}': {str(e)}"
+            )
+        finally:
+            self._done = True
+
+    def _fold(self, chunk: Any) -> str:
+        text = chunk if isinstance(chunk, str) else self.serializer(chunk)
+        if self.max_chars is None:
+            self._parts.append(text)
+            return text
+
+        # chunks are joined with newlines, which count towards the cap
+        separator = 1 if self._parts else 0
+        remaining = self.max_chars - self._size - separator
+        if remaining <= 0:
+            self._truncated += len(text)
+        elif len(text) > remaining:
+            self._parts.append(text[:remaining])
+            self._truncated += len(text) - remaining
+            self._size = self.max_chars
+        else:
+            self._parts.append(text)
+            self._size += separator + len(text)
+        return text
+
+    def result(self) -> str:
+        """
+        Drain any remaining chunks and return the text folded into the context.
+        """
+        for _ in self:
+            pass
+        return self.folded()
+
+    async def aresult(self) -> str:
+        async for _ in self:
+            pass
+        return self.folded()
+
+    def folded(self) -> str:
+        text = "\n".join(self._parts)
+        if self._truncated:
+            text += f"\n... [{self._truncated} more characters truncated]"
+        if self._error:
+            text = f"{text}\n{self._error}" if text else self._error
+        return text
+
+
+def partial_event(tc, chunk: str) -> dict:
+    return {
+        "type": "tool_partial",
+        "tool_call_id": tc.id,
+        "name": tc.function.name,
+        "content": chunk,
+    }
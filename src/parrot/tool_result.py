@@ -0,0 +1,60 @@
+from typing import Any, Callable, List
+
+from . import _json
+
+ResultSerializer = Callable[[Any], str]
+
+# shortest list of records worth turning into a table
+MIN_TABLE_ROWS = 2
+
+
+def to_jsonable(value: Any, tabular: bool = False) -> Any:
+    """
+    Convert a tool result into plain JSON values. With `tabular`, lists of
+    records that share the same keys become {"columns": [...], "rows": [[...]]},
+    so keys are written once rather than once per record.
+    """
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        return {k: to_jsonable(v, tabular) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        columns = _columns(value) if tabular else None
+        if columns is not None:
+            return {
+                "columns": columns,
+                "rows": [[to_jsonable(r[c], tabular) for c in columns] for r in value],
+            }
+        return [to_jsonable(v, tabular) for v in value]
+    return value
+
+
+def _columns(records: List[Any]) -> Any:
+    if len(records) < MIN_TABLE_ROWS or not isinstance(records[0], dict):
+        return None
+    columns = list(records[0])
+    keys = set(columns)
+    for record in records:
+        if not isinstance(record, dict) or record.keys() != keys:
+            return None
+    return columns
+
+
+def serialize_result(value: Any) -> str:
+    """
+    Default tool result serializer. Text is kept as is; anything else is written
+    as compact JSON.
+    """
+    if isinstance(value, str):
+        return value
+    return _json.dumps(to_jsonable(value))
+
+
+def serialize_table(value: Any) -> str:
+    """
+    Compact JSON with lists of records rendered as tables, for tools that return
+    many rows with the same keys. Opt in per tool or for the whole runner.
+    """
+    if isinstance(value, str):
+        return value
+    return _json.dumps(to_jsonable(value, tabular=True))
@@ -1,11 +1,18 @@
-import inspect
-import json
-from typing import List, Optional, Dict, Callable, Any
-
-from litellm import logging
-from pydantic import BaseModel
-
-from ._utils import validate_tools
+import asyncio
+import time
+from typing import List, Optional, Dict, Callable, Any, Tuple, Union
+
+from ._utils import validate_tools, run_coroutine_sync, submit_coroutine
+from .memory_store import MemoryStore
+from .message_log import MessageLog
+from .tasker_state import tool_state
+from .tool_output import ToolOutputStream, partial_event
+from .tool_result import ResultSerializer, serialize_result
+from .tool_arguments import (
+    ArgumentValidator,
+    ToolArgumentsError,
+    find_value_in_nested_dict,  # noqa: F401 re-exported for existing imports
+)
 from .model_runner import ModelRunner, ModelInferenceParams
 
 
@@ -20,19 +27,31 @@ class ToolRunner:
     """
 
     def __init__(
-        self, model: str, state: dict, parallel_tool_calls: Optional[bool] = None
+        self,
+        model: str,
+        state: dict,
+        parallel_tool_calls: Optional[bool] = None,
+        max_tool_output_chars: Optional[int] = None,
+        memory: Optional[MemoryStore] = None,
+        provider: str = "litellm",
+        result_serializer: ResultSerializer = serialize_result,
     ):
         # setup
         self.model_runner = ModelRunner()
         self.parallel_tool_calls = parallel_tool_calls
-        self.state = state
+        self.max_tool_output_chars = max_tool_output_chars
+        self.state = tool_state(state)
         self.model = model
+        self.memory = memory
+        self.provider = provider
+        self.result_serializer = result_serializer
 
         # defaults
-        self.context = []
+        self.context = MessageLog()
         self.tools = []
         self.tool_map = {}
         self.usage = []
+        self.tool_latency = {}
         # self.logger = logging.getLogger("parrot")
         self.stream = False
         self.depth = 999
@@ -46,6 +65,33 @@ class ToolRunner:
         tool_graph: Optional[List[Any]] = None,  # dependency graph of tools
         stream: bool = False,
     ):
+        self._start(tools, user_prompt, context, depth, stream)
+
+        if self.stream:
+            return self.tool_loop_stream()
+
+        return self.tool_loop()
+
+    def arun(
+        self,
+        tools,
+        user_prompt: Optional[str] = None,
+        context: List[dict] = None,
+        depth: int = 999,
+        tool_graph: Optional[List[Any]] = None,  # dependency graph of tools
+        stream: bool = False,
+    ):
+        """
+        Async variant of run. Returns a coroutine, or an async generator when streaming.
+        """
+        self._start(tools, user_prompt, context, depth, stream)
+
+        if self.stream:
+            return self.atool_loop_stream()
+
+        return self.atool_loop()
+
+    def _start(self, tools, user_prompt, context, depth, stream):
         tool_validation = validate_tools(tools)
         if not tool_validation["valid"]:
             raise ValueError(
@@ -55,81 +101,94 @@ class ToolRunner:
         if bool(context) == bool(user_prompt):
             raise ValueError("You must provide a starting context or prompt")
 
-        self.context = (
-            context if context else [{"role": "user", "content": user_prompt}]
-        )
+        if isinstance(context, MessageLog):
+            self.context = context  # continue the conversation without copying
+        else:
+            self.context = MessageLog(
+                context or [{"role": "user", "content": user_prompt}]
+            )
         self.tools = tools
         self.stream = stream
         self.depth = depth
 
         self.tool_map = {tool.__name__: tool for tool in tools}
 
-        if self.stream:
-            return self.tool_loop_stream()
+        for i, message in enumerate(self.context):
+            self._record(message.get("role", "user"), payload_ref=i)
 
-        return self.tool_loop()
+    def _record(self, role: str, **fields) -> None:
+        if self.memory is not None:
+            self.memory.append(role, **fields)
+
+    def _append_response(self, response, started: float):
+        latency = time.perf_counter() - started
+        last_msg = response.choices[-1].message
+        self.context.append(last_msg)
+
+        usage = getattr(response, "usage", None)
+        self._record(
+            "assistant",
+            latency=latency,
+            tokens=getattr(usage, "total_tokens", 0) or 0,
+            payload_ref=len(self.context) - 1,
+        )
+        return last_msg
+
+    def _append_tool_response(self, tc, tc_content: Any) -> Dict[str, Any]:
+        latency = self.tool_latency.pop(tc.id, 0.0)
+        if isinstance(tc_content, ToolOutputStream):
+            latency += tc_content.elapsed
+            tc_content = tc_content.folded()
+        elif not isinstance(tc_content, str):
+            tool = self.tool_map.get(tc.function.name)
+            tc_content = self._serializer(tool)(tc_content)
+
+        tc_response = tool_response(tc, tc_content)
+        self.context.append(tc_response)
+        self._record(
+            "tool",
+            tool=tc.function.name,
+            latency=latency,
+            payload_ref=len(self.context) - 1,
+        )
+        return tc_response
+
+    def _serializer(self, tgt_tool: Optional[Callable]) -> ResultSerializer:
+        return getattr(tgt_tool, "serializer", None) or self.result_serializer
+
+    def _inference_kwargs(self) -> Dict[str, Any]:
+        return dict(
+            model=self.model,
+            messages=self.context,
+            tools=[tool.tool_schema for tool in self.tools],
+            parallel_tool_calls=self.parallel_tool_calls,
+            provider=self.provider,
+        )
 
     def tool_loop(self):
         curr_depth = 1
-        while True and curr_depth < self.depth:
-            response = self.model_runner.inference(
-                model=self.model,
-                messages=self.context,
-                tools=[tool.tool_schema for tool in self.tools],
-                parallel_tool_calls=self.parallel_tool_calls,
-            )
-
-            last_msg = response.choices[-1].message
-            self.context.append(dict(last_msg))
+        while curr_depth < self.depth:
+            started = time.perf_counter()
+            response = self.model_runner.inference(**self._inference_kwargs())
+            last_msg = self._append_response(response, started)
 
             tool_calls = last_msg.tool_calls
             if tool_calls is None or len(tool_calls) == 0:
                 return self.context
 
-            for tc in tool_calls:
-                tc_id = tc.id
-                tc_type = tc.type
-                tc_func = tc.function.name
-                tc_args = json.loads(tc.function.arguments)
-
-                try:
-                    tgt_tool = self.tool_map.get(tc_func)
-                    if tgt_tool is None:
-                        raise KeyError(f"Tool '{tc_func}' not found in tools")
-
-                    formatted_args = auto_format_inputs(tgt_tool, tc_args)
-                    tc_content = tgt_tool(state=self.state, **formatted_args)
-                except KeyError:
-                    tc_content = f"Tool '{tc_func}' not found in tools"
-                except TypeError as e:
-                    # Handle the case where the inputs don't match the function signature
-                    tc_content = f"Error: Invalid inputs for '{tc_func}'. {str(e)}"
-                except Exception as e:
-                    # Handle any other unexpected errors
-                    tc_content = f"Unexpected error occurred while executing '{tc_func}': {str(e)}"
-
-                tc_response = {
-                    "role": "tool",
-                    "content": str(tc_content),
-                    "tool_call_id": tc_id,
-                }
-
-                self.context.append(tc_response)
-            self.depth += 1
+            for tc, tc_content in zip(tool_calls, self.call_tools(tool_calls)):
+                if isinstance(tc_content, ToolOutputStream):
+                    tc_content.result()
+                self._append_tool_response(tc, tc_content)
+            curr_depth += 1
         return self.context
 
     def tool_loop_stream(self):
         curr_depth = 1
-        while True and curr_depth < self.depth:
-            response = self.model_runner.inference(
-                model=self.model,
-                messages=self.context,
-                tools=[tool.tool_schema for tool in self.tools],
-                parallel_tool_calls=self.parallel_tool_calls,
-            )
-
-            last_msg = response.choices[-1].message
-            self.context.append(dict(last_msg))
+        while curr_depth < self.depth:
+            started = time.perf_counter()
+            response = self.model_runner.inference(**self._inference_kwargs())
+            last_msg = self._append_response(response, started)
 
             msg = last_msg.content
             if msg:
@@ -140,57 +199,203 @@ class ToolRunner:
                 return self.context
 
             for tc in tool_calls:
-                tc_id = tc.id
-                tc_type = tc.type
-                tc_func = tc.function.name
-                tc_args = json.loads(tc.function.arguments)
-
                 yield tc
 
-                try:
-                    tgt_tool = self.tool_map.get(tc_func)
-                    if tgt_tool is None:
-                        raise KeyError(f"Tool '{tc_func}' not found in tools")
+            for tc, tc_content in zip(tool_calls, self.call_tools(tool_calls)):
+                if isinstance(tc_content, ToolOutputStream):
+                    for chunk in tc_content:
+                        yield partial_event(tc, chunk)
 
-                    formatted_args = auto_format_inputs(tgt_tool, tc_args)
-                    tc_content = tgt_tool(state=self.state, **formatted_args)
-                except KeyError:
-                    tc_content = f"Tool '{tc_func}' not found in tools"
-                except TypeError as e:
-                    # Handle the case where the inputs don't match the function signature
-                    tc_content = f"Error: Invalid inputs for '{tc_func}'. {str(e)}"
-                except Exception as e:
-                    # Handle any other unexpected errors
-                    tc_content = f"Unexpected error occurred while executing '{tc_func}': {str(e)}"
+                yield self._append_tool_response(tc, tc_content)
+            curr_depth += 1
 
-                tc_response = {
-                    "role": "tool",
-                    "content": str(tc_content),
-                    "tool_call_id": tc_id,
-                }
+    async def atool_loop(self):
+        curr_depth = 1
+        while curr_depth < self.depth:
+            started = time.perf_counter()
+            response = await self.model_runner.ainference(**self._inference_kwargs())
+            last_msg = self._append_response(response, started)
 
-                yield tc_response
+            tool_calls = last_msg.tool_calls
+            if tool_calls is None or len(tool_calls) == 0:
+                return self.context
 
-                self.context.append(tc_response)
-            self.depth += 1
+            results = await self.acall_tools(tool_calls)
+            for tc, tc_content in zip(tool_calls, results):
+                if isinstance(tc_content, ToolOutputStream):
+                    await tc_content.aresult()
+                self._append_tool_response(tc, tc_content)
+            curr_depth += 1
+        return self.context
 
+    async def atool_loop_stream(self):
+        curr_depth = 1
+        while curr_depth < self.depth:
+            started = time.perf_counter()
+            response = await self.model_runner.ainference(**self._inference_kwargs())
+            last_msg = self._append_response(response, started)
 
-def find_value_in_nested_dict(d: Dict[str, Any], key: str) -> Any:
-    """
-    Recursively search for a key in a nested dictionary structure.
+            msg = last_msg.content
+            if msg:
+                yield msg
 
-    :param d: The dictionary to search
-    :param key: The key to find
-    :return: The value if found, None otherwise
-    """
-    if key in d:
-        return d[key]
-    for v in d.values():
-        if isinstance(v, dict):
-            result = find_value_in_nested_dict(v, key)
-            if result is not None:
-                return result
-    return None
+            tool_calls = last_msg.tool_calls
+            if tool_calls is None or len(tool_calls) == 0:
+                return
+
+            for tc in tool_calls:
+                yield tc
+
+            results = await self.acall_tools(tool_calls)
+            for tc, tc_content in zip(tool_calls, results):
+                if isinstance(tc_content, ToolOutputStream):
+                    async for chunk in tc_content:
+                        yield partial_event(tc, chunk)
+
+                yield self._append_tool_response(tc, tc_content)
+            curr_depth += 1
+
+    def call_tool(self, tc_func: str, tc_arguments: Any) -> Any:
+        """
+        Validate arguments and execute a single tool call. Failures are returned
+        as text so the model can correct the call instead of ending the run.
+        """
+        prepared = self._prepare_call(tc_func, tc_arguments)
+        if isinstance(prepared, str):
+            return prepared
+
+        tgt_tool, formatted_args = prepared
+        if tgt_tool.is_async:
+            return run_coroutine_sync(self._ainvoke(tgt_tool, formatted_args))
+
+        result = self._invoke(tgt_tool, formatted_args)
+        if isinstance(result, ToolOutputStream):
+            return result.result()
+        return result
+
+    def call_tools(self, tool_calls) -> List[Any]:
+        """
+        Execute the tool calls of one turn. Coroutine tools are scheduled together
+        on the background event loop while synchronous tools run in this thread.
+        Generator tools are returned as unconsumed ToolOutputStreams.
+        """
+        results = [None] * len(tool_calls)
+        pending = []
+
+        for i, tc in enumerate(tool_calls):
+            prepared = self._prepare_call(tc.function.name, tc.function.arguments)
+            if isinstance(prepared, str):
+                results[i] = prepared
+                continue
+
+            tgt_tool, formatted_args = prepared
+            if tgt_tool.is_async:
+                future = submit_coroutine(
+                    self._ainvoke(tgt_tool, formatted_args, tc.id)
+                )
+                pending.append((i, future))
+            else:
+                results[i] = self._invoke(tgt_tool, formatted_args, tc.id)
+
+        for i, future in pending:
+            results[i] = future.result()
+
+        return results
+
+    async def acall_tools(self, tool_calls) -> List[Any]:
+        """
+        Execute the tool calls of one turn concurrently on the running event loop.
+        Synchronous tools are moved to worker threads so they don't block it.
+        """
+        awaitables = []
+        for tc in tool_calls:
+            prepared = self._prepare_call(tc.function.name, tc.function.arguments)
+            if isinstance(prepared, str):
+                awaitables.append(asyncio.sleep(0, prepared))
+                continue
+
+            tgt_tool, formatted_args = prepared
+            if tgt_tool.is_async:
+                awaitables.append(self._ainvoke(tgt_tool, formatted_args, tc.id))
+            elif tgt_tool.is_generator:
+                # creating a generator runs none of its body
+                awaitables.append(
+                    asyncio.sleep(0, self._invoke(tgt_tool, formatted_args, tc.id))
+                )
+            else:
+                awaitables.append(
+                    asyncio.to_thread(self._invoke, tgt_tool, formatted_args, tc.id)
+                )
+
+        return list(await asyncio.gather(*awaitables))
+
+    def _prepare_call(
+        self, tc_func: str, tc_arguments: Any
+    ) -> Union[str, Tuple[Callable, Dict[str, Any]]]:
+        tgt_tool = self.tool_map.get(tc_func)
+        if tgt_tool is None:
+            return f"Tool '{tc_func}' not found in tools"
+
+        try:
+            formatted_args = tgt_tool.argument_validator.validate_json(tc_arguments)
+        except ToolArgumentsError as e:
+            return f"Error: Invalid inputs for '{tc_func}'. {str(e)}"
+
+        return tgt_tool, formatted_args
+
+    def _invoke(
+        self,
+        tgt_tool: Callable,
+        formatted_args: Dict[str, Any],
+        tc_id: Optional[str] = None,
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            result = tgt_tool(state=self.state, **formatted_args)
+            if tgt_tool.is_generator:
+                return ToolOutputStream(
+                    tgt_tool.__name__,
+                    result,
+                    self.max_tool_output_chars,
+                    self._serializer(tgt_tool),
+                )
+            return result
+        except TypeError as e:
+            # Handle the case where the inputs don't match the function signature
+            return f"Error: Invalid inputs for '{tgt_tool.__name__}'. {str(e)}"
+        except Exception as e:
+            # Handle any other unexpected errors
+            return f"Unexpected error occurred while executing '{tgt_tool.__name__}': {str(e)}"
+        finally:
+            if tc_id is not None:
+                self.tool_latency[tc_id] = time.perf_counter() - started
+
+    async def _ainvoke(
+        self,
+        tgt_tool: Callable,
+        formatted_args: Dict[str, Any],
+        tc_id: Optional[str] = None,
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            return await tgt_tool(state=self.state, **formatted_args)
+        except TypeError as e:
+            # Handle the case where the inputs don't match the function signature
+            return f"Error: Invalid inputs for '{tgt_tool.__name__}'. {str(e)}"
+        except Exception as e:
+            # Handle any other unexpected errors
+            return f"Unexpected error occurred while executing '{tgt_tool.__name__}': {str(e)}"
+        finally:
+            if tc_id is not None:
+                self.tool_latency[tc_id] = time.perf_counter() - started
+
+
+def tool_response(tc, tc_content: Any) -> Dict[str, Any]:
+    return {
+        "role": "tool",
+        "content": str(tc_content),
+        "tool_call_id": tc.id,
+    }
 
 
 def auto_format_inputs(func: Callable, inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -202,36 +407,5 @@ def auto_format_inputs(func: Callable, inputs: Dict[str, Any]) -> Dict[str, Any]
     :param inputs: The input dictionary
     :return: Formatted inputs dictionary
     """
-    sig = inspect.signature(func)
-    formatted_inputs = {}
-
-    for param_name, param in sig.parameters.items():
-        if param_name == "state":
-            continue  # Skip the 'state' parameter as it's handled separately
-
-        # Search for the parameter value in the nested structure
-        param_value = find_value_in_nested_dict(inputs, param_name)
-
-        if param_value is None:
-            # Use default value if available, otherwise raise an error
-            if param.default is not param.empty:
-                param_value = param.default
-            else:
-                raise ValueError(f"Missing required input: {param_name}")
-
-        # If the parameter is annotated with a Pydantic model, instantiate it
-        if isinstance(param.annotation, type) and issubclass(
-            param.annotation, BaseModel
-        ):
-            if isinstance(param_value, dict):
-                formatted_inputs[param_name] = param.annotation(**param_value)
-            elif isinstance(param_value, param.annotation):
-                formatted_inputs[param_name] = param_value
-            else:
-                raise TypeError(
-                    f"Invalid type for {param_name}. Expected {param.annotation}, got {type(param_value)}"
-                )
-        else:
-            formatted_inputs[param_name] = param_value
-
-    return formatted_inputs
+    validator = getattr(func, "argument_validator", None) or ArgumentValidator(func)
+    return validator.validate(inputs)
@@ -1,13 +1,14 @@
 from typing import List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SkipValidation
 
 
 class ModelInferenceParams(BaseModel):
     model: str
 
     # Common parameters
-    messages: List[dict] = Field(default_factory=list)
+    # not validated, so a MessageLog reaches the gateway without being copied
+    messages: SkipValidation[List[dict]] = Field(default_factory=list)
     timeout: Optional[Union[float, str]] = None
     temperature: Optional[float] = None
     top_p: Optional[float] = None
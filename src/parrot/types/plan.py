@@ -0,0 +1,23 @@
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PlanStep(BaseModel):
+    id: str
+    tool: str  # name of a tool or sub-tasker
+    arguments: Dict[str, Any] = Field(default_factory=dict)
+    depends_on: List[str] = Field(default_factory=list)
+    description: Optional[str] = None
+
+
+class Plan(BaseModel):
+    steps: List[PlanStep] = Field(default_factory=list)
+
+
+class StepResult(BaseModel):
+    step_id: str
+    status: Literal["succeeded", "failed", "skipped"]
+    output: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
@@ -0,0 +1,261 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Set
+
+from ._utils import run_coroutine_sync, validate_tools
+from .tasker_state import tool_state
+from .tool_output import ToolOutputStream
+from .types.plan import Plan, PlanStep, StepResult
+
+STEP_REFERENCE = "$steps."
+
+
+def resolve_references(value: Any, outputs: Mapping[str, Any]) -> Any:
+    """
+    Replace "$steps.<id>" strings with the output of that step.
+    """
+    if isinstance(value, str) and value.startswith(STEP_REFERENCE):
+        return outputs[value[len(STEP_REFERENCE) :]]
+    if isinstance(value, dict):
+        return {k: resolve_references(v, outputs) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(v, outputs) for v in value]
+    return value
+
+
+def validate_plan(steps: Mapping[str, PlanStep], done: Set[str] = frozenset()):
+    """
+    Check that every dependency exists and that the steps form a DAG.
+    """
+    for step in steps.values():
+        for dep in step.depends_on:
+            if dep not in steps and dep not in done:
+                raise ValueError(f"Step '{step.id}' depends on unknown step '{dep}'")
+
+    indegree = {
+        sid: sum(dep in steps for dep in step.depends_on) for sid, step in steps.items()
+    }
+    dependents = dependents_of(steps)
+    ready = [sid for sid, n in indegree.items() if n == 0]
+    visited = 0
+    while ready:
+        sid = ready.pop()
+        visited += 1
+        for child in dependents.get(sid, ()):
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+
+    if visited != len(steps):
+        raise ValueError("Plan contains a dependency cycle")
+
+
+def dependents_of(steps: Mapping[str, PlanStep]) -> Dict[str, List[str]]:
+    dependents: Dict[str, List[str]] = {}
+    for step in steps.values():
+        for dep in step.depends_on:
+            dependents.setdefault(dep, []).append(step.id)
+    return dependents
+
+
+def downstream(steps: Mapping[str, PlanStep], root: str) -> Set[str]:
+    """
+    The root step and every step that transitively depends on it.
+    """
+    dependents = dependents_of(steps)
+    affected = {root}
+    stack = [root]
+    while stack:
+        for child in dependents.get(stack.pop(), ()):
+            if child not in affected:
+                affected.add(child)
+                stack.append(child)
+    return affected
+
+
+class Workflow:
+    """
+    Executes a Plan as a DAG. Steps whose dependencies are satisfied run
+    concurrently on a worker pool and results stream out as they finish. When a
+    step fails, only it and its dependents are re-planned (or skipped when no
+    planner is given); unrelated branches keep running.
+    """
+
+    def __init__(
+        self,
+        tools: List[Callable],
+        state: Mapping[str, Any],
+        taskers: Optional[Dict[str, Callable]] = None,
+        planner=None,
+        max_workers: int = 4,
+        max_replans: int = 2,
+    ):
+        tool_validation = validate_tools(tools)
+        if not tool_validation["valid"]:
+            raise ValueError(
+                f"The following tools are not valid (must be decorated with @tool): {tool_validation['invalid_tools']}"
+            )
+
+        self.tools = tools
+        self.tool_map = {tool.__name__: tool for tool in tools}
+        self.taskers = taskers or {}
+        self.state = tool_state(state)
+        self.planner = planner
+        self.max_workers = max_workers
+        self.max_replans = max_replans
+
+    def execute(self, plan: Plan, query: Optional[str] = None) -> Dict[str, StepResult]:
+        """
+        Run the plan to completion and return the final result of every step.
+        """
+        return {result.step_id: result for result in self.run(plan, query)}
+
+    def run(self, plan: Plan, query: Optional[str] = None) -> Iterator[StepResult]:
+        """
+        Run the plan, yielding each step result as soon as it is available.
+        """
+        steps: Dict[str, PlanStep] = {step.id: step for step in plan.steps}
+        validate_plan(steps)
+
+        outputs: Dict[str, Any] = {}
+        completed: Dict[str, StepResult] = {}
+        running: Dict[Future, str] = {}
+        replans = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                scheduled = set(running.values())
+                for sid, step in steps.items():
+                    if sid in scheduled or sid in completed:
+                        continue
+                    if all(dep in outputs for dep in step.depends_on):
+                        future = pool.submit(self._run_step, step, dict(outputs))
+                        running[future] = sid
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    sid = running.pop(future)
+                    result = future.result()
+                    completed[sid] = result
+                    yield result
+
+                    if result.status == "succeeded":
+                        outputs[sid] = result.output
+                        continue
+
+                    affected = downstream(steps, sid) - {sid}
+                    remaining = None
+                    if self.planner is not None and replans < self.max_replans:
+                        replans += 1
+                        current = Plan(steps=list(steps.values()))
+                        replacement = self._replan(query, current, result, completed)
+                        remaining = self._merge(
+                            steps, affected | {sid}, replacement, completed, outputs
+                        )
+
+                    if remaining is None:
+                        for aid in sorted(affected):
+                            skipped = StepResult(
+                                step_id=aid,
+                                status="skipped",
+                                error=f"Dependency '{sid}' failed",
+                            )
+                            completed[aid] = skipped
+                            yield skipped
+                        continue
+
+                    # swap the failed subgraph for the re-planned steps
+                    steps = remaining
+                    if sid in steps:
+                        del completed[sid]  # retried under the same id
+
+    def _merge(
+        self,
+        steps: Dict[str, PlanStep],
+        removed: Set[str],
+        replacement: Optional[Plan],
+        completed: Mapping[str, StepResult],
+        outputs: Mapping[str, Any],
+    ) -> Optional[Dict[str, PlanStep]]:
+        """
+        Replace the removed subgraph with re-planned steps. Returns None when the
+        replacement is missing or would leave the plan invalid.
+        """
+        if replacement is None:
+            return None
+
+        merged = {sid: step for sid, step in steps.items() if sid not in removed}
+        for step in replacement.steps:
+            if step.id in merged and step.id not in removed:
+                return None
+            merged[step.id] = step
+
+        pending = {
+            sid: step
+            for sid, step in merged.items()
+            if sid not in completed or sid in removed
+        }
+        try:
+            validate_plan(pending, done=set(outputs))
+        except ValueError:
+            return None
+        return merged
+
+    def _replan(
+        self,
+        query: Optional[str],
+        plan: Plan,
+        failed: StepResult,
+        completed: Mapping[str, StepResult],
+    ) -> Optional[Plan]:
+        try:
+            return self.planner.replan(
+                query=query,
+                tools=self.tools,
+                plan=plan,
+                failed=failed,
+                completed=dict(completed),
+                taskers=self.taskers,
+            )
+        except Exception:
+            return None
+
+    def _run_step(self, step: PlanStep, outputs: Dict[str, Any]) -> StepResult:
+        started = time.perf_counter()
+        try:
+            arguments = resolve_references(step.arguments, outputs)
+            output = self.call(step.tool, arguments)
+            status, error = "succeeded", None
+        except Exception as e:
+            output, status, error = None, "failed", f"{type(e).__name__}: {e}"
+
+        return StepResult(
+            step_id=step.id,
+            status=status,
+            output=output,
+            error=error,
+            elapsed=time.perf_counter() - started,
+        )
+
+    def call(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        Call a tool or sub-tasker by name. Unlike ToolRunner, errors are raised so
+        the workflow can re-plan.
+        """
+        if name in self.taskers:
+            return self.taskers[name](**arguments)
+
+        tgt_tool = self.tool_map.get(name)
+        if tgt_tool is None:
+            raise KeyError(f"Tool '{name}' not found in tools")
+
+        formatted_args = tgt_tool.argument_validator.validate(arguments)
+        result = tgt_tool(state=self.state, **formatted_args)
+        if tgt_tool.is_async:
+            return run_coroutine_sync(result)
+        if tgt_tool.is_generator:
+            return ToolOutputStream(name, result).result()
+        return result
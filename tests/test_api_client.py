@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+
+from examples.api_agent.utils.api_client import ApiClient
+from examples.api_agent.utils.response_budget import ResultPages
+from src.parrot.tool_result import serialize_result, serialize_table
+
+
+def mock_client(handler):
+    api = ApiClient("https://api.example.com", {})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    api.client = lambda: client
+    return api
+
+
+def test_request_many_isolates_failures():
+    def handler(request):
+        if request.url.path == "/boom":
+            raise RuntimeError("transport exploded")
+        return httpx.Response(200, json={"path": request.url.path})
+
+    api = mock_client(handler)
+    results = asyncio.run(
+        api.request_many(
+            [
+                {"method": "GET", "path": "/a"},
+                {"method": "GET", "path": "/boom"},
+                {"method": "GET", "path": "/b"},
+            ]
+        )
+    )
+
+    assert results[0] == {"status_code": 200, "data": {"path": "/a"}}
+    assert results[1]["error"] == "transport exploded"
+    assert results[2]["data"] == {"path": "/b"}
+
+
+def test_result_pages_measure_with_serializer():
+    records = [{"id": i, "name": f"item {i}", "status": "active"} for i in range(40)]
+    size = len(serialize_table(records))
+    assert size < len(serialize_result(records))
+
+    # fits once rendered as a table, although the plain JSON would not
+    pages = ResultPages(max_items=100, max_chars=size, serializer=serialize_table)
+    assert pages.page(records) == {"data": records}
+
+    page = ResultPages(max_items=100, max_chars=size).page(records)
+    assert "continuation" in page
+    assert len(serialize_result(page["data"])) <= size
@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+
+from examples.doc_keeper.chunking import TokenChunker
+from examples.doc_keeper.doc_keeper import DocEditor, DocKeeper
+from examples.doc_keeper.summarizer import Summarizer
+
+MODEL = "gpt-4o-mini"
+ASCII_TEXT = "The quick brown fox jumps over the lazy dog.\n" * 60
+MIXED_TEXT = "日本語のテキスト😀🎉 中文字符 한국어 Ünïcödé text. " * 40
+
+
+def blocks(text, size=13):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def test_chunks_round_trip_without_overlap():
+    chunker = TokenChunker(MODEL, chunk_tokens=7, overlap=0)
+    for text in (ASCII_TEXT, MIXED_TEXT):
+        chunks = list(chunker.chunks(blocks(text)))
+        assert len(chunks) > 1
+        assert "".join(chunks) == text
+
+
+def test_chunks_never_split_characters():
+    chunker = TokenChunker(MODEL, chunk_tokens=7, overlap=3)
+    chunks = list(chunker.chunks(blocks(MIXED_TEXT)))
+    assert all("�" not in chunk for chunk in chunks)
+    assert all(chunk in MIXED_TEXT for chunk in chunks)
+    assert MIXED_TEXT.endswith(chunks[-1])
+
+
+def test_chunk_file_reads_blocks(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_text(MIXED_TEXT, encoding="utf-8")
+    chunker = TokenChunker(MODEL, chunk_tokens=50, overlap=0)
+    assert "".join(chunker.chunk_file(str(path), block_size=64)) == MIXED_TEXT
+
+
+def fake_complete(calls):
+    async def complete(self, prompt):
+        calls.append(prompt)
+        return f"summary-{len(calls)}"
+
+    return complete
+
+
+def test_summarize_pulls_chunks_off_the_event_loop(monkeypatch):
+    calls, readers = [], set()
+    monkeypatch.setattr(Summarizer, "complete", fake_complete(calls))
+
+    def chunks():
+        for i in range(10):
+            readers.add(threading.current_thread())
+            yield f"chunk {i}"
+
+    async def main():
+        summary = await Summarizer(MODEL, fan_in=4).summarize(chunks())
+        return summary, threading.current_thread()
+
+    summary, loop_thread = asyncio.run(main())
+    assert summary.startswith("summary-")
+    assert loop_thread not in readers
+    # 10 chunk summaries folded four at a time: 2 full groups, then 1 final combine
+    assert len(calls) == 13
+
+
+def write_doc(tmp_path, text=MIXED_TEXT):
+    path = tmp_path / "doc.txt"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_edit_resummarizes_only_the_changed_path(tmp_path, monkeypatch):
+    calls = []
+
+    async def complete(self, prompt):
+        calls.append(prompt)
+        if prompt.startswith("Apply the instruction"):
+            return "EDITED 編集済み. "
+        return f"summary-{len(calls)}"
+
+    monkeypatch.setattr(Summarizer, "complete", complete)
+    path = write_doc(tmp_path)
+    config = {"filepath": path, "model": MODEL, "chunk_tokens": 20, "fan_in": 2}
+
+    editor = DocEditor()
+    editor.setup(config)
+    assert editor.document() == MIXED_TEXT
+
+    state = editor._state.get()
+    levels = state["tree"].levels(state["leaves"])
+    edited = 3
+    # one edit, one leaf summary, one combine per ancestor with several children
+    combines, index = 0, edited
+    for below in levels[:-1]:
+        index //= 2
+        combines += len(below[index * 2 : index * 2 + 2]) > 1
+
+    calls.clear()
+    result = editor.run(edited, "translate")
+    assert len(calls) == result["model_calls"] == 2 + combines
+    assert len(levels) > 3
+
+    chunks = list(TokenChunker(MODEL, chunk_tokens=20, overlap=0).chunk_file(path))
+    chunks[edited] = "EDITED 編集済み. "
+    assert editor.document() == "".join(chunks)
+
+
+def test_edits_run_on_a_running_loop_and_evict_old_chunks(tmp_path, monkeypatch):
+    async def complete(self, prompt):
+        if prompt.startswith("Apply the instruction"):
+            return f"EDITED {len(prompt)}. "
+        return f"summary of {hash(prompt)}"
+
+    monkeypatch.setattr(Summarizer, "complete", complete)
+    config = {"filepath": write_doc(tmp_path), "model": MODEL, "chunk_tokens": 20}
+    editor = DocEditor()
+    editor.setup(config)
+
+    async def edit_twice():
+        first = await editor.arun(1, "shorten")
+        second = await editor.arun(1, "shorten again")
+        return first, second
+
+    first, second = asyncio.run(edit_twice())
+    assert editor.document().count("EDITED") == 1
+
+    state = editor._state.get()
+    store, leaves = state["store"], state["leaves"]
+    live = {key for level in state["tree"].levels(leaves) for key in level}
+    assert set(store.texts) == set(leaves)
+    assert set(store.summaries) == live
+    assert first["text"] not in store.texts.values()
+
+
+def test_run_stops_the_producer_when_the_consumer_stops(tmp_path, monkeypatch):
+    calls = []
+
+    async def complete(self, prompt):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return "summary"
+
+    monkeypatch.setattr(Summarizer, "complete", complete)
+    keeper = DocKeeper()
+    keeper.setup({"model": MODEL, "chunk_tokens": 5, "overlap": 0})
+
+    before = set(threading.enumerate())
+    events = keeper.run(write_doc(tmp_path, ASCII_TEXT * 4))
+    assert next(events)["type"] == "chunk"
+    events.close()
+
+    assert not [t for t in threading.enumerate() if t not in before]
+    made = len(calls)
+    time.sleep(0.05)
+    assert len(calls) == made
@@ -0,0 +1,50 @@
+import json
+import subprocess
+import sys
+
+HEAVY = ("litellm", "httpx", "pydantic")
+# generous enough for slow CI machines; eagerly importing litellm alone takes
+# seconds, so this still catches a heavy dependency creeping back in
+IMPORT_BUDGET = 1.0
+
+
+def run_isolated(code: str) -> dict:
+    """Run `code` in a fresh interpreter and return the JSON it prints."""
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_tool_and_tasker_import_without_heavy_dependencies():
+    loaded = run_isolated(
+        "import json, sys\n"
+        "from src.parrot import tool, tasker\n"
+        "@tool\n"
+        "def add(a: int, b: int) -> int:\n"
+        "    '''Add two numbers'''\n"
+        "    return a + b\n"
+        "add.tool_schema\n"
+        f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    )
+    assert loaded == []
+
+
+def test_lazy_attributes_resolve():
+    import src.parrot as parrot
+    from src.parrot.model_runner import ModelRunner
+    from src.parrot.tool_runner import ToolRunner
+
+    assert parrot.ModelRunner is ModelRunner
+    assert parrot.ToolRunner is ToolRunner
+    assert set(parrot.__all__) <= set(dir(parrot))
+
+
+def test_import_time_budget():
+    timings = run_isolated(
+        "import json, time\n"
+        "start = time.perf_counter()\n"
+        "import src.parrot\n"
+        "print(json.dumps(time.perf_counter() - start))"
+    )
+    assert timings < IMPORT_BUDGET
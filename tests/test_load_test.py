@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from examples.load_test.load_test import LoadAgent, percentile, run_load
+from examples.load_test.stand_in import Latency, ScriptedGateway
+from src.parrot.types.model_inference_params import ModelInferenceParams
+
+
+def test_percentile_is_nearest_rank():
+    assert percentile([], 50) == 0.0
+    assert percentile([7.0], 99) == 7.0
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 25) == 1.0
+    assert percentile(values, 26) == 2.0
+    assert percentile(values, 50) == 2.0
+    assert percentile(values, 100) == 4.0
+
+
+def test_latency_parse():
+    fixed = Latency.parse("fixed:0.25")
+    assert (fixed.distribution, fixed.mean, fixed.shape) == ("fixed", 0.25, 0.0)
+    assert fixed.sample(random.Random(0)) == 0.25
+
+    spread = Latency.parse("uniform:1:0.5")
+    assert (spread.mean, spread.shape) == (1.0, 0.5)
+    assert all(0.5 <= spread.sample(random.Random(i)) <= 1.5 for i in range(20))
+
+    assert Latency.parse("exponential:0").sample(random.Random(0)) == 0.0
+    with pytest.raises(ValueError, match="Unknown latency distribution"):
+        Latency.parse("gaussian:1")
+
+
+def test_scripted_gateway_follows_its_script():
+    gateway = ScriptedGateway([3, 1], ["a", "b"], Latency())
+    messages = [{"role": "user", "content": "go"}]
+
+    def respond():
+        params = ModelInferenceParams(model="stand-in", messages=messages)
+        message = gateway.inference(params).choices[0].message
+        messages.append({"role": "assistant", "content": message.content})
+        return message
+
+    first = respond()
+    assert [c.function.name for c in first.tool_calls] == ["a", "b", "a"]
+    assert [c.id for c in first.tool_calls] == ["call_0_0", "call_0_1", "call_0_2"]
+    assert [c.function.name for c in respond().tool_calls] == ["a"]
+    assert respond().content == "done"
+
+
+@pytest.mark.parametrize("mode", ["threads", "async"])
+def test_run_load_smoke(mode):
+    agent = LoadAgent()
+    agent.setup(
+        {
+            "script": [2, 1],
+            "latency": Latency.parse("fixed:0"),
+            "tools": 2,
+            "tool_cpu_ms": 0.0,
+            "output_chars": 10,
+            "async_tools": mode == "async",
+        }
+    )
+
+    report = run_load(agent, sessions=4, concurrency=2, mode=mode)
+
+    assert report["errors"] == 0, report["first_error"]
+    assert report["sessions"] == 4
+    # three turns per session: two with tool calls and the final answer
+    assert report["turns_per_s"] * report["wall_s"] == pytest.approx(12)
+    with pytest.raises(ValueError):
+        run_load(agent, 1, 1, mode="processes")
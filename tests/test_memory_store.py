@@ -0,0 +1,127 @@
+import mmap
+import os
+
+import pytest
+
+from src.parrot import ToolRunner, memory_store, tasker
+from src.parrot.memory_store import MemoryStore
+
+from tests.test_tool_runner import ScriptedModelRunner, add, tool_call_message
+
+
+def fill(store, rows):
+    for i in range(rows):
+        store.append(
+            "tool" if i % 2 else "assistant",
+            tool="search" if i % 2 else None,
+            latency=i / 10,
+            tokens=i,
+            payload_ref=i,
+            timestamp=float(i),
+        )
+
+
+def test_append_and_index():
+    store = MemoryStore()
+    fill(store, 4)
+
+    assert len(store) == 4
+    record = store[3]
+    assert record.role == "tool"
+    assert record.tool == "search"
+    assert record.tokens == 3
+    assert store[-4].role == "assistant"
+    assert store[-4].tool is None
+
+
+def test_filtered_scans():
+    store = MemoryStore()
+    fill(store, 10)
+
+    tool_rows = list(store.scan(role="tool", tool="search"))
+    assert [r.index for r in tool_rows] == [1, 3, 5, 7, 9]
+    assert [r.index for r in store.scan(since=8.0)] == [8, 9]
+    assert [r.index for r in store.scan(role="tool", min_latency=0.6)] == [7, 9]
+    assert list(store.scan(role="unknown")) == []
+    assert store.total_tokens() == sum(range(10))
+    assert store.total_tokens(role="assistant") == 0 + 2 + 4 + 6 + 8
+
+
+def test_spill_to_disk_keeps_rows_readable(tmp_path):
+    store = MemoryStore(spill_path=str(tmp_path / "memory.bin"), max_rows_in_memory=4)
+    fill(store, 10)
+
+    assert len(store._role) == 2
+    assert len(store) == 10
+    assert [r.tokens for r in store.scan()] == list(range(10))
+    assert store[1].tool == "search"
+    assert store[8].payload_ref == 8
+    store.close()
+
+
+def test_failed_spill_closes_the_file_and_keeps_rows(tmp_path, monkeypatch):
+    store = MemoryStore(spill_path=str(tmp_path / "memory.bin"), max_rows_in_memory=4)
+    fill(store, 4)  # spills once
+
+    def fail(*args, **kwargs):
+        raise OSError("no mapping")
+
+    store.close()
+    monkeypatch.setattr(mmap, "mmap", fail)
+    fill(store, 3)
+    with pytest.raises(OSError):
+        fill(store, 1)
+
+    assert store._spill_file is None
+    assert len(store._role) == 4
+    assert os.path.getsize(tmp_path / "memory.bin") == 4 * memory_store._RECORD.size
+
+    monkeypatch.undo()
+    store.spill()
+    assert [r.tokens for r in store.scan()] == [0, 1, 2, 3, 0, 1, 2, 0]
+    store.close()
+
+
+def test_tasker_memory_is_per_instance():
+    @tasker(memory=True)
+    class Remembering:
+        pass
+
+    @tasker
+    class Forgetful:
+        pass
+
+    first, second = Remembering(), Remembering()
+    first.memory.append("user")
+
+    assert isinstance(first.memory, MemoryStore)
+    assert len(first.memory) == 1
+    assert len(second.memory) == 0
+    assert Forgetful().memory is None
+
+
+def test_tasker_memory_records_tool_runs():
+    @tasker(memory=True)
+    class Agent:
+        @tasker.run
+        def run(self, prompt: str):
+            runner = ToolRunner("test-model", self._state.get(), memory=self.memory)
+            runner.model_runner = ScriptedModelRunner(
+                [
+                    tool_call_message(("add", '{"a": 2, "b": 3}')),
+                    {"role": "assistant", "content": "done"},
+                ]
+            )
+            return runner.run(tools=[add], user_prompt=prompt)
+
+    agent = Agent()
+    agent.run("go")
+    agent.run("again")
+
+    roles = [(r.role, r.tool) for r in agent.memory.scan()]
+    assert roles == 2 * [
+        ("user", None),
+        ("assistant", None),
+        ("tool", "add"),
+        ("assistant", None),
+    ]
@@ -0,0 +1,95 @@
+import json
+import pickle
+
+from litellm import ModelResponse
+
+from src.parrot import ToolRunner, tool
+from src.parrot.message_log import MessageLog
+from src.parrot.model_gateway.model_gateway import OpenAIGateway
+from src.parrot.types.model_inference_params import ModelInferenceParams
+
+TOOL_CALL = {
+    "role": "assistant",
+    "content": None,
+    "tool_calls": [
+        {
+            "id": "call_0",
+            "type": "function",
+            "function": {"name": "add", "arguments": '{"a": 2, "b": 3}'},
+        }
+    ],
+}
+
+
+def test_json_matches_full_serialization():
+    log = MessageLog([{"role": "user", "content": "go"}])
+    log.append(ModelResponse(choices=[{"message": TOOL_CALL}]).choices[0].message)
+    log.append({"role": "tool", "content": "5", "tool_call_id": "call_0"})
+
+    assert json.loads(log.json()) == json.loads(json.dumps(list(log)))
+    assert log[1]["tool_calls"][0]["function"]["name"] == "add"
+
+
+def test_messages_are_serialized_once(monkeypatch):
+    from src.parrot import message_log
+
+    calls = []
+    dumps = message_log._json.dumps
+    monkeypatch.setattr(
+        message_log._json, "dumps", lambda obj: calls.append(obj) or dumps(obj)
+    )
+
+    log = MessageLog()
+    for i in range(50):
+        log.append({"role": "user", "content": str(i)})
+        log.json()
+    assert len(calls) == 50
+
+
+def test_mutation_rebuilds_fragments():
+    log = MessageLog([{"role": "user", "content": str(i)} for i in range(3)])
+    log.json()
+    log[0] = {"role": "user", "content": "first"}
+    del log[-1]
+    log += [{"role": "user", "content": "last"}]
+
+    assert json.loads(log.json()) == list(log)
+    assert pickle.loads(pickle.dumps(log)).json() == log.json()
+
+
+def test_openai_request_body_reuses_fragments():
+    log = MessageLog([{"role": "user", "content": "go"}])
+    params = ModelInferenceParams(
+        model="gpt-4o-mini", messages=log, temperature=0.0, api_key="secret"
+    )
+
+    assert params.messages is log
+    assert json.loads(OpenAIGateway.request_body(params)) == {
+        "model": "gpt-4o-mini",
+        "temperature": 0.0,
+        "messages": [{"role": "user", "content": "go"}],
+    }
+
+
+def test_tool_runner_keeps_a_message_log():
+    @tool
+    def add(a: int, b: int, state: dict):
+        """Add two numbers"""
+        return a + b
+
+    replies = [TOOL_CALL, {"role": "assistant", "content": "done"}]
+    seen = []
+
+    class Scripted:
+        def inference(self, **kwargs):
+            seen.append(kwargs["messages"])
+            return ModelResponse(choices=[{"message": replies.pop(0)}])
+
+    runner = ToolRunner("test-model", {})
+    runner.model_runner = Scripted()
+    context = runner.run(tools=[add], user_prompt="go")
+
+    assert isinstance(context, MessageLog)
+    assert all(messages is context for messages in seen)
+    assert [m["role"] for m in context] == ["user", "assistant", "tool", "assistant"]
+    assert json.loads(context.json())[2]["content"] == "5"
@@ -0,0 +1,121 @@
+from examples.api_agent.utils.ref_resolver import RefResolver
+
+
+def spec_with(schemas):
+    return {"openapi": "3.1.0", "paths": {}, "components": {"schemas": schemas}}
+
+
+def test_sibling_keys_are_merged_into_the_target():
+    resolver = RefResolver(
+        spec_with({"Name": {"type": "string", "description": "a name"}})
+    )
+    node = {
+        "$ref": "#/components/schemas/Name",
+        "description": "the owner's name",
+        "nullable": True,
+        "x-internal": True,
+        "examples": ["ada"],
+    }
+
+    assert resolver.resolve(node, 2) == {
+        "type": "string",
+        "description": "the owner's name",
+        "nullable": True,
+    }
+    # the memoized fragment is not changed by the merge
+    assert resolver.resolve({"$ref": "#/components/schemas/Name"}, 2) == {
+        "type": "string",
+        "description": "a name",
+    }
+
+
+def test_references_stop_at_the_depth_limit():
+    resolver = RefResolver(
+        spec_with(
+            {
+                "A": {
+                    "type": "object",
+                    "properties": {"b": {"$ref": "#/components/schemas/B"}},
+                },
+                "B": {
+                    "type": "object",
+                    "properties": {"c": {"$ref": "#/components/schemas/C"}},
+                },
+                "C": {"type": "string"},
+            }
+        ),
+        max_depth=2,
+    )
+
+    resolved = resolver.resolve({"$ref": "#/components/schemas/A"}, resolver.max_depth)
+    b = resolved["properties"]["b"]
+    assert b["type"] == "object"
+    assert b["properties"]["c"] == {"$ref": "#/components/schemas/C"}
+
+
+def test_self_referencing_schema_terminates():
+    resolver = RefResolver(
+        spec_with(
+            {
+                "Node": {
+                    "type": "object",
+                    "properties": {
+                        "value": {"type": "integer"},
+                        "next": {"$ref": "#/components/schemas/Node"},
+                    },
+                }
+            }
+        ),
+        max_depth=3,
+    )
+
+    node = resolver.resolve({"$ref": "#/components/schemas/Node"}, resolver.max_depth)
+    for _ in range(2):
+        node = node["properties"]["next"]
+        assert node["properties"]["value"] == {"type": "integer"}
+    assert node["properties"]["next"] == {"$ref": "#/components/schemas/Node"}
+
+
+def test_noise_and_extension_keys_are_stripped():
+    resolver = RefResolver(
+        {
+            "openapi": "3.1.0",
+            "paths": {
+                "/pets": {
+                    "get": {
+                        "summary": "List pets",
+                        "externalDocs": {"url": "https://example.com"},
+                        "x-rate-limit": 10,
+                        "responses": {
+                            "200": {
+                                "description": "ok",
+                                "content": {
+                                    "application/json": {
+                                        "schema": {
+                                            "type": "object",
+                                            "xml": {"name": "pets"},
+                                            "properties": {
+                                                # field names are kept as is
+                                                "examples": {"type": "string"},
+                                                "x-id": {"type": "string"},
+                                            },
+                                        },
+                                        "examples": {"one": {"value": {}}},
+                                    }
+                                },
+                            }
+                        },
+                    }
+                }
+            },
+        }
+    )
+
+    operation = resolver.resolve(resolver.openapi["paths"]["/pets"]["get"], 2)
+    assert set(operation) == {"summary", "responses"}
+    media = operation["responses"]["200"]["content"]["application/json"]
+    assert set(media) == {"schema"}
+    assert media["schema"] == {
+        "type": "object",
+        "properties": {"examples": {"type": "string"}, "x-id": {"type": "string"}},
+    }
@@ -0,0 +1,83 @@
+from examples.api_agent.tools.search_routes import search_routes
+from examples.api_agent.utils.route_search import RouteSearch, tokenize
+
+SPEC = {
+    "paths": {
+        "/customers": {
+            "get": {"operationId": "listCustomers", "summary": "List customers"},
+            "post": {
+                "operationId": "createCustomer",
+                "summary": "Create a customer",
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {"properties": {"email": {}, "name": {}}}
+                        }
+                    }
+                },
+            },
+        },
+        "/customers/{customer_id}/payment_methods": {
+            "post": {
+                "operationId": "attachPaymentMethod",
+                "summary": "Attach a payment method to a customer",
+                "tags": ["billing"],
+            },
+            "parameters": [{"name": "customer_id", "in": "path"}],
+        },
+        "/invoices": {
+            "get": {"summary": "List invoices", "tags": ["billing"]},
+        },
+    }
+}
+
+
+def test_tokenize_splits_standardizes_and_drops_noise():
+    assert tokenize("createPaymentMethod for the Customers") == [
+        "create",
+        "payment",
+        "method",
+        "customer",
+    ]
+    assert tokenize("/customers/{customer_id}/v2") == [
+        "customer",
+        "customer",
+        "id",
+        "v2",
+    ]
+    assert tokenize("the 42 of") == []
+
+
+def test_routes_are_ranked_by_relevance():
+    index = RouteSearch.build(SPEC)
+    # the path-level parameters entry is not an operation
+    assert len(index.docs) == 4
+
+    results = index.search("attach a payment method to a customer")
+    ranked = [index.docs[doc_id][:2] for doc_id, _ in results]
+    assert ranked[0] == ("post", "/customers/{customer_id}/payment_methods")
+    assert ("get", "/invoices") not in ranked
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_keeps_the_top_k():
+    index = RouteSearch.build(SPEC)
+    assert len(index.search("customer billing invoice", k=2)) == 2
+    assert len(index.search("customer billing invoice")) == 4
+    assert index.render("customers", k=1) == "[GET] /customers - List customers"
+
+
+def test_empty_and_unmatched_queries():
+    index = RouteSearch.build(SPEC)
+    assert index.search("") == []
+    assert index.search("zebra") == []
+    assert index.render("zebra") == "No routes match 'zebra'."
+    assert RouteSearch.build({"paths": {}}).search("customer") == []
+
+
+def test_search_routes_tool_reads_the_index_from_state():
+    state = {"route_search": RouteSearch.build(SPEC)}
+    assert search_routes("list invoices", state=state, k=1) == (
+        "[GET] /invoices - List invoices"
+    )
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+
+from src.parrot import tasker
+from src.parrot.server import TaskerServer
+
+
+@tasker
+class Echo:
+    def __init__(self, release: threading.Event = None):
+        self.release = release
+
+    @tasker.setup
+    def setup(self, prefix: str):
+        return dict(prefix=prefix)
+
+    def stream(self, text: str):
+        if self.release is not None:
+            self.release.wait(5)
+        for word in text.split():
+            yield f"{self._state.get()['prefix']}{word}"
+        yield {"role": "tool", "content": "done"}
+
+
+def build_echo(release=None):
+    echo = Echo(release)
+    echo.setup(">")
+    return echo
+
+
+async def request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    if b"chunked" in head:
+        data = b""
+        while True:
+            size, _, rest = body.partition(b"\r\n")
+            size = int(size, 16)
+            if size == 0:
+                break
+            data += rest[:size]
+            body = rest[size + 2 :]
+        return status, [json.loads(line) for line in data.splitlines()]
+    return status, json.loads(body)
+
+
+def test_server_streams_events_from_prewarmed_pool():
+    async def main():
+        server = TaskerServer(build_echo, method="stream", pool_size=2, port=0)
+        await server.start()
+        try:
+            status, health = await request(server.port, "GET", "/health")
+            assert status == 200
+            assert health["available"] == 2
+
+            results = await asyncio.gather(
+                request(server.port, "POST", "/run", {"text": "a b"}),
+                request(server.port, "POST", "/run", {"text": "c"}),
+            )
+        finally:
+            await server.close()
+        return results
+
+    (status_a, events_a), (status_b, events_b) = asyncio.run(main())
+    assert status_a == status_b == 200
+    assert events_a == [
+        {"type": "message", "content": ">a"},
+        {"type": "message", "content": ">b"},
+        {"role": "tool", "content": "done"},
+    ]
+    assert events_b[0] == {"type": "message", "content": ">c"}
+
+
+def test_server_rejects_requests_when_saturated():
+    release = threading.Event()
+
+    async def main():
+        server = TaskerServer(
+            lambda: build_echo(release),
+            method="stream",
+            pool_size=1,
+            max_pending=1,
+            port=0,
+        )
+        await server.start()
+        try:
+            blocked = asyncio.create_task(
+                request(server.port, "POST", "/run", {"text": "slow"})
+            )
+            while server.pending == 0:
+                await asyncio.sleep(0.01)
+
+            rejected = await request(server.port, "POST", "/run", {"text": "x"})
+            release.set()
+            accepted = await blocked
+        finally:
+            await server.close()
+        return rejected, accepted
+
+    (status, error), (ok_status, events) = asyncio.run(main())
+    assert status == 503
+    assert "saturated" in error["error"]
+    assert ok_status == 200
+    assert events[0]["content"] == ">slow"
+
+
+def test_server_rejects_bad_payloads_and_large_bodies():
+    async def raw(port, head):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(head.encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    async def main():
+        server = TaskerServer(build_echo, method="stream", port=0, max_body_bytes=64)
+        await server.start()
+        try:
+            not_object = await request(server.port, "POST", "/run", ["a"])
+            # the size is checked from the headers, before the body is read
+            too_large = await raw(
+                server.port, "POST /run HTTP/1.1\r\nContent-Length: 65\r\n\r\n"
+            )
+        finally:
+            await server.close()
+        return not_object, too_large
+
+    (status, error), (large_status, large_error) = asyncio.run(main())
+    assert status == 400
+    assert error["error"] == "Request body must be a JSON object"
+    assert large_status == 413
+    assert "64 bytes" in large_error["error"]
@@ -0,0 +1,157 @@
+import copy
+import random
+
+from examples.api_agent.utils.ref_resolver import RefResolver
+from examples.api_agent.utils.spec_index import SpecIndex
+
+RESOURCES = ["customer", "order", "invoice", "product", "payment", "refund", "coupon"]
+
+
+def random_operation(rng, method):
+    operation = {"description": f"{method} {rng.randrange(1000)}"}
+    if method == "post":
+        fields = rng.sample(RESOURCES, rng.randrange(3))
+        operation["requestBody"] = {
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "properties": {
+                            **{f"{field}_id": {"type": "string"} for field in fields},
+                            "name": {"type": "string"},
+                        }
+                    }
+                }
+            }
+        }
+    return operation
+
+
+def random_path(rng):
+    parent = rng.choice(RESOURCES)
+    if rng.random() < 0.5:
+        return f"/{parent}s"
+    return f"/{parent}s/{{{parent}_id}}/{rng.choice(RESOURCES)}s"
+
+
+def random_methods(rng):
+    methods = rng.sample(["get", "post", "delete"], rng.randrange(1, 4))
+    return {method: random_operation(rng, method) for method in methods}
+
+
+def random_spec(rng, size=12):
+    paths = {}
+    while len(paths) < size:
+        paths[random_path(rng)] = random_methods(rng)
+    return {"paths": paths, "components": {"schemas": {}}}
+
+
+def mutate(rng, spec):
+    spec = copy.deepcopy(spec)
+    paths = spec["paths"]
+    for _ in range(rng.randrange(1, 4)):
+        action = rng.random()
+        if action < 0.3 and len(paths) > 1:
+            del paths[rng.choice(list(paths))]
+        elif action < 0.6:
+            paths[random_path(rng)] = random_methods(rng)
+        else:
+            paths[rng.choice(list(paths))] = random_methods(rng)
+    return spec
+
+
+def snapshot(index):
+    return (
+        index.resources,
+        index.edges,
+        sorted(index.graph.edges),
+        sorted(index.graph.nodes),
+        index.route_list,
+        {r: index.routes_for(r) for r in RESOURCES},
+        {r: index.dependencies.render(r) for r in index.resources},
+    )
+
+
+def test_reload_matches_a_full_build():
+    rng = random.Random(7)
+    for _ in range(40):
+        spec = random_spec(rng)
+        index = SpecIndex.build(spec)
+        for _ in range(5):
+            spec = mutate(rng, spec)
+            index = index.reload(spec)
+            assert snapshot(index) == snapshot(SpecIndex.build(spec))
+
+
+def test_noop_reload_has_nothing_dirty():
+    spec = random_spec(random.Random(1))
+    index = SpecIndex.build(spec)
+    assert index.dirty == set(spec["paths"])
+
+    reloaded = index.reload(copy.deepcopy(spec))
+    assert reloaded.dirty == frozenset()
+    assert snapshot(reloaded) == snapshot(index)
+
+
+def test_resolver_keeps_operations_when_components_are_unchanged():
+    spec = random_spec(random.Random(2))
+    path = next(iter(spec["paths"]))
+    method = next(iter(spec["paths"][path]))
+    resolver = RefResolver(spec)
+    resolver.render_operation(path, method)
+
+    same = resolver.reload(copy.deepcopy(spec), changed_paths=())
+    assert (path, method) in same._operations
+
+    changed = copy.deepcopy(spec)
+    changed["components"]["schemas"]["Extra"] = {"type": "object"}
+    assert not resolver.reload(changed)._operations
+
+
+def post_with(*fields):
+    return {
+        "description": "create",
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "properties": {
+                            f"{field}_id": {"type": "string"} for field in fields
+                        }
+                    }
+                }
+            }
+        },
+    }
+
+
+def test_reload_updates_the_graph_incrementally():
+    spec = {
+        "paths": {
+            "/products": {"get": {"description": "list"}},
+            "/coupons": {"get": {"description": "list"}},
+            "/payments": {"get": {"description": "list"}},
+            "/customers": {"post": post_with("product")},
+            "/orders": {"post": post_with("customer")},
+            "/invoices": {"post": post_with("coupon")},
+        },
+        "components": {"schemas": {}},
+    }
+    index = SpecIndex.build(spec)
+    order_tree = index.dependencies.render("order")
+    index.dependencies.render("invoice")
+
+    described = copy.deepcopy(spec)
+    described["paths"]["/orders"]["post"]["description"] = "place an order"
+    same_edges = index.reload(described)
+    assert same_edges.graph is index.graph
+    assert same_edges.dependencies is index.dependencies
+
+    rewired = copy.deepcopy(spec)
+    rewired["paths"]["/invoices"]["post"] = post_with("payment")
+    reloaded = index.reload(rewired)
+    assert reloaded.graph is not index.graph
+    assert ("invoice", "coupon") in index.graph.edges  # the old snapshot is kept
+    assert "coupon" not in reloaded.graph
+    # only trees reaching the changed edge are rendered again
+    assert reloaded.dependencies._rendered == {"order": order_tree}
+    assert snapshot(reloaded) == snapshot(SpecIndex.build(rewired))
@@ -0,0 +1,79 @@
+import copy
+import json
+
+from examples.api_agent.utils.spec_index import fingerprint
+from examples.api_agent.utils.spec_store import SpecStore
+
+SPEC = {
+    "openapi": "3.0.0",
+    "servers": [{"url": "https://api.example.com"}],
+    "paths": {
+        "/customers": {
+            "get": {"description": "List customers"},
+            "post": {"requestBody": {"$ref": "#/components/schemas/Customer"}},
+        },
+        "/customers/{customer_id}/orders": {"get": {"description": "List orders"}},
+    },
+    "components": {
+        "schemas": {
+            "Customer": {"properties": {"name": {"type": "string"}}},
+            "Order": {"properties": {"customer_id": {"type": "string"}}},
+        },
+        "securitySchemes": {"key": {"type": "apiKey"}},
+    },
+}
+
+
+def open_store(tmp_path, spec, name="spec"):
+    path = tmp_path / f"{name}.json"
+    path.write_text(json.dumps(spec))
+    return SpecStore.open(str(path))
+
+
+def test_store_reads_like_the_spec(tmp_path):
+    store = open_store(tmp_path, SPEC)
+    assert store["servers"] == SPEC["servers"]
+    assert dict(store["paths"]["/customers"]) == SPEC["paths"]["/customers"]
+    assert (
+        store["components"]["schemas"]["Order"]
+        == (SPEC["components"]["schemas"]["Order"])
+    )
+
+
+def test_section_fingerprints_depend_on_content_only(tmp_path):
+    first = open_store(tmp_path, SPEC, "first")
+    second = open_store(tmp_path, SPEC, "second")
+    assert fingerprint(first["components"]) == fingerprint(second["components"])
+    assert fingerprint(first["paths"]["/customers"]) == fingerprint(
+        second["paths"]["/customers"]
+    )
+
+    changed = copy.deepcopy(SPEC)
+    changed["components"]["schemas"]["Order"]["properties"]["total"] = {}
+    third = open_store(tmp_path, changed, "third")
+    assert fingerprint(first["components"]) != fingerprint(third["components"])
+    assert fingerprint(first["components"]["securitySchemes"]) == fingerprint(
+        third["components"]["securitySchemes"]
+    )
+
+
+def test_old_store_files_are_converted_again(tmp_path):
+    store = open_store(tmp_path, SPEC)
+    with open(store.path, "r+b") as file:
+        file.write(b"PSPEC001")
+    assert open_store(tmp_path, SPEC)["openapi"] == "3.0.0"
+
+
+def test_callers_cannot_corrupt_cached_fragments(tmp_path):
+    store = open_store(tmp_path, SPEC)
+    operation = store["paths"]["/customers"]["get"]
+    operation["description"] = "changed"
+    store["components"]["schemas"]["Customer"]["properties"].clear()
+    store["servers"].append({"url": "https://evil.example.com"})
+
+    assert store["paths"]["/customers"]["get"] == {"description": "List customers"}
+    assert (
+        store["components"]["schemas"]["Customer"]
+        == (SPEC["components"]["schemas"]["Customer"])
+    )
+    assert store["servers"] == SPEC["servers"]
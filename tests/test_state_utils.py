@@ -0,0 +1,87 @@
+from examples.api_agent.utils import spec_index, state_utils
+from examples.api_agent.utils.state_utils import (
+    find_resource,
+    standardize,
+    standardize_many,
+    standardize_vocabulary,
+)
+
+
+def test_standardize_names():
+    assert standardize("Customers") == "customer"
+    assert standardize("evaluation_datasets") == "evaluation-dataset"
+    assert standardize("customer_id") == "customer"
+    assert standardize("Test Cases") == "test-case"
+    assert standardize("analysis") == "analysis"
+    assert standardize("foo_") == "foo-"
+    assert standardize("") == ""
+    assert find_resource("/customers/{customer_id}") == "customer"
+
+
+def test_standardize_is_memoized_with_one_engine():
+    standardize.cache_clear()
+    state_utils._singular.cache_clear()
+
+    for _ in range(3):
+        standardize("payment_intents")
+    engine = state_utils._inflect_engine()
+    standardize("refunds")
+
+    assert standardize.cache_info().hits == 2
+    assert state_utils._singular.cache_info().misses == 3  # payment, intents, refunds
+    assert state_utils._inflect_engine() is engine
+
+
+def test_standardize_vocabulary_covers_a_whole_spec():
+    spec = {
+        "paths": {
+            "/customers": {
+                "post": {
+                    "requestBody": {
+                        "content": {
+                            "application/json": {
+                                "schema": {"properties": {"payment_intents": {}}}
+                            }
+                        }
+                    }
+                }
+            },
+            "/customers/{customer_id}/Test Cases": {"get": {}},
+        }
+    }
+
+    assert standardize_vocabulary(spec) == {
+        "customers": "customer",
+        "{customer_id}": "customer",
+        "Test Cases": "test-case",
+        "payment_intents": "payment-intent",
+    }
+    assert standardize_many(["Refunds", "Refunds", "order_id"]) == {
+        "Refunds": "refund",
+        "order_id": "order",
+    }
+
+
+def test_spec_index_build_standardizes_in_one_pass(monkeypatch):
+    spec = {
+        "paths": {
+            "/customers": {"get": {}},
+            "/customers/{customer_id}/orders": {"get": {}},
+        }
+    }
+    calls = []
+    vocabulary = state_utils.standardize_vocabulary
+    monkeypatch.setattr(
+        spec_index,
+        "standardize_vocabulary",
+        lambda openapi: calls.append(openapi) or vocabulary(openapi),
+    )
+
+    index = spec_index.SpecIndex.build(spec)
+
+    assert calls == [spec]
+    assert index.records["/customers/{customer_id}/orders"].segments == [
+        "customer",
+        "customer",
+        "order",
+    ]
@@ -0,0 +1,212 @@
+import asyncio
+import contextvars
+import gc
+import os
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.parrot import tasker, tool
+from src.parrot.setup_cache import SetupCache
+
+from tests.test_tool_runner import run_scripted, tool_call_message, tool_contents
+
+
+@tasker
+class Counter:
+    @tasker.setup
+    def setup(self, start: int, label: str = "counter"):
+        return dict(start=start, label=label)
+
+    @tasker.run
+    def run(self):
+        return self._state.get()["start"]
+
+
+@tasker
+class Other:
+    @tasker.setup
+    def setup(self, value: str):
+        return dict(value=value)
+
+
+def test_state_is_isolated_per_instance_and_class():
+    first, second, other = Counter(), Counter(), Other()
+    first.setup(1)
+    second.setup(2)
+    other.setup("x")
+
+    assert first.run() == 1
+    assert second.run() == 2
+    assert dict(other._state.get()) == {"value": "x"}
+
+
+def test_snapshots_are_copy_on_write():
+    counter = Counter()
+    counter.setup(1, label="a")
+    snapshot = counter._state.get()
+
+    counter.setup(5)
+
+    assert snapshot["start"] == 1
+    assert counter._state.get()["start"] == 5
+    with pytest.raises(TypeError):
+        snapshot["start"] = 10
+
+
+def test_concurrent_instances_in_threads_and_tasks():
+    def build(i):
+        counter = Counter()
+        counter.setup(i)
+        return counter.run()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(build, range(32))) == list(range(32))
+
+    async def abuild(i):
+        counter = Counter()
+        counter.setup(i)
+        await asyncio.sleep(0)
+        return counter.run()
+
+    async def main():
+        return await asyncio.gather(*(abuild(i) for i in range(32)))
+
+    assert asyncio.run(main()) == list(range(32))
+
+
+def test_context_slots_follow_context_and_instance():
+    first, second = Counter(), Counter()
+    assert first._history is first._history
+    assert first._history.get() == ()
+
+    def inner():
+        first._history.set(("a",))
+        second._history.set(("b",))
+        return first._history.get(), second._history.get()
+
+    assert contextvars.copy_context().run(inner) == (("a",), ("b",))
+    assert first._history.get() == () and second._history.get() == ()
+
+    token = first._context.set(("x",))
+    first._context.set(("y",))
+    first._context.reset(token)
+    assert first._context.get() == ()
+
+    # values go away with their instance instead of living in a ContextVar
+    short_lived = Counter()
+    slot = weakref.ref(short_lived._context)
+    short_lived._context.set(("z",))
+    del short_lived
+    gc.collect()
+    assert slot() is None
+
+
+def test_tools_write_to_a_copy_of_the_snapshot():
+    @tool
+    def remember(value: str, state: dict):
+        """Remember a value"""
+        state["last"] = value
+        return state["start"]
+
+    counter = Counter()
+    counter.setup(3)
+    snapshot = counter._state.get()
+
+    context = run_scripted(
+        [remember],
+        [
+            tool_call_message(("remember", '{"value": "x"}')),
+            {"role": "assistant", "content": "done"},
+        ],
+        state=snapshot,
+    )
+
+    assert tool_contents(context) == ["3"]
+    assert "last" not in snapshot
+
+
+def test_setup_requires_tasker_class():
+    class Plain:
+        @tasker.setup
+        def setup(self):
+            return {}
+
+    with pytest.raises(TypeError):
+        Plain().setup()
+
+
+def test_cached_setup_reloads_from_disk(tmp_path):
+    calls = []
+
+    @tasker
+    class Indexed:
+        @tasker.setup(cache=True, cache_dir=str(tmp_path))
+        def setup(self, spec: dict, limit: int = 10):
+            calls.append(spec)
+            return dict(index=sorted(spec), limit=limit)
+
+    first = Indexed()
+    assert first.setup({"b": 1, "a": 2}) == {"index": ["a", "b"], "limit": 10}
+
+    second = Indexed()
+    second.setup({"a": 2, "b": 1}, limit=10)
+    assert dict(second._state.get()) == {"index": ["a", "b"], "limit": 10}
+    assert len(calls) == 1
+
+    Indexed().setup({"a": 2, "b": 1, "c": 3})
+    assert len(calls) == 2
+
+
+def test_cached_setup_invalidates_on_code_version(tmp_path):
+    calls = []
+
+    def make(version):
+        @tasker
+        class Versioned:
+            @tasker.setup(cache=True, cache_dir=str(tmp_path), cache_version=version)
+            def setup(self, value: str):
+                calls.append(value)
+                return dict(value=value)
+
+        return Versioned
+
+    make("1")().setup("x")
+    make("1")().setup("x")
+    make("2")().setup("x")
+    assert calls == ["x", "x"]
+
+
+def test_cached_setup_skips_arguments_without_content(tmp_path):
+    class Opaque:
+        pass
+
+    @tasker
+    class Configured:
+        @tasker.setup(cache=True, cache_dir=str(tmp_path))
+        def setup(self, config):
+            return dict(ready=True)
+
+    with pytest.warns(UserWarning, match="Not caching"):
+        assert Configured().setup(Opaque()) == {"ready": True}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_setup_cache_evicts_least_recently_used(tmp_path):
+    def setup(self, value):
+        return dict(value=value)
+
+    cache = SetupCache(setup, str(tmp_path), max_bytes=3000)
+    now = time.time()
+    for i in range(5):
+        cache.store(cache.key(None, i), {"value": "x" * 1000})
+        os.utime(cache.path(cache.key(None, i)), (now - 10 + i, now - 10 + i))
+    cache.prune()
+
+    kept = [i for i in range(5) if os.path.exists(cache.path(cache.key(None, i)))]
+    assert kept == [3, 4]
+
+    SetupCache(setup, str(tmp_path), max_age=0).prune()
+    assert list(tmp_path.iterdir()) == []
@@ -1,5 +1,5 @@
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pytest
 from pydantic import BaseModel, Field
 from src.parrot import tool
@@ -199,3 +199,127 @@ def test_pydantic_model_with_field_descriptions():
         "age",
         "email",
     ]
+
+
+def test_schema_is_built_lazily_and_memoized():
+    @tool
+    def lazy_function(param1: str):
+        """A lazily described function"""
+        pass
+
+    assert not lazy_function.schema_loaded
+    schema = lazy_function.tool_schema
+    assert lazy_function.schema_loaded
+    assert lazy_function.tool_schema is schema
+
+
+def test_tool_manifest_round_trip(tmp_path):
+    from src.parrot import save_tool_manifest, load_tool_manifest
+
+    @tool
+    def manifest_function(param1: str, param2: int = 5):
+        """A function stored in a manifest"""
+        pass
+
+    path = tmp_path / "tools.json"
+    save_tool_manifest([manifest_function], str(path))
+
+    manifest = json.loads(path.read_text())
+    entry = manifest["tools"][manifest_function.manifest_key]
+    entry["schema"]["function"]["description"] = "from manifest"
+    path.write_text(json.dumps(manifest))
+
+    reloaded = tool(manifest_function.func)
+    assert load_tool_manifest([reloaded], str(path)) == ["manifest_function"]
+    assert reloaded.tool_schema["function"]["description"] == "from manifest"
+
+
+def test_tool_manifest_ignores_stale_hash(tmp_path):
+    from src.parrot import save_tool_manifest, load_tool_manifest
+
+    @tool
+    def stale_function(param1: str):
+        """A function whose source changed"""
+        pass
+
+    path = tmp_path / "tools.json"
+    save_tool_manifest([stale_function], str(path))
+
+    manifest = json.loads(path.read_text())
+    manifest["tools"][stale_function.manifest_key]["hash"] = "outdated"
+    path.write_text(json.dumps(manifest))
+
+    reloaded = tool(stale_function.func)
+    assert load_tool_manifest([reloaded], str(path)) == []
+    assert not reloaded.schema_loaded
+
+
+def test_tool_manifest_load_skips_schema_build_and_source(tmp_path, monkeypatch):
+    import inspect
+
+    from src.parrot import save_tool_manifest, load_tool_manifest
+    from src.parrot import tool_decorator
+
+    class Item(BaseModel):
+        name: str
+
+    def make(i):
+        def manifest_tool(items: List[Item], limit: int = 5):
+            """A tool loaded from a manifest"""
+
+        manifest_tool.__name__ = manifest_tool.__qualname__ = f"manifest_tool_{i}"
+        return manifest_tool
+
+    funcs = [make(i) for i in range(50)]
+    path = tmp_path / "tools.json"
+    save_tool_manifest([tool(f) for f in funcs], str(path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("a manifest load must not build or read source")
+
+    monkeypatch.setattr(tool_decorator, "build_tool_schema", fail)
+    monkeypatch.setattr(inspect, "getsource", fail)
+    monkeypatch.setattr(Item, "model_json_schema", fail)
+
+    tools = [tool(f) for f in funcs]
+    assert len(load_tool_manifest(tools, str(path))) == len(funcs)
+    assert all(t.schema_loaded for t in tools)
+
+
+def test_source_hash_follows_nested_models():
+    def make(inner_model):
+        class Outer(BaseModel):
+            inner: Optional[inner_model] = None
+
+        def nested_tool(items: List[Outer]):
+            """A tool with nested models"""
+
+        return tool(nested_tool)
+
+    class Inner(BaseModel):
+        value: int
+
+    before = make(Inner).source_hash
+    assert make(Inner).source_hash == before
+
+    class Inner(BaseModel):  # noqa: F811
+        value: int
+        extra: str = ""
+
+    assert make(Inner).source_hash != before
+
+
+def test_list_of_pydantic_models():
+    class Call(BaseModel):
+        path: str = Field(description="Route")
+        payload: dict = None
+
+    @tool
+    def run_calls(calls: List[Call], state: dict):
+        """Run calls"""
+        pass
+
+    items = run_calls.tool_schema["function"]["parameters"]["properties"]["calls"]
+    assert items["type"] == "array"
+    assert items["items"]["properties"]["path"]["description"] == "Route"
+    assert items["items"]["required"] == ["path"]
@@ -0,0 +1,65 @@
+import json
+
+from src.parrot import tool
+from src.parrot.tool_result import serialize_result, serialize_table
+
+from tests.test_tool_runner import add, run_scripted, tool_call_message, tool_contents
+
+RECORDS = [
+    {"id": 1, "name": "ada", "active": True},
+    {"id": 2, "name": "bob", "active": None},
+]
+
+
+def test_text_is_kept_and_values_are_compact_json():
+    assert serialize_result("plain text") == "plain text"
+    assert serialize_result(5) == "5"
+    assert serialize_result({"ok": True, "data": None}) == '{"ok":true,"data":null}'
+
+
+def test_records_keep_their_shape_by_default():
+    assert serialize_result(RECORDS) == (
+        '[{"id":1,"name":"ada","active":true},{"id":2,"name":"bob","active":null}]'
+    )
+
+
+def test_records_render_as_tables_on_request():
+    result = json.loads(serialize_table({"status_code": 200, "data": RECORDS}))
+    assert result == {
+        "status_code": 200,
+        "data": {
+            "columns": ["id", "name", "active"],
+            "rows": [[1, "ada", True], [2, "bob", None]],
+        },
+    }
+    # records with different keys keep their shape
+    mixed = RECORDS + [{"id": 3}]
+    assert json.loads(serialize_table(mixed)) == mixed
+
+
+@tool(serializer=serialize_table)
+def list_users(state: dict):
+    """List users"""
+    return RECORDS
+
+
+@tool(serializer=lambda users: ", ".join(u["name"] for u in users))
+def user_names(state: dict):
+    """List user names"""
+    return RECORDS
+
+
+def test_tool_runner_serializes_results_once_per_tool():
+    context = run_scripted(
+        [list_users, user_names, add],
+        [
+            tool_call_message(
+                ("list_users", "{}"), ("user_names", "{}"), ("add", '{"a": 1}')
+            ),
+            {"role": "assistant", "content": "done"},
+        ],
+    )
+    table, names, total = tool_contents(context)
+    assert json.loads(table)["columns"] == ["id", "name", "active"]
+    assert names == "ada, bob"
+    assert total == "1"
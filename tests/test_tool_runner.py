@@ -0,0 +1,268 @@
+import asyncio
+from typing import List
+
+from litellm import ModelResponse
+from pydantic import BaseModel
+
+from src.parrot import tool, ToolRunner
+from src.parrot.tool_arguments import repair_json, parse_tool_arguments
+from src.parrot.tool_output import ToolOutputStream
+
+
+class ScriptedModelRunner:
+    """Replays a fixed list of assistant messages."""
+
+    def __init__(self, messages: List[dict]):
+        self.messages = list(messages)
+        self.calls = []
+
+    def inference(self, **kwargs):
+        self.calls.append(kwargs)
+        return ModelResponse(choices=[{"message": self.messages.pop(0)}])
+
+    async def ainference(self, **kwargs):
+        return self.inference(**kwargs)
+
+
+def tool_call_message(*calls):
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {
+                "id": f"call_{i}",
+                "type": "function",
+                "function": {"name": name, "arguments": arguments},
+            }
+            for i, (name, arguments) in enumerate(calls)
+        ],
+    }
+
+
+def run_scripted(tools, messages, state=None):
+    runner = ToolRunner("test-model", state or {})
+    runner.model_runner = ScriptedModelRunner(messages)
+    return runner.run(tools=tools, user_prompt="go")
+
+
+@tool
+def add(a: int, b: int = 0, state: dict = None):
+    """Add two numbers"""
+    return a + b
+
+
+class Greeting(BaseModel):
+    name: str
+    excited: bool = False
+
+
+@tool
+def greet(greeting: Greeting, state: dict):
+    """Greet someone"""
+    return f"hello {greeting.name}{'!' if greeting.excited else ''}"
+
+
+def tool_contents(context):
+    return [m["content"] for m in context if m.get("role") == "tool"]
+
+
+def test_repair_json_fixes_common_mistakes():
+    assert parse_tool_arguments("{'a': 1, 'b': True,}") == {"a": 1, "b": True}
+    assert parse_tool_arguments('```json\n{"a": [1, 2,]}\n```') == {"a": [1, 2]}
+    assert parse_tool_arguments('{"a": {"b": None') == {"a": {"b": None}}
+    assert repair_json("") == "{}"
+    assert repair_json("{'a': 'it\\'s'}") == '{"a": "it\'s"}'
+    assert parse_tool_arguments("{'a': 'it\\'s'}") == {"a": "it's"}
+    assert parse_tool_arguments("""{'a': "say \\"hi\\" it\\'s"}""") == {
+        "a": 'say "hi" it\'s'
+    }
+
+
+def test_tool_arguments_are_validated_and_coerced():
+    context = run_scripted(
+        [add],
+        [
+            tool_call_message(("add", '{"a": "2", "b": 3}')),
+            {"role": "assistant", "content": "done"},
+        ],
+    )
+    assert tool_contents(context) == ["5"]
+
+
+def test_nested_arguments_are_found():
+    context = run_scripted(
+        [add],
+        [
+            tool_call_message(("add", '{"args": {"a": 4}}')),
+            {"role": "assistant", "content": "done"},
+        ],
+    )
+    assert tool_contents(context) == ["4"]
+
+
+def test_single_model_tool_accepts_flattened_fields():
+    context = run_scripted(
+        [greet],
+        [
+            tool_call_message(("greet", "{'name': 'ada', 'excited': True}")),
+            {"role": "assistant", "content": "done"},
+        ],
+    )
+    assert tool_contents(context) == ["hello ada!"]
+
+
+def test_invalid_arguments_are_returned_to_the_model():
+    context = run_scripted(
+        [add],
+        [
+            tool_call_message(("add", '{"b": 1}'), ("add", "not json at all")),
+            {"role": "assistant", "content": "done"},
+        ],
+    )
+    contents = tool_contents(context)
+    assert contents[0].startswith("Error: Invalid inputs for 'add'. a: Field required")
+    assert contents[1].startswith("Error: Invalid inputs for 'add'.")
+    assert context[-1]["content"] == "done"
+
+
+@tool
+async def slow_echo(text: str, state: dict):
+    """Echo text after a delay"""
+    await asyncio.sleep(0.2)
+    return text
+
+
+def test_async_tool_is_detected_and_awaitable():
+    assert slow_echo.is_async
+    assert not add.is_async
+    assert asyncio.run(slow_echo("hi", state={})) == "hi"
+
+
+@tool
+async def meet(text: str, state: dict):
+    """Return text once another call to this tool has started"""
+    state["arrived"].append(text)
+
+    async def other_arrived():
+        while len(state["arrived"]) < 2:
+            await asyncio.sleep(0.01)
+
+    # a second call can only arrive while this one waits if they overlap; the
+    # timeout only turns a sequential run into a failure rather than a hang
+    await asyncio.wait_for(other_arrived(), timeout=10)
+    return text
+
+
+def test_async_tools_run_concurrently_in_sync_loop():
+    context = run_scripted(
+        [meet, add],
+        [
+            tool_call_message(
+                ("meet", '{"text": "a"}'),
+                ("add", '{"a": 1}'),
+                ("meet", '{"text": "b"}'),
+            ),
+            {"role": "assistant", "content": "done"},
+        ],
+        state={"arrived": []},
+    )
+
+    assert tool_contents(context) == ["a", "1", "b"]
+
+
+def test_arun_awaits_tools_on_running_loop():
+    runner = ToolRunner("test-model", {})
+    runner.model_runner = ScriptedModelRunner(
+        [
+            tool_call_message(("slow_echo", '{"text": "a"}'), ("add", '{"a": 2}')),
+            {"role": "assistant", "content": "done"},
+        ]
+    )
+    context = asyncio.run(runner.arun(tools=[slow_echo, add], user_prompt="go"))
+    assert tool_contents(context) == ["a", "2"]
+
+
+@tool
+def list_pages(pages: int, state: dict):
+    """List pages incrementally"""
+    for page in range(pages):
+        yield f"page-{page}"
+
+
+@tool
+async def alist_pages(pages: int, state: dict):
+    """List pages incrementally from an async source"""
+    for page in range(pages):
+        await asyncio.sleep(0)
+        yield f"apage-{page}"
+
+
+def test_generator_tool_streams_partials_and_caps_context():
+    runner = ToolRunner("test-model", {}, max_tool_output_chars=10)
+    runner.model_runner = ScriptedModelRunner(
+        [
+            tool_call_message(("list_pages", '{"pages": 3}')),
+            {"role": "assistant", "content": "done"},
+        ]
+    )
+    events = list(runner.run(tools=[list_pages], user_prompt="go", stream=True))
+
+    partials = [
+        e["content"]
+        for e in events
+        if isinstance(e, dict) and e.get("type") == "tool_partial"
+    ]
+    assert partials == ["page-0", "page-1", "page-2"]
+    assert tool_contents(runner.context) == [
+        "page-0\npag\n... [9 more characters truncated]"
+    ]
+
+
+def test_folded_output_counts_separators_towards_the_cap():
+    def fold(chunks, max_chars):
+        stream = ToolOutputStream("pages", iter(chunks), max_chars=max_chars)
+        return stream.result()
+
+    # three chunks of three plus two separators fill eleven characters exactly
+    assert fold(["abc", "def", "ghi"], 11) == "abc\ndef\nghi"
+    assert fold(["abc", "def", "ghi"], 10) == (
+        "abc\ndef\ngh\n... [1 more characters truncated]"
+    )
+    # no room left after a separator, so the chunk is dropped whole
+    assert fold(["abc", "def"], 4) == "abc\n... [3 more characters truncated]"
+    for max_chars in range(1, 12):
+        folded = fold(["abc", "def", "ghi"], max_chars).split("\n... [")[0]
+        assert max_chars - 1 <= len(folded) <= max_chars
+
+
+def test_async_generator_tool_is_folded_in_sync_and_async_loops():
+    messages = [
+        tool_call_message(("alist_pages", '{"pages": 2}')),
+        {"role": "assistant", "content": "done"},
+    ]
+    context = run_scripted([alist_pages], list(messages))
+    assert tool_contents(context) == ["apage-0\napage-1"]
+
+    runner = ToolRunner("test-model", {})
+    runner.model_runner = ScriptedModelRunner(list(messages))
+    context = asyncio.run(runner.arun(tools=[alist_pages], user_prompt="go"))
+    assert tool_contents(context) == ["apage-0\napage-1"]
+
+
+def test_runner_records_turns_in_memory():
+    from src.parrot.memory_store import MemoryStore
+
+    memory = MemoryStore()
+    runner = ToolRunner("test-model", {}, memory=memory)
+    runner.model_runner = ScriptedModelRunner(
+        [
+            tool_call_message(("add", '{"a": 1}')),
+            {"role": "assistant", "content": "done"},
+        ]
+    )
+    context = runner.run(tools=[add], user_prompt="go")
+
+    assert [r.role for r in memory.scan()] == ["user", "assistant", "tool", "assistant"]
+    tool_row = next(memory.scan(role="tool"))
+    assert tool_row.tool == "add"
+    assert context[tool_row.payload_ref]["content"] == "1"
@@ -0,0 +1,121 @@
+import threading
+
+import pytest
+
+from src.parrot import tool, Planner, Workflow
+from src.parrot.types.plan import Plan, PlanStep
+
+from tests.test_tool_runner import ScriptedModelRunner
+
+
+@tool
+def create_customer(name: str, state: dict):
+    """Create a customer"""
+    if "barrier" in state:
+        # only passes once every party has started, so the steps overlap
+        state["barrier"].wait()
+    return f"cus_{name}"
+
+
+@tool
+def charge(customer: str, amount: int, state: dict):
+    """Charge a customer"""
+    if amount <= 0:
+        raise ValueError("amount must be positive")
+    return f"{customer}:{amount}"
+
+
+TOOLS = [create_customer, charge]
+
+
+def two_customer_plan(amount: int = 5) -> Plan:
+    return Plan(
+        steps=[
+            PlanStep(id="c1", tool="create_customer", arguments={"name": "a"}),
+            PlanStep(id="c2", tool="create_customer", arguments={"name": "b"}),
+            PlanStep(
+                id="p1",
+                tool="charge",
+                arguments={"customer": "$steps.c1", "amount": amount},
+                depends_on=["c1"],
+            ),
+            PlanStep(
+                id="p2",
+                tool="charge",
+                arguments={"customer": "$steps.c2", "amount": 5},
+                depends_on=["c2"],
+            ),
+        ]
+    )
+
+
+def test_independent_steps_run_in_parallel():
+    # the timeout turns a sequential run into a failed step rather than a hang
+    state = {"barrier": threading.Barrier(2, timeout=10)}
+    results = Workflow(TOOLS, state=state).execute(two_customer_plan())
+
+    assert results["c1"].status == "succeeded"
+    assert results["p1"].output == "cus_a:5"
+    assert results["p2"].output == "cus_b:5"
+
+
+def test_failure_skips_only_affected_subgraph():
+    plan = two_customer_plan()
+    plan.steps[0].arguments = {}  # c1 is missing its required argument
+
+    results = Workflow(TOOLS, state={}).execute(plan)
+
+    assert results["c1"].status == "failed"
+    assert results["p1"].status == "skipped"
+    assert results["p2"].output == "cus_b:5"
+
+
+def test_failure_is_replanned():
+    class FixingPlanner:
+        def __init__(self):
+            self.failed = []
+
+        def replan(self, failed, plan, completed, **kwargs):
+            self.failed.append(failed.step_id)
+            assert {s.id for s in plan.steps} >= {"p1"}
+            return Plan(
+                steps=[
+                    PlanStep(
+                        id="p1-retry",
+                        tool="charge",
+                        arguments={"customer": "$steps.c1", "amount": 5},
+                        depends_on=["c1"],
+                    )
+                ]
+            )
+
+    planner = FixingPlanner()
+    results = Workflow(TOOLS, state={}, planner=planner).execute(
+        two_customer_plan(amount=0)
+    )
+
+    assert planner.failed == ["p1"]
+    assert results["p1"].status == "failed"
+    assert results["p1-retry"].output == "cus_a:5"
+    assert results["p2"].output == "cus_b:5"
+
+
+def test_cyclic_plan_is_rejected():
+    plan = Plan(
+        steps=[
+            PlanStep(id="a", tool="charge", depends_on=["b"]),
+            PlanStep(id="b", tool="charge", depends_on=["a"]),
+        ]
+    )
+    with pytest.raises(ValueError):
+        list(Workflow(TOOLS, state={}).run(plan))
+
+
+@pytest.mark.parametrize("content", [None, "", "  "])
+def test_empty_plan_from_model_is_an_error(content):
+    planner = Planner("test-model")
+    planner.model_runner = ScriptedModelRunner(
+        [{"role": "assistant", "content": content}]
+    )
+    with pytest.raises(ValueError, match="empty plan"):
+        planner.plan("charge a customer", TOOLS)